@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Bear Skill Benchmark: call_bear hot paths
+
+Measures the components of call_bear separately using the fake transport:
+URL encoding, JSON parsing of search responses, process spawn, the full
+call path, warm-cache hit paths and fuzzy title lookup.
+
+Usage:
+    python3 micro.py run                          # print results
+    python3 micro.py run --output baseline.json   # save a baseline
+    python3 micro.py run --compare baseline.json  # run and compare
+    python3 micro.py compare baseline.json current.json --threshold 0.2
+    python3 micro.py run --quick --only urlencode
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import json
+import time
+import atexit
+import random
+import shutil
+import argparse
+import tempfile
+import platform
+import statistics
+import subprocess
+import urllib.parse
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+import bear
+from fake_bear import FakeBear
+from cache import WarmCache
+from titles import TitleIndex
+
+
+# name -> (setup, quick) ; setup(fake) returns a zero-argument callable to time
+BENCHMARKS: Dict[str, Tuple[Callable[[FakeBear], Callable[[], Any]], bool]] = {}
+
+
+def benchmark(name: str, quick: bool = True):
+    """Register a benchmark. setup(fake) returns the callable to time."""
+    def register(setup):
+        BENCHMARKS[name] = (setup, quick)
+        return setup
+    return register
+
+
+# --- Payload helpers ---
+
+ASCII_LINE = "The quick brown fox jumps over the lazy dog. 0123456789\n"
+KOREAN_LINE = "베어 노트앱과의 상호작용을 위한 파이썬 API 입니다. 한글 텍스트\n"
+
+
+def make_text(size: int, korean: bool = False) -> str:
+    """Build text of roughly `size` UTF-8 bytes."""
+    line = KOREAN_LINE if korean else ASCII_LINE
+    repeat = size // len(line.encode("utf-8")) + 1
+    text = line * repeat
+    return text.encode("utf-8")[:size].decode("utf-8", "ignore")
+
+
+def make_search_response(count: int) -> str:
+    """Build a search JSON response with `count` notes."""
+    rng = random.Random(count)
+    notes = [
+        {
+            "title": f"Note {i} - {rng.choice(['Meeting', 'Daily', 'Research', '회의록'])}",
+            "identifier": f"{rng.getrandbits(64):016X}-{i:08d}",
+            "modificationDate": "2024-01-15T10:30:00Z",
+            "creationDate": "2024-01-01T09:00:00Z",
+        }
+        for i in range(count)
+    ]
+    return json.dumps(notes, ensure_ascii=False)
+
+
+# --- Benchmarks ---
+
+SIZES = {"1k": 1024, "10k": 10 * 1024, "100k": 100 * 1024, "1m": 1024 * 1024, "10m": 10 * 1024 * 1024}
+
+for _label, _size in SIZES.items():
+    for _korean in (False, True):
+        def _setup(fake, size=_size, korean=_korean):
+            params = {"title": "Report", "text": make_text(size, korean)}
+            return lambda: urllib.parse.urlencode(params)
+        benchmark(
+            f"urlencode/{'ko' if _korean else 'ascii'}/{_label}",
+            quick=_size <= 100 * 1024
+        )(_setup)
+
+for _label, _size in SIZES.items():
+    def _setup(fake, size=_size):
+        text = make_text(size, korean=True)
+        return lambda: bear._chunk_text(text, bear.MAX_URL_LENGTH)
+    benchmark(f"chunk_text/ko/{_label}", quick=_size <= 1024 * 1024)(_setup)
+
+for _count in (100, 1000, 10000, 100000, 200000):
+    def _setup(fake, count=_count):
+        payload = make_search_response(count)
+        return lambda: json.loads(payload)
+    benchmark(f"json_loads/search/{_count}", quick=_count <= 10000)(_setup)
+
+
+@benchmark("spawn/true")
+def _spawn_true(fake):
+    return lambda: subprocess.run(["true"], check=False)
+
+
+@benchmark("spawn/python")
+def _spawn_python(fake):
+    return lambda: subprocess.run([sys.executable, "-c", "pass"], check=False)
+
+
+@benchmark("call_bear/create/1k")
+def _call_create(fake):
+    text = make_text(1024)
+    return lambda: bear.create_note(title="Bench", text=text, return_id=True)
+
+
+@benchmark("call_bear/search/1000")
+def _call_search(fake):
+    for i in range(1000):
+        fake.add_note(f"Note {i}", "body", ["work"])
+    return lambda: bear.search_notes(tag="work")
+
+
+def _warm_cache(fake: FakeBear, notes: int) -> WarmCache:
+    for i in range(notes):
+        fake.add_note(f"Note {i}", "body", ["work", f"project/{i % 50}"])
+    directory = tempfile.mkdtemp(prefix="bear-bench-")
+    atexit.register(shutil.rmtree, directory, True)
+    cache = WarmCache(os.path.join(directory, "cache.sqlite"), max_age=3600)
+    cache.notes()
+    cache.tags()
+    return cache
+
+
+@benchmark("cache/tags/hit")
+def _cache_tags(fake):
+    cache = _warm_cache(fake, 1000)
+    return cache.tags
+
+
+@benchmark("cache/title_to_id/hit")
+def _cache_title(fake):
+    cache = _warm_cache(fake, 10000)
+    return lambda: cache.title_to_id("Note 5000")
+
+
+@benchmark("cache/notes/hit/10000")
+def _cache_notes(fake):
+    cache = _warm_cache(fake, 10000)
+    return cache.notes
+
+
+for _count in (10000, 100000):
+    def _setup(fake, count=_count):
+        rng = random.Random(count)
+        words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 9)))
+                 for _ in range(5000)]
+        index = TitleIndex()
+        for i in range(count):
+            index.add(f"id{i}", " ".join(rng.choice(words).title() for _ in range(3)) + f" - {i}")
+        index.add("target", "Weekly Review - Week 41")
+        return lambda: index.match("weekly reveiw week 41", limit=5)
+    benchmark(f"titles/match/{_count}", quick=_count <= 10000)(_setup)
+
+
+@benchmark("span/overhead")
+def _span_overhead(fake):
+    def run():
+        with bear.span("bench"):
+            pass
+    return run
+
+
+# --- Runner ---
+
+def measure(fn: Callable[[], Any], min_time: float, max_runs: int) -> Dict[str, Any]:
+    """Time fn repeatedly until min_time has elapsed or max_runs is reached."""
+    fn()  # warmup
+    samples: List[float] = []
+    start = time.perf_counter()
+    while len(samples) < max_runs and (time.perf_counter() - start) < min_time or len(samples) < 3:
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return {
+        "runs": len(samples),
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+    }
+
+
+def run(only: Optional[str], quick: bool, min_time: float, max_runs: int) -> Dict[str, Any]:
+    results = {}
+    for name, (setup, is_quick) in BENCHMARKS.items():
+        if only and only not in name:
+            continue
+        if quick and not is_quick:
+            continue
+        with FakeBear() as fake:
+            fn = setup(fake)
+            results[name] = measure(fn, min_time, max_runs)
+        print(f"  {name:<32} {results[name]['median'] * 1e3:10.3f} ms  ({results[name]['runs']} runs)")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Return names of benchmarks whose median regressed beyond threshold."""
+    regressions = []
+    print(f"\n  {'benchmark':<32} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        change = cur["median"] / base["median"] - 1 if base["median"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"  {name:<32} {base['median'] * 1e3:10.3f}ms {cur['median'] * 1e3:10.3f}ms {change:+8.1%}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="call_bear microbenchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="run benchmarks")
+    run_p.add_argument("--only", help="substring filter on benchmark names")
+    run_p.add_argument("--quick", action="store_true", help="skip the largest payloads")
+    run_p.add_argument("--min-time", type=float, default=0.5, help="seconds per benchmark")
+    run_p.add_argument("--max-runs", type=int, default=1000)
+    run_p.add_argument("--output", help="write results to this JSON file")
+    run_p.add_argument("--compare", help="baseline JSON to compare against")
+    run_p.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown (0.2 = 20%%)")
+
+    cmp_p = sub.add_parser("compare", help="compare two result files")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--threshold", type=float, default=0.2)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        print("Bear Skill - call_bear microbenchmarks\n")
+        current = run(args.only, args.quick, args.min_time, args.max_runs)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(current, f, indent=2)
+            print(f"\nResults written to {args.output}")
+        if not args.compare:
+            return 0
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    else:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.current, encoding="utf-8") as f:
+            current = json.load(f)
+
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Bear Skill Benchmark: end-to-end scenarios
+
+Scaled-up versions of the workloads in ../examples, run against the
+FakeBear emulator. Each scenario runs in its own process so peak RSS is
+measured per scenario, and reports throughput and p50/p99 latency.
+
+Usage:
+    python3 scenarios.py                         # all scenarios, default scale
+    python3 scenarios.py --scale 0.1             # 10% of default sizes
+    python3 scenarios.py create_notes tag_tree   # selected scenarios
+    python3 scenarios.py --latency 0.002 --json results.json
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import json
+import time
+import random
+import argparse
+import resource
+import subprocess
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Any, Iterator, Optional
+
+import bear
+from fake_bear import FakeBear
+
+
+# name -> (default size, description, scenario function)
+# scenario(fake, size) yields one zero-argument operation per timed step
+SCENARIOS: Dict[str, Any] = {}
+
+
+def scenario(name: str, size: int, description: str):
+    def register(func: Callable[[FakeBear, int], Iterator[Callable[[], Any]]]):
+        SCENARIOS[name] = (size, description, func)
+        return func
+    return register
+
+
+# --- Scenarios (from ../examples) ---
+
+@scenario("create_notes", 10000, "create_note.py: tagged notes with return_id")
+def create_notes(fake: FakeBear, size: int):
+    tags = ["work", "project,alpha,phase1", "dev,setup,guide", "meetings"]
+    for i in range(size):
+        yield lambda i=i: bear.create_note(
+            title=f"Note {i}",
+            text=f"## Summary\n- Item {i}\n- Details here\n",
+            tags=tags[i % len(tags)],
+            return_id=True
+        )
+
+
+@scenario("daily_notes", 3650, "daily_note.py: standup templates over consecutive days")
+def daily_notes(fake: FakeBear, size: int):
+    start = date(2020, 1, 1)
+    for i in range(size):
+        day = (start + timedelta(days=i)).strftime("%Y-%m-%d")
+        text = (
+            f"## Daily Standup - {day}\n\n### Yesterday\n- [ ] Task 1\n\n"
+            f"### Today\n- [ ] Task 1\n- [ ] Task 2\n\n### Blockers\n- (None)\n"
+        )
+        yield lambda day=day, text=text: bear.create_note(
+            title=f"Daily Standup - {day}", text=text, tags="standup,daily"
+        )
+
+
+@scenario("tag_tree", 5000, "manage_tags.py: organize a nested tag tree and rename subtrees")
+def tag_tree(fake: FakeBear, size: int):
+    rng = random.Random(0)
+    for i in range(size):
+        depth = rng.randint(1, 4)
+        name = "/".join(f"t{rng.randint(0, 20)}" for _ in range(depth)) + f"/leaf{i}"
+        fake.add_note(f"Tagged {i}", "", [name])
+
+    def organize():
+        top_level: Dict[str, List[str]] = {}
+        for tag in bear.get_tags() or []:
+            parent = tag["name"].split("/")[0] if "/" in tag["name"] else "root"
+            top_level.setdefault(parent, []).append(tag["name"])
+        return top_level
+
+    for _ in range(10):
+        yield organize
+    for i in range(10):
+        yield lambda i=i: bear.rename_tag(f"t{i}", f"archive/t{i}")
+
+
+@scenario("search_analysis", 200, "search_notes.py: repeated full-library analysis searches")
+def search_analysis(fake: FakeBear, size: int):
+    for i in range(5000):
+        fake.add_note(
+            f"{'Project' if i % 7 == 0 else 'Note'} {i}", "body", ["work" if i % 2 else "home"]
+        )
+
+    def analyse():
+        results = bear.search_notes(term="") or []
+        recent = sorted(results, key=lambda x: x.get("modificationDate", ""), reverse=True)[:5]
+        filtered = [n for n in results if "project" in n.get("title", "").lower()]
+        return recent, filtered
+
+    for i in range(size):
+        yield analyse if i % 2 == 0 else (lambda: bear.search_notes(term="", tag="work"))
+
+
+@scenario("add_text", 5000, "add_text.py: appends to header sections of existing notes")
+def add_text(fake: FakeBear, size: int):
+    ids = [fake.add_note(f"Project {i}", "# Status\n\n## TODO\n- [ ] a\n\n## Done\n") for i in range(100)]
+    for i in range(size):
+        yield lambda i=i: bear.add_text(
+            note_id=ids[i % len(ids)], text=f"- [ ] item {i}", mode="append", header="TODO"
+        )
+
+
+@scenario("grab_url", 2000, "grab_url.py: research collection captures")
+def grab_url(fake: FakeBear, size: int):
+    for i in range(size):
+        yield lambda i=i: bear.grab_url(
+            url=f"https://example.com/articles/{i}", tags="research,reading", return_id=True
+        )
+
+
+# --- Runner ---
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_scenario(name: str, scale: float, latency: float) -> Dict[str, Any]:
+    size, _, func = SCENARIOS[name]
+    size = max(1, int(size * scale))
+    samples: List[float] = []
+    with FakeBear(latency=latency) as fake:
+        start = time.perf_counter()
+        for op in func(fake, size):
+            t0 = time.perf_counter()
+            op()
+            samples.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - start
+    return {
+        "scenario": name,
+        "size": size,
+        "ops": len(samples),
+        "elapsed": elapsed,
+        "throughput": len(samples) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(samples, 50) * 1e3,
+        "p99_ms": percentile(samples, 99) * 1e3,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_isolated(name: str, scale: float, latency: float) -> Dict[str, Any]:
+    """Run one scenario in a child process for an accurate peak RSS."""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", name,
+         "--scale", str(scale), "--latency", str(latency)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="End-to-end Bear scenario benchmarks")
+    parser.add_argument("scenarios", nargs="*", help=f"any of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier on default sizes")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated Bear latency (s)")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_scenario(args.child, args.scale, args.latency)))
+        return 0
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    print("Bear Skill - scenario benchmarks\n")
+    print(f"  {'scenario':<16} {'ops':>7} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'RSS MB':>8}")
+    results = []
+    for name in names:
+        r = run_isolated(name, args.scale, args.latency)
+        results.append(r)
+        print(f"  {name:<16} {r['ops']:>7} {r['throughput']:>10.1f} "
+              f"{r['p50_ms']:>9.3f} {r['p99_ms']:>9.3f} {r['peak_rss_mb']:>8.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"scale": args.scale, "latency": args.latency, "results": results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
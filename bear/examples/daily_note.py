@@ -8,6 +8,7 @@ Daily note templates that can be auto-generated.
 import sys
 sys.path.insert(0, '../scripts')
 from bear import create_note, add_text
+from daily import get_or_create_daily, backfill
 from datetime import date, datetime, timedelta
 
 
@@ -15,35 +16,14 @@ def create_daily_standup():
     """Daily standup note"""
     print("Example 1: Daily standup note")
 
-    today = date.today().strftime("%Y-%m-%d")
-
-    standup_text = """## Daily Standup - {}
-
-### Yesterday
-- [ ] Task 1: (Completed/In Progress/Blocked)
-- [ ] Task 2: (Completed/In Progress/Blocked)
-
-### Today
-- [ ] Task 1: Planned completion time
-- [ ] Task 2: Planned completion time
-- [ ] Task 3: Planned completion time
-
-### Blockers
-- (None) or (List any blockers)
+    # Looks the title up in the local title index first, so running
+    # this twice on the same day returns the existing note
+    note = get_or_create_daily("standup", add_timestamp=True)
 
-### Notes
-- Team status: All good
-- No critical issues
-""".format(today)
-
-    create_note(
-        title=f"Daily Standup - {today}",
-        text=standup_text,
-        tags="standup,daily",
-        add_timestamp=True
-    )
-
-    print(f"'{today}' standup note created\n")
+    if note['created']:
+        print(f"'{note['date']}' standup note created\n")
+    else:
+        print(f"'{note['date']}' standup note already exists\n")
 
 
 def create_daily_journal():
@@ -294,45 +274,17 @@ def create_consecutive_days():
         print("Cancelled\n")
         return
 
-    for i in range(7):
-        date_obj = date.today() + timedelta(days=i)
-        date_str = date_obj.strftime("%Y-%m-%d")
-        day_name = date_obj.strftime("%A")
-
-        template = f"""# Daily Plan - {date_str} ({day_name})
-
-## Morning Routine
-- [ ] 6:00 AM Wake up
-- [ ] 6:15 AM Exercise
-- [ ] 6:45 AM Shower
-- [ ] 7:00 AM Breakfast
-
-## Work Focus
-- [ ] Priority 1:
-- [ ] Priority 2:
-- [ ] Priority 3:
-
-## Evening
-- [ ] Reflection
-- [ ] Prepare tomorrow
-- [ ] Bedtime routine
-
-## Notes
-(Add daily notes here)
-"""
-
-        create_note(
-            title=f"Daily Plan - {date_str}",
-            text=template,
-            tags="daily,planning,schedule"
-        )
+    # The "plan" template is compiled once; only dates without a
+    # "Daily Plan - {date}" note are created, in parallel
+    start = date.today()
+    report = backfill("plan", start, start + timedelta(days=6))
 
-        if i == 0:
-            print(f"  {date_str} note created")
-        else:
-            print(f"  {date_str} note created")
+    for date_str in sorted(report['created']):
+        print(f"  {date_str} note created")
+    for date_str in sorted(report['existing']):
+        print(f"  {date_str} note already exists")
 
-    print("\nAll 7 days of notes created\n")
+    print("\nAll 7 days of notes are in place\n")
 
 
 if __name__ == "__main__":
@@ -354,3 +306,4 @@ if __name__ == "__main__":
     print("- Modify templates to suit your needs")
     print("- Use tags to categorize notes for easier searching")
     print("- Use add_timestamp=True to automatically record creation time")
+    print("- Use daily.get_or_create_daily() / daily.backfill() to avoid duplicate daily notes")
@@ -8,6 +8,7 @@ Demonstrates how to save URLs as Bear notes.
 import sys
 sys.path.insert(0, '../scripts')
 from bear import grab_url
+from captures import CaptureIndex
 
 
 def example_simple_url_capture():
@@ -130,13 +131,16 @@ def example_research_collection():
         }
     ]
 
+    # Capture in parallel (paced per host), skipping pages saved in earlier runs
+    # (requires xcall to record note IDs)
     print(f"Collecting '{research_topic}' research materials:")
-    for url_item in research_urls:
-        print(f"  - {url_item['url']}")
-        grab_url(
-            url=url_item['url'],
-            tags=url_item['tags']
-        )
+    report = CaptureIndex().grab_many(research_urls, max_workers=4)
+    for url, note in report['captured'].items():
+        print(f"  - {url} -> {note['title']}")
+    for url, entry in report['existing'].items():
+        print(f"  = {url} (already saved as '{entry['title']}')")
+    for url, error in report['failed'].items():
+        print(f"  ! {url}: {error}")
 
     print("\nResearch materials saved\n")
 
@@ -213,4 +217,5 @@ if __name__ == "__main__":
     print("- Make sure the URL is valid")
     print("- Use tags to organize captured web pages")
     print("- Use return_id=True to get the saved note's ID")
+    print("- Use captures.CaptureIndex to skip pages you already saved")
     print("- Bear app automatically extracts content from saved web pages")
@@ -8,6 +8,7 @@ Demonstrates how to list, rename, and delete tags.
 import sys
 sys.path.insert(0, '../scripts')
 from bear import get_tags, rename_tag, delete_tag, open_tag, create_note
+from tagtree import TagTree, tag_counts
 import os
 
 
@@ -47,35 +48,27 @@ def example_organize_tags():
     tags = get_tags()
 
     if tags:
-        # Classify top-level tags and subtags
-        top_level = {}
-        for tag in tags:
-            name = tag['name']
-            if '/' in name:
-                parent = name.split('/')[0]
-                if parent not in top_level:
-                    top_level[parent] = []
-                top_level[parent].append(name)
-            else:
-                if 'root' not in top_level:
-                    top_level['root'] = []
-                top_level['root'].append(name)
+        # Build the tag tree once; lookups are proportional to tag depth
+        tree = TagTree.build(tags)
 
         print(f"Tag structure analyzed\n")
         print("Hierarchy:")
-        for parent, children in sorted(top_level.items()):
-            if parent == 'root':
-                print(f"\nTop-level tags ({len(children)}):")
-                for child in children[:5]:
-                    print(f"  - {child}")
-                if len(children) > 5:
-                    print(f"  ... and {len(children) - 5} more")
-            else:
-                print(f"\n{parent}/ ({len(children)}):")
-                for child in children[:3]:
-                    print(f"  - {child}")
-                if len(children) > 3:
-                    print(f"  ... and {len(children) - 3} more")
+        for parent in tree.children():
+            children = list(tree.walk(parent, include_self=False))
+            if not children:
+                continue
+            print(f"\n{parent}/ ({len(children)}):")
+            for child in children[:3]:
+                print(f"  - {child}")
+            if len(children) > 3:
+                print(f"  ... and {len(children) - 3} more")
+
+        leaves = [name for name in tree.children() if not tree.children(name)]
+        print(f"\nTop-level tags without subtags ({len(leaves)}):")
+        for name in leaves[:5]:
+            print(f"  - {name}")
+        if len(leaves) > 5:
+            print(f"  ... and {len(leaves) - 5} more")
     else:
         print("No tags\n")
 
@@ -163,6 +156,13 @@ def example_tag_statistics():
         # Shortest tag name
         shortest = min(tags, key=lambda x: len(x['name']))
         print(f"  - Shortest tag: {shortest['name']} ({len(shortest['name'])} chars)")
+
+        # Note counts for every tag, computed in one pass over note metadata
+        counts = tag_counts()
+        busiest = sorted(counts.items(), key=lambda item: -item[1]['subtree'])[:5]
+        print("\n  - Most used tags (notes incl. subtags):")
+        for name, count in busiest:
+            print(f"      {name}: {count['subtree']} ({count['notes']} tagged directly)")
     else:
         print("No tags\n")
 
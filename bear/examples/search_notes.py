@@ -8,6 +8,7 @@ Demonstrates various ways to search notes.
 import sys
 sys.path.insert(0, '../scripts')
 from bear import search_notes
+from query import compile_query
 import os
 
 
@@ -111,25 +112,26 @@ def example_search_analysis():
 def example_search_with_filtering():
     """Filter search results"""
     print("Example 5: Filter search results")
-    print("Search all notes, extract only those containing 'project'")
-
-    results = search_notes(term="")
-
-    if results:
-        # Notes with 'project' in title
-        filtered = [
-            note for note in results
-            if 'project' in note.get('title', '').lower()
-        ]
-
-        if filtered:
-            print(f"Found {len(filtered)} project-related notes\n")
-            for i, note in enumerate(filtered[:5], 1):
-                print(f"  {i}. {note.get('title', 'Untitled')}")
-        else:
-            print("No project-related notes\n")
+    print("Recent #work notes with 'project' in the title")
+
+    # One Bear search (the #work tag is pushed down), then the title and
+    # date filters stream over the results; stops after 5 matches
+    query = compile_query('#work title:project modified:>-30d')
+    plan = query.plan()
+    print(plan.explain())
+
+    try:
+        filtered = list(plan.run(limit=5))
+    except RuntimeError as e:
+        print(f"Search failed: {e}\n")
+        return
+
+    if filtered:
+        print(f"Found {len(filtered)} project-related notes\n")
+        for i, note in enumerate(filtered, 1):
+            print(f"  {i}. {note.get('title', 'Untitled')}")
     else:
-        print("No notes found\n")
+        print("No project-related notes\n")
 
 
 def example_search_statistics():
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Bear NDJSON 배치 실행기
+
+표준 입력으로 받은 작업 스트림(한 줄에 JSON 하나)을 한 프로세스에서
+동시 실행 수와 호출 속도를 제한하며 실행하고, 결과를 NDJSON으로 출력합니다.
+
+Usage:
+    python3 bear.py batch < ops.ndjson
+    python3 bear.py batch --concurrency 4 --rate 20 --order completion < ops.ndjson
+
+Input:
+    {"op": "create_note", "title": "A", "text": "...", "tags": "work"}
+    {"op": "add_text", "note_title": "A", "text": "more", "id": "job-2"}
+
+Output (입력의 "id"가 있으면 그대로 전달):
+    {"index": 0, "op": "create_note", "ok": true, "result": null}
+    {"index": 1, "id": "job-2", "op": "add_text", "ok": false, "error": "...", "type": "ValueError"}
+"""
+
+import sys
+import json
+import threading
+from typing import Optional, Dict, List, Any, IO, Iterable
+
+try:
+    from . import bear
+    from .scheduler import Scheduler
+except ImportError:
+    import bear
+    from scheduler import Scheduler
+
+
+class BatchRunner:
+    """
+    NDJSON 작업 스트림 실행기
+
+    입력을 모두 읽지 않고 흘려보내며, 처리 중이거나 출력을 기다리는 작업 수를
+    concurrency의 몇 배로 제한해 메모리 사용량을 일정하게 유지합니다.
+
+    Args:
+        writer: 결과를 쓸 스트림 (None이면 records 목록에 모음)
+        concurrency: 최대 동시 실행 수
+        rate: 초당 최대 호출 수 (0 이하면 제한 없음)
+        order: "input"이면 입력 순서, "completion"이면 완료 순서로 출력
+    """
+
+    def __init__(
+        self,
+        writer: Optional[IO[str]],
+        concurrency: int = 4,
+        rate: float = 0.0,
+        order: str = "input"
+    ):
+        if order not in ("input", "completion"):
+            raise ValueError(f"order는 input 또는 completion이어야 합니다: {order}")
+        self.writer = writer
+        self.order = order
+        self.limiter = bear.RateLimiter(rate, burst=max(1, concurrency))
+        self.scheduler = Scheduler(max_workers=concurrency, lane_caps={"bulk": concurrency})
+        self._inflight = threading.BoundedSemaphore(concurrency * 4)
+        self._lock = threading.Lock()
+        self._done: Dict[int, Dict[str, Any]] = {}
+        self._next = 0
+        self.failed = 0
+        self.records: List[Dict[str, Any]] = []
+
+    def _emit(self, index: int, record: Dict[str, Any]) -> None:
+        # 허가는 결과를 실제로 쓴 뒤에 반납: 앞선 작업 하나가 늦어도
+        # _done에 쌓이는 결과 수가 concurrency * 4를 넘지 않음
+        with self._lock:
+            if not record["ok"]:
+                self.failed += 1
+            if self.order == "completion":
+                self._write(record)
+                self._inflight.release()
+            else:
+                self._done[index] = record
+                while self._next in self._done:
+                    self._write(self._done.pop(self._next))
+                    self._next += 1
+                    self._inflight.release()
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        if self.writer is None:
+            self.records.append(record)
+            return
+        self.writer.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self.writer.flush()
+
+    def _execute(self, op: str, kwargs: Dict[str, Any]) -> Any:
+        self.limiter.acquire()
+        return bear.OPERATIONS[op](**kwargs)
+
+    def submit(self, index: int, line: str) -> None:
+        """입력 한 줄을 파싱해 실행 예약"""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            self._inflight.acquire()
+            self._emit(index, {"index": index, "ok": False, "error": str(e), "type": type(e).__name__})
+            return
+        self.submit_request(index, request)
+
+    def submit_request(self, index: int, request: Any) -> None:
+        """파싱된 요청 하나({"op": ..., 인자...})를 실행 예약"""
+        self._inflight.acquire()
+        record: Dict[str, Any] = {"index": index}
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("각 줄은 JSON 객체여야 합니다")
+            request = dict(request)
+            if "id" in request:
+                record["id"] = request.pop("id")
+            op = request.pop("op", None)
+            record["op"] = op
+            if op not in bear.OPERATIONS:
+                raise ValueError(f"알 수 없는 작업입니다: {op}")
+        except ValueError as e:
+            record.update(ok=False, error=str(e), type=type(e).__name__)
+            self._emit(index, record)
+            return
+
+        future = self.scheduler.submit(self._execute, op, request, lane="bulk")
+
+        def done(f):
+            error = f.exception()
+            if error is None:
+                record.update(ok=True, result=f.result())
+            else:
+                record.update(ok=False, error=str(error), type=type(error).__name__)
+            self._emit(index, record)
+
+        future.add_done_callback(done)
+
+    def run(self, lines: Iterable[str]) -> int:
+        """모든 입력을 실행하고 실패한 작업 수 반환"""
+        with bear.span("batch", order=self.order):
+            index = 0
+            for line in lines:
+                if not line.strip():
+                    continue
+                self.submit(index, line)
+                index += 1
+            self.scheduler.shutdown(wait=True)
+        return self.failed
+
+    def run_requests(self, requests: Iterable[Dict[str, Any]]) -> int:
+        """파싱된 요청 목록을 실행하고 실패한 작업 수 반환 (파이썬에서 호출할 때)"""
+        with bear.span("batch", order=self.order):
+            for index, request in enumerate(requests):
+                self.submit_request(index, request)
+            self.scheduler.shutdown(wait=True)
+        return self.failed
+
+
+def run_batch(
+    reader: IO[str] = sys.stdin,
+    writer: IO[str] = sys.stdout,
+    concurrency: int = 4,
+    rate: float = 0.0,
+    order: str = "input"
+) -> int:
+    """NDJSON 배치 실행 (실패가 있으면 종료 코드 1)"""
+    runner = BatchRunner(writer, concurrency=concurrency, rate=rate, order=order)
+    return 1 if runner.run(reader) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_batch())
@@ -6,17 +6,50 @@ Bear 노트앱과의 상호작용을 위한 Python API
 X-Callback-URL 스킴을 통해 노트 생성, 검색, 수정 등을 지원합니다.
 """
 
+import sys
 import subprocess
 import urllib.parse
 import json
 import os
-from typing import Optional, Dict, List, Any
+import io
+import base64
+import hashlib
+import time
+import uuid
+import asyncio
+import inspect
+import threading
+import functools
+import contextvars
+from datetime import date, datetime
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Any, Callable, Iterable, Tuple
 
 
 # xcall 도구 경로
 XCALL_PATH = "/Applications/xcall.app/Contents/MacOS/xcall"
 # Bear API 토큰
 BEAR_TOKEN = os.environ.get("BEAR_API_TOKEN", "")
+# 스팬을 JSON Lines로 기록할 파일 (설정 시 자동 활성화)
+BEAR_TRACE_FILE = os.environ.get("BEAR_TRACE_FILE", "")
+# 한 번에 전달할 URL 최대 길이 (초과하는 텍스트는 나눠서 전송)
+MAX_URL_LENGTH = int(os.environ.get("BEAR_MAX_URL_LENGTH", "65536"))
+# UTF-8 4바이트 문자 하나가 퍼센트 인코딩되면 최대 12자
+_MAX_ENCODED_PER_CHAR = 12
+# add_file로 첨부할 수 있는 최대 파일 크기 (바이트), 실제 한도는 URL 길이에서 정해지는
+# file_size_limit()과 이 값 중 작은 쪽 (파일은 URL 하나로 보내므로 MAX_URL_LENGTH를 넘을 수 없음)
+MAX_FILE_SIZE = int(os.environ.get("BEAR_MAX_FILE_SIZE", str(16 * 1024 * 1024)))
+# 파일을 읽어 base64로 인코딩할 블록 크기 (3의 배수여야 블록별 인코딩 결과를 이어 붙일 수 있음)
+_FILE_BLOCK_SIZE = 3 * 64 * 1024
+# todo/today/untagged/locked 결과를 재사용하는 최대 시간(초)
+LIST_CACHE_TTL = float(os.environ.get("BEAR_LIST_CACHE_TTL", "30"))
+# grab_urls에서 같은 호스트를 캡처하는 초당 최대 횟수
+GRAB_HOST_RATE = float(os.environ.get("BEAR_GRAB_HOST_RATE", "1"))
+# create_note(idempotency_key=...) 기록을 유지하는 시간(초)
+IDEMPOTENCY_TTL = float(os.environ.get("BEAR_IDEMPOTENCY_TTL", str(30 * 24 * 3600)))
+# 이 시간(초)보다 최근에 선점된 키는 다른 호출이 만드는 중으로 봄
+IDEMPOTENCY_LEASE = float(os.environ.get("BEAR_IDEMPOTENCY_LEASE", "120"))
 
 
 def has_xcall() -> bool:
@@ -24,6 +57,342 @@ def has_xcall() -> bool:
     return os.path.exists(XCALL_PATH)
 
 
+def is_bear_running() -> bool:
+    """Bear 앱 실행 여부 확인 (전송 계층이 교체된 경우 항상 True)"""
+    if _transport is not None:
+        return True
+    try:
+        result = subprocess.run(["pgrep", "-x", "Bear"], capture_output=True, check=False)
+    except OSError:
+        return False
+    return result.returncode == 0
+
+
+class Span:
+    """
+    Bear 작업 하나의 실행 구간
+
+    Attributes:
+        name: 스팬 이름 (함수명, call_bear, encode/spawn/bear/parse 단계)
+        attrs: 내보내기용 속성 (액션 이름, 인자 크기 등)
+        args: 작업에 전달된 원본 인자 (훅 전용, 내보내지 않음)
+        result: 작업 반환값 (훅 전용, 내보내지 않음)
+        error: 예외 발생 시 예외 문자열
+    """
+
+    __slots__ = (
+        "name", "attrs", "args", "result", "error",
+        "trace_id", "span_id", "parent_id", "start", "end",
+    )
+
+    def __init__(self, name: str, parent: Optional["Span"], attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.args: Dict[str, Any] = {}
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.span_id = uuid.uuid4().hex[:16]
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self.end: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        """경과 시간(초)"""
+        return (self.end or time.time()) - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 직렬화용 딕셔너리"""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration": self.duration,
+            "attrs": self.attrs,
+            "error": self.error,
+        }
+
+
+# 현재 실행 중인 스팬 (스레드/태스크별 컨텍스트)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("bear_span", default=None)
+# 등록된 (before, after) 훅 목록
+_hooks: List[Tuple[Optional[Callable[[Span], None]], Optional[Callable[[Span], None]]]] = []
+_hooks_lock = threading.Lock()
+
+
+def add_hook(
+    before: Optional[Callable[[Span], None]] = None,
+    after: Optional[Callable[[Span], None]] = None
+) -> Callable[[], None]:
+    """
+    모든 스팬 시작/종료 시 호출될 훅 등록
+
+    훅에서 난 예외는 표준 오류에 기록하고 무시하므로 작업 결과와 다른 훅에 영향을 주지 않습니다.
+
+    Args:
+        before: 스팬 시작 시 호출 (span)
+        after: 스팬 종료 시 호출 (span)
+
+    Returns:
+        훅을 해제하는 함수
+    """
+    entry = (before, after)
+    with _hooks_lock:
+        _hooks.append(entry)
+
+    def remove() -> None:
+        with _hooks_lock:
+            if entry in _hooks:
+                _hooks.remove(entry)
+
+    return remove
+
+
+def current_span() -> Optional[Span]:
+    """현재 컨텍스트의 스팬 반환"""
+    return _current_span.get()
+
+
+def start_span(name: str, **attrs: Any) -> Span:
+    """
+    현재 스팬의 자식 스팬을 시작하되 현재 스팬으로 설정하지는 않음
+
+    여러 번에 나눠 실행되는 작업(이터레이터 등)에 쓰며, 실행할 때마다
+    use_span()으로 잠시 현재 스팬으로 설정하고 끝나면 finish_span()을 호출합니다.
+    """
+    s = Span(name, _current_span.get(), attrs)
+    for before, _ in list(_hooks):
+        if before:
+            _call_hook(before, s)
+    return s
+
+
+def finish_span(s: Span, error: Optional[BaseException] = None) -> None:
+    """start_span()으로 시작한 스팬 종료 (이미 끝났으면 무시)"""
+    if s.end is not None:
+        return
+    if error is not None:
+        s.error = f"{type(error).__name__}: {error}"
+    s.end = time.time()
+    for _, after in list(_hooks):
+        if after:
+            _call_hook(after, s)
+
+
+def _call_hook(hook: Callable[[Span], None], s: Span) -> None:
+    # 트레이싱/캐시 훅의 오류가 Bear 작업을 실패시키거나 다른 훅을 막지 않도록 격리
+    try:
+        hook(s)
+    except Exception as e:
+        print(f"bear: ignoring error in span hook for {s.name}: {type(e).__name__}: {e}", file=sys.stderr)
+
+
+@contextmanager
+def use_span(s: Span):
+    """with 블록 안에서만 s를 현재 스팬으로 설정 (스팬을 끝내지는 않음)"""
+    token = _current_span.set(s)
+    try:
+        yield s
+    finally:
+        _current_span.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs: Any):
+    """
+    중첩 스팬 생성 (현재 스팬의 자식으로 연결)
+
+    Args:
+        name: 스팬 이름
+        **attrs: 스팬 속성
+    """
+    s = start_span(name, **attrs)
+    error: Optional[BaseException] = None
+    try:
+        with use_span(s):
+            yield s
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        finish_span(s, error)
+
+
+def _summarize(value: Any) -> Any:
+    """스팬 속성용 값 요약 (긴 문자열은 길이만 기록)"""
+    if isinstance(value, str) and len(value) > 80:
+        return {"len": len(value)}
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return type(value).__name__
+
+
+# @operation으로 등록된 공개 작업 (이름 -> 함수)
+OPERATIONS: Dict[str, Callable[..., Any]] = {}
+
+
+def operation(func: Callable) -> Callable:
+    """공개 Bear 작업을 스팬으로 감싸고 OPERATIONS에 등록하는 데코레이터"""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        with span(func.__name__) as s:
+            s.args = dict(bound.arguments)
+            s.attrs.update({k: _summarize(v) for k, v in s.args.items()})
+            s.result = func(*args, **kwargs)
+            return s.result
+
+    OPERATIONS[func.__name__] = wrapper
+    return wrapper
+
+
+class JsonlSpanExporter:
+    """
+    종료된 스팬을 JSON Lines 파일로 기록하는 after 훅
+
+    Example:
+        remove = add_hook(after=JsonlSpanExporter("/tmp/bear-trace.jsonl"))
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, s: Span) -> None:
+        line = json.dumps(s.to_dict(), ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+def enable_tracing(path: str) -> Callable[[], None]:
+    """
+    스팬을 JSON Lines 파일로 내보내기 시작
+
+    Args:
+        path: 출력 파일 경로
+
+    Returns:
+        트레이싱을 중지하는 함수
+    """
+    return add_hook(after=JsonlSpanExporter(path))
+
+
+if BEAR_TRACE_FILE:
+    enable_tracing(BEAR_TRACE_FILE)
+
+
+def map_concurrent(
+    func: Callable[..., Any],
+    items: Iterable[Any],
+    max_workers: int = 4
+) -> List[Any]:
+    """
+    스레드 풀에서 func를 병렬 실행 (호출자의 스팬 컨텍스트 유지)
+
+    Args:
+        func: 각 항목에 적용할 함수
+        items: 입력 항목
+        max_workers: 최대 동시 실행 수
+
+    Returns:
+        입력 순서대로 정렬된 결과 목록
+    """
+    items = list(items)
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(contextvars.copy_context().run, func, item)
+            for item in items
+        ]
+        return [f.result() for f in futures]
+
+
+class RateLimiter:
+    """
+    토큰 버킷 방식 호출 속도 제한 (스레드 안전)
+
+    Args:
+        rate: 초당 허용 호출 수 (0 이하면 제한 없음)
+        burst: 한 번에 몰아서 허용할 최대 호출 수
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """호출 가능해질 때까지 대기"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+async def run_async(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Bear 작업을 asyncio에서 실행 (스팬 컨텍스트 유지)
+
+    Example:
+        result = await run_async(search_notes, term="python")
+    """
+    return await asyncio.to_thread(func, *args, **kwargs)
+
+
+# call_bear가 xcall/open 대신 사용할 전송 함수 (url, need_response) -> stdout
+_transport: Optional[Callable[[str, bool], Optional[str]]] = None
+
+
+def set_transport(
+    transport: Optional[Callable[[str, bool], Optional[str]]]
+) -> Optional[Callable[[str, bool], Optional[str]]]:
+    """
+    call_bear 전송 계층 교체
+
+    Args:
+        transport: (url, need_response)를 받아 응답 문자열을 반환하는 함수
+            None이면 기본 xcall/open 사용
+
+    Returns:
+        이전 전송 함수
+    """
+    global _transport
+    previous = _transport
+    _transport = transport
+    return previous
+
+
+def _run(args: List[str], capture: bool) -> str:
+    """프로세스 실행 (spawn/bear 단계를 스팬으로 분리)"""
+    with span("spawn", argv0=os.path.basename(args[0])):
+        proc = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE if capture else None,
+            stderr=subprocess.PIPE if capture else None,
+            text=True
+        )
+    with span("bear"):
+        stdout, _ = proc.communicate()
+    return stdout or ""
+
+
 def call_bear(
     action: str,
     params: Dict[str, str],
@@ -40,48 +409,190 @@ def call_bear(
     Returns:
         need_response=True일 때 JSON 응답, 아니면 None
     """
-    # 토큰이 필요한 액션인 경우 추가
-    if action in ["search", "tags", "open-tag", "todo", "today", "untagged", "locked"]:
-        if BEAR_TOKEN:
-            params["token"] = BEAR_TOKEN
-
-    # URL 생성
-    query = urllib.parse.urlencode(params)
-    url = f"bear://x-callback-url/{action}"
-    if query:
-        url = f"{url}?{query}"
-
-    if need_response:
-        if has_xcall():
-            # xcall로 응답 받기
-            result = subprocess.run(
-                [XCALL_PATH, "-url", url],
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            if result.stdout:
-                try:
-                    return json.loads(result.stdout)
-                except json.JSONDecodeError:
-                    return None
-            return None
-        else:
-            # xcall이 없으면 앱만 열기 (응답 불가)
-            subprocess.run(["open", url], check=False)
-            return None
+    with span("call_bear", action=action, need_response=need_response) as s:
+        # 토큰이 필요한 액션인 경우 추가
+        if action in ["search", "tags", "open-tag", "todo", "today", "untagged", "locked"]:
+            if BEAR_TOKEN:
+                params["token"] = BEAR_TOKEN
+
+        # URL 생성
+        with span("encode") as enc:
+            query = urllib.parse.urlencode(params)
+            url = f"bear://x-callback-url/{action}"
+            if query:
+                url = f"{url}?{query}"
+            enc.attrs["url_len"] = len(url)
+
+        return _send(url, need_response, s)
+
+
+def _send(url: str, need_response: bool, s: Span) -> Optional[Dict[str, Any]]:
+    """완성된 URL을 전송 계층으로 보내고 응답 파싱"""
+    if _transport is not None:
+        # 대체 전송 계층 (에뮬레이터, 테스트용)
+        with span("bear"):
+            stdout = _transport(url, need_response) or ""
+    elif need_response and has_xcall():
+        # xcall로 응답 받기
+        stdout = _run([XCALL_PATH, "-url", url], capture=True)
     else:
         # open 명령으로 실행 (응답 없음)
-        subprocess.run(["open", url], check=False)
+        # need_response인데 xcall이 없으면 앱만 열기 (응답 불가)
+        _run(["open", url], capture=False)
         return None
 
+    s.attrs["response_len"] = len(stdout)
+    if need_response and stdout:
+        with span("parse"):
+            try:
+                return json.loads(stdout)
+            except json.JSONDecodeError:
+                return None
+    return None
+
+
+def _chunk_text(text: str, budget: int) -> List[str]:
+    """
+    URL 인코딩 후 길이가 budget 이하가 되도록 텍스트 분할
+
+    최악의 경우에도 한도를 넘지 않는 크기의 블록(가능하면 줄 경계)으로 나눠
+    블록별 인코딩 길이만 계산한 뒤, 한도 안에서 이웃 블록을 합칩니다.
+    인코딩 버퍼는 블록 크기로 제한되고 전체 시간은 텍스트 길이에 비례합니다.
+    """
+    if len(text) * _MAX_ENCODED_PER_CHAR <= budget:
+        return [text]
+    # 블록을 한도의 1/4 이하로 잡아 합칠 때 조각이 한도에 가깝게 채워지도록 함
+    step = max(1, budget // (_MAX_ENCODED_PER_CHAR * 4))
+    chunks: List[str] = []
+    start = pos = size = 0
+    while pos < len(text):
+        end = min(len(text), pos + step)
+        if end < len(text):
+            newline = text.rfind("\n", pos, end)
+            if newline > pos:
+                end = newline + 1
+        n = len(urllib.parse.quote_plus(text[pos:end]))
+        if pos > start and size + n > budget:
+            chunks.append(text[start:pos])
+            start, size = pos, 0
+        size += n
+        pos = end
+    chunks.append(text[start:])
+    return chunks
+
+
+def _text_budget(action: str, params: Dict[str, str]) -> int:
+    """text 파라미터에 쓸 수 있는 인코딩 길이"""
+    others = urllib.parse.urlencode({k: v for k, v in params.items() if k != "text"})
+    # 'bear://x-callback-url/{action}?' + '&text=' + 토큰 여유분
+    overhead = len(action) + len(others) + 64
+    return max(1024, MAX_URL_LENGTH - overhead)
+
+
+def _append_chunks(target: Dict[str, str], chunks: List[str], mode: str, header: str) -> None:
+    """
+    나눠진 텍스트를 순서대로 add-text로 전송
+
+    add-text 응답에는 노트 전체가 담기므로 응답을 받지 않습니다
+    (조각마다 전체 노트를 파싱하면 시간이 노트 크기의 제곱에 비례).
+    """
+    if mode == "prepend":
+        # 앞에 붙이는 경우 마지막 조각부터 보내야 원래 순서가 유지됨
+        chunks = list(reversed(chunks))
+    for i, chunk in enumerate(chunks):
+        params = dict(target)
+        params["text"] = chunk
+        params["mode"] = "replace_all" if mode == "replace_all" and i == 0 else (
+            "prepend" if mode == "prepend" else "append"
+        )
+        if header:
+            params["header"] = header
+        with span("chunk", index=i, count=len(chunks)):
+            call_bear("add-text", params, need_response=False)
+
 
+def content_key(title: str, text: str = "", tags: str = "") -> str:
+    """create_note 인자로 만든 멱등성 키 (제목, 내용, 태그가 같으면 같은 키)"""
+    digest = hashlib.sha256("\0".join((title, text, tags)).encode("utf-8")).hexdigest()
+    return "content:" + digest
+
+
+def set_idempotency_store(store: Any) -> Any:
+    """
+    create_note(idempotency_key=...) 기록을 보관할 저장소 등록
+
+    Args:
+        store: get_with_time/put/put_if_absent/replace를 지원하는 저장소 (store.KVStore)
+            None이면 다음 사용 시 기본 저장소(~/.cache/bear-skill/idempotency.sqlite)를 엶
+
+    Returns:
+        이전 저장소
+    """
+    global _idempotency_store
+    with _idempotency_lock:
+        previous = _idempotency_store
+        _idempotency_store = store
+    return previous
+
+
+def _idempotency() -> Any:
+    global _idempotency_store
+    with _idempotency_lock:
+        if _idempotency_store is None:
+            try:
+                from .store import KVStore, default_path
+            except ImportError:
+                from store import KVStore, default_path
+            _idempotency_store = KVStore(default_path("idempotency.sqlite"), "create_note")
+        return _idempotency_store
+
+
+def idempotency_record(key: str) -> Optional[Dict[str, Any]]:
+    """
+    create_note(idempotency_key=key)의 유효한 기록 (없거나 만료되었으면 None)
+
+    Returns:
+        {state, title, ...} (state는 pending, sent, done 중 하나, done이면 identifier 포함)
+    """
+    found = _idempotency().get_with_time(key)
+    if found is None or time.time() - found[1] >= IDEMPOTENCY_TTL:
+        return None
+    return found[0]
+
+
+# create_note 멱등성 기록 저장소 (처음 사용할 때 엶)
+_idempotency_store: Any = None
+_idempotency_lock = threading.Lock()
+
+
+def _recover_created(title: str, since: float) -> Optional[Dict[str, str]]:
+    """응답을 받지 못한 생성 시도가 실제로 노트를 만들었는지 제목으로 확인"""
+    if not title:
+        return None
+    try:
+        notes = search_notes(term=title)
+    except Exception:
+        return None
+    for note in notes or ():
+        created = note.get("creationDate") or ""
+        try:
+            timestamp = datetime.fromisoformat(created.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            continue
+        # Bear 시각은 초 단위로 잘릴 수 있으므로 1초 여유
+        if note.get("title") == title and timestamp >= since - 1:
+            return {"identifier": note["identifier"], "title": title}
+    return None
+
+
+@operation
 def create_note(
     title: str,
     text: str = "",
     tags: str = "",
     add_timestamp: bool = False,
-    return_id: bool = False
+    return_id: bool = False,
+    idempotency_key: str = ""
 ) -> Optional[Dict[str, str]]:
     """
     새 노트 생성
@@ -92,23 +603,101 @@ def create_note(
         tags: 쉼표로 구분된 태그 목록
         add_timestamp: 현재 날짜/시간 추가 여부
         return_id: 응답(노트 ID) 반환 여부
+        idempotency_key: 같은 키로 다시 호출하면 Bear를 호출하지 않고 처음 만든 노트를 반환
+            ("auto"면 제목, 내용, 태그로 키를 만듦, IDEMPOTENCY_TTL 동안 유효)
 
     Returns:
         return_id=True일 때 {identifier, title} 반환, 아니면 None
+
+    Note:
+        text가 MAX_URL_LENGTH를 넘으면 첫 조각으로 노트를 만든 뒤
+        나머지를 add-text append로 순서대로 이어 붙입니다.
+
+        idempotency_key를 주면 노트 ID를 기록하기 위해 xcall로 응답을 받습니다.
+        키는 저장소에서 원자적으로 선점하므로 같은 키로 동시에 호출해도 노트는 하나만 만들어집니다.
+        xcall이 없어 보냈다는 사실만 기록된 키는 제목으로 노트를 찾아 반환하며,
+        찾지 못하면 return_id=True일 때 RuntimeError를 냅니다.
     """
+    if not idempotency_key:
+        return _create_note(title, text, tags, add_timestamp, return_id)
+
+    key = content_key(title, text, tags) if idempotency_key == "auto" else idempotency_key
+    store = _idempotency()
+    s = current_span()
+    claim = {"state": "pending", "title": title, "started": time.time(), "owner": uuid.uuid4().hex}
+    found = store.put_if_absent(key, claim, IDEMPOTENCY_TTL)
+    if found is not None:
+        record = found[0]
+        if record["state"] in ("pending", "sent"):
+            # 이전 시도가 응답 없이 끝남: 그 사이 노트가 만들어졌으면 그 노트를 기록
+            recovered = _recover_created(record["title"], record.get("started", found[1] - IDEMPOTENCY_LEASE))
+            if recovered is not None:
+                record = dict(recovered, state="done")
+                store.put(key, record)
+        if record["state"] == "pending":
+            if not record.get("failed") and time.time() - record["started"] < IDEMPOTENCY_LEASE:
+                raise RuntimeError(f"같은 멱등성 키로 노트를 만드는 중입니다: {key}")
+            # 실패했거나 오래된 시도: 다른 호출보다 먼저 교체한 쪽만 다시 만듦
+            if not store.replace(key, record, claim):
+                raise RuntimeError(f"같은 멱등성 키로 노트를 만드는 중입니다: {key}")
+        else:
+            s.attrs["idempotent"] = "hit"
+            if not return_id:
+                return None
+            if not record.get("identifier"):
+                raise RuntimeError(
+                    f"노트를 만들었는지 확인할 수 없습니다 (응답 없이 보냄, 키: {key}): {record['title']}"
+                )
+            return {"identifier": record["identifier"], "title": record["title"]}
+
+    s.attrs["idempotent"] = "miss"
+    try:
+        result = _create_note(title, text, tags, add_timestamp, True)
+    except BaseException:
+        # 보냈는지 알 수 없음: 다음 호출이 제목으로 확인한 뒤 다시 만들 수 있게 표시
+        store.put(key, dict(claim, failed=True))
+        raise
+    if isinstance(result, dict) and result.get("identifier"):
+        store.put(key, {"state": "done", "identifier": result["identifier"], "title": result.get("title", title)})
+    else:
+        store.put(key, {"state": "sent", "title": title, "started": claim["started"]})
+    return result if return_id else None
+
+
+def _create_note(
+    title: str,
+    text: str,
+    tags: str,
+    add_timestamp: bool,
+    return_id: bool
+) -> Optional[Dict[str, str]]:
     params = {}
     if title:
         params["title"] = title
-    if text:
-        params["text"] = text
     if tags:
         params["tags"] = tags
     if add_timestamp:
         params["timestamp"] = "yes"
 
-    return call_bear("create", params, need_response=return_id)
+    chunks = _chunk_text(text, _text_budget("create", params)) if text else []
+    if len(chunks) <= 1:
+        if text:
+            params["text"] = text
+        return call_bear("create", params, need_response=return_id)
+
+    params["text"] = chunks[0]
+    result = call_bear("create", params, need_response=True)
+    if isinstance(result, dict) and result.get("identifier"):
+        target = {"id": result["identifier"]}
+    elif title:
+        target = {"title": title}
+    else:
+        raise ValueError("제목 없는 대용량 노트는 xcall 응답(노트 ID)이 필요합니다")
+    _append_chunks(target, chunks[1:], "append", "")
+    return result if return_id else None
 
 
+@operation
 def search_notes(
     term: str = "",
     tag: str = ""
@@ -135,6 +724,7 @@ def search_notes(
     return None
 
 
+@operation
 def add_text(
     note_id: str = "",
     note_title: str = "",
@@ -151,6 +741,10 @@ def add_text(
         text: 추가할 텍스트
         mode: 모드 (append, prepend, replace_all, replace)
         header: 특정 헤더에만 적용 (선택사항)
+
+    Note:
+        text가 MAX_URL_LENGTH를 넘으면 여러 번의 add-text로 나눠 보냅니다.
+        replace 모드는 나눌 수 없으므로 ValueError가 발생합니다.
     """
     params = {}
     if note_id:
@@ -160,16 +754,25 @@ def add_text(
     else:
         raise ValueError("note_id 또는 note_title 중 하나는 필수입니다")
 
-    if text:
-        params["text"] = text
     if mode:
         params["mode"] = mode
     if header:
         params["header"] = header
 
+    chunks = _chunk_text(text, _text_budget("add-text", params)) if text else []
+    if len(chunks) > 1:
+        if mode == "replace":
+            raise ValueError("replace 모드에서는 MAX_URL_LENGTH를 넘는 텍스트를 보낼 수 없습니다")
+        target = {k: v for k, v in params.items() if k in ("id", "title")}
+        _append_chunks(target, chunks, mode or "append", header)
+        return
+
+    if text:
+        params["text"] = text
     call_bear("add-text", params, need_response=False)
 
 
+@operation
 def open_note(
     note_id: str = "",
     note_title: str = "",
@@ -197,6 +800,34 @@ def open_note(
     call_bear("open-note", params, need_response=False)
 
 
+@operation
+def get_note_contents(note_id: str = "", note_title: str = "") -> Optional[Dict[str, Any]]:
+    """
+    노트 본문과 메타데이터 조회 (창을 열지 않음, xcall 필요)
+
+    Args:
+        note_id: 노트 ID (note_title 없으면 필수)
+        note_title: 노트 제목 (note_id 없으면 대신 사용)
+
+    Returns:
+        {note, identifier, title, tags, modificationDate, creationDate, is_trashed}
+        (note가 본문), 가져올 수 없으면 None
+    """
+    params = {"open_note": "no", "show_window": "no"}
+    if note_id:
+        params["id"] = note_id
+    elif note_title:
+        params["title"] = note_title
+    else:
+        raise ValueError("note_id 또는 note_title 중 하나는 필수입니다")
+
+    result = call_bear("open-note", params, need_response=True)
+    if isinstance(result, dict) and "note" in result:
+        return result
+    return None
+
+
+@operation
 def get_tags() -> Optional[List[Dict[str, str]]]:
     """
     모든 태그 조회 (토큰 필요)
@@ -210,6 +841,180 @@ def get_tags() -> Optional[List[Dict[str, str]]]:
     return None
 
 
+# todo/today/untagged/locked 결과 캐시: (액션, 검색어) -> (저장 시각, 노트 목록)
+_list_cache: Dict[Tuple[str, str], Tuple[float, List[Dict[str, Any]]]] = {}
+_list_cache_lock = threading.Lock()
+# today를 Bear 대신 답할 노트 메타데이터 제공 함수 (없거나 None을 반환하면 Bear에 요청)
+_metadata_index: Optional[Callable[[], Optional[List[Dict[str, Any]]]]] = None
+
+
+def set_metadata_index(
+    provider: Optional[Callable[[], Optional[List[Dict[str, Any]]]]]
+) -> Optional[Callable[[], Optional[List[Dict[str, Any]]]]]:
+    """
+    today_notes()가 사용할 노트 메타데이터 제공 함수 등록
+
+    Args:
+        provider: search_notes(term="") 형식의 목록을 반환하는 함수
+            최신 상태를 보장할 수 없으면 None을 반환해야 합니다 (Bear에 요청)
+
+    Returns:
+        이전 제공 함수
+
+    Example:
+        set_metadata_index(get_cache().fresh_notes)
+    """
+    global _metadata_index
+    previous = _metadata_index
+    _metadata_index = provider
+    return previous
+
+
+def _list_notes(action: str, search: str, refresh: bool) -> Optional[List[Dict[str, Any]]]:
+    """목록 액션 호출 (LIST_CACHE_TTL 동안 결과 재사용)"""
+    key = (action, search)
+    if not refresh:
+        with _list_cache_lock:
+            cached = _list_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < LIST_CACHE_TTL:
+            current_span().attrs["cache"] = "hit"
+            return list(cached[1])
+    params = {"show_window": "no"}
+    if search:
+        params["search"] = search
+    result = call_bear(action, params, need_response=True)
+    if not isinstance(result, list):
+        return None
+    with _list_cache_lock:
+        _list_cache[key] = (time.monotonic(), result)
+    return list(result)
+
+
+def invalidate_lists(*actions: str) -> None:
+    """목록 캐시 무효화 (인자가 없으면 전체)"""
+    with _list_cache_lock:
+        for key in list(_list_cache):
+            if not actions or key[0] in actions:
+                del _list_cache[key]
+
+
+# 쓰기 작업별로 결과가 바뀔 수 있는 목록
+_LIST_EFFECTS = {
+    "create_note": ("today", "todo", "untagged"),
+    "add_text": ("today", "todo", "untagged"),
+    "add_file": ("today",),
+    "grab_url": ("today", "untagged"),
+    "rename_tag": ("today",),
+    "delete_tag": ("today", "untagged"),
+}
+
+
+def _update_lists(s: Span) -> None:
+    """쓰기 작업 후 영향을 받는 목록만 갱신하는 after 훅"""
+    if s.error is not None or not _list_cache:
+        return
+    if s.name in ("trash_note", "archive_note"):
+        # 보관/삭제된 노트는 모든 목록에서 빠지므로 다시 요청하지 않고 제거
+        note_id, title = s.args.get("note_id"), s.args.get("note_title")
+        with _list_cache_lock:
+            for key, (stored, notes) in list(_list_cache.items()):
+                kept = [
+                    n for n in notes
+                    if not (n.get("identifier") == note_id if note_id else n.get("title") == title)
+                ]
+                _list_cache[key] = (stored, kept)
+    elif s.name in _LIST_EFFECTS:
+        invalidate_lists(*_LIST_EFFECTS[s.name])
+
+
+add_hook(after=_update_lists)
+
+
+@operation
+def todo_notes(search: str = "", refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
+    """
+    할 일(미완료 체크박스)이 있는 노트 (토큰 필요)
+
+    Args:
+        search: 결과 안에서 검색할 문자열 (선택사항)
+        refresh: True면 캐시를 무시하고 Bear에 요청
+
+    Returns:
+        search_notes와 같은 형식의 노트 목록
+    """
+    return _list_notes("todo", search, refresh)
+
+
+@operation
+def today_notes(search: str = "", refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
+    """
+    오늘 생성/수정한 노트 (토큰 필요)
+
+    set_metadata_index()로 메타데이터 제공 함수가 등록되어 있고 검색어가 없으면
+    Bear에 요청하지 않고 날짜로 거릅니다.
+
+    Args:
+        search: 결과 안에서 검색할 문자열 (선택사항, 지정하면 항상 Bear에 요청)
+        refresh: True면 캐시와 메타데이터를 무시하고 Bear에 요청
+
+    Returns:
+        search_notes와 같은 형식의 노트 목록
+    """
+    provider = _metadata_index
+    if provider is not None and not search and not refresh:
+        notes = provider()
+        if notes is not None:
+            current_span().attrs["source"] = "metadata_index"
+            today = datetime.now().date()
+            return [
+                n for n in notes
+                if _local_date(n.get("modificationDate")) == today
+                or _local_date(n.get("creationDate")) == today
+            ]
+    return _list_notes("today", search, refresh)
+
+
+def _local_date(value: Optional[str]) -> Optional[date]:
+    """Bear 날짜 문자열(ISO 8601)의 현지 날짜"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone().date()
+    except ValueError:
+        return None
+
+
+@operation
+def untagged_notes(search: str = "", refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
+    """
+    태그 없는 노트 (토큰 필요)
+
+    Args:
+        search: 결과 안에서 검색할 문자열 (선택사항)
+        refresh: True면 캐시를 무시하고 Bear에 요청
+
+    Returns:
+        search_notes와 같은 형식의 노트 목록
+    """
+    return _list_notes("untagged", search, refresh)
+
+
+@operation
+def locked_notes(search: str = "", refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
+    """
+    잠긴 노트 (토큰 필요)
+
+    Args:
+        search: 결과 안에서 검색할 문자열 (선택사항)
+        refresh: True면 캐시를 무시하고 Bear에 요청
+
+    Returns:
+        search_notes와 같은 형식의 노트 목록
+    """
+    return _list_notes("locked", search, refresh)
+
+
+@operation
 def open_tag(name: str) -> None:
     """
     특정 태그의 모든 노트 표시
@@ -221,6 +1026,7 @@ def open_tag(name: str) -> None:
     call_bear("open-tag", params, need_response=False)
 
 
+@operation
 def rename_tag(old_name: str, new_name: str) -> None:
     """
     태그 이름 변경
@@ -236,6 +1042,7 @@ def rename_tag(old_name: str, new_name: str) -> None:
     call_bear("rename-tag", params, need_response=False)
 
 
+@operation
 def delete_tag(name: str) -> None:
     """
     태그 삭제
@@ -247,6 +1054,7 @@ def delete_tag(name: str) -> None:
     call_bear("delete-tag", params, need_response=False)
 
 
+@operation
 def trash_note(note_id: str = "", note_title: str = "") -> None:
     """
     노트를 휴지통으로 이동
@@ -266,6 +1074,7 @@ def trash_note(note_id: str = "", note_title: str = "") -> None:
     call_bear("trash", params, need_response=False)
 
 
+@operation
 def archive_note(note_id: str = "", note_title: str = "") -> None:
     """
     노트를 보관함으로 이동
@@ -285,6 +1094,7 @@ def archive_note(note_id: str = "", note_title: str = "") -> None:
     call_bear("archive", params, need_response=False)
 
 
+@operation
 def grab_url(
     url: str,
     tags: str = "",
@@ -306,3 +1116,233 @@ def grab_url(
         params["tags"] = tags
 
     return call_bear("grab-url", params, need_response=return_id)
+
+
+def _by_host_round_robin(urls: List[str]) -> List[int]:
+    """호스트별로 번갈아 가며 실행할 순서 (입력 인덱스 목록)"""
+    queues: Dict[str, List[int]] = {}
+    for index, url in enumerate(urls):
+        queues.setdefault(urllib.parse.urlsplit(url).hostname or "", []).append(index)
+    order = []
+    pending = [q[::-1] for q in queues.values()]
+    while pending:
+        for queue in pending:
+            order.append(queue.pop())
+        pending = [q for q in pending if q]
+    return order
+
+
+@operation
+def grab_urls(
+    urls: Iterable[Any],
+    tags: str = "",
+    return_id: bool = False,
+    max_workers: int = 4,
+    host_rate: float = GRAB_HOST_RATE
+) -> List[Dict[str, Any]]:
+    """
+    여러 웹페이지를 병렬로 캡처
+
+    동시 캡처는 max_workers개로 제한하고, 같은 호스트는 초당 host_rate번을 넘지 않게 간격을 둡니다.
+    호스트별로 번갈아 실행하므로 한 사이트의 URL이 많아도 다른 사이트 캡처가 밀리지 않습니다.
+
+    Args:
+        urls: URL 문자열 또는 {url, tags} 딕셔너리 목록 (tags가 없으면 공통 tags 사용)
+        tags: 공통 태그 목록
+        return_id: 노트 ID 수집 여부 (True면 응답이 없는 URL은 실패로 보고)
+        max_workers: 최대 동시 캡처 수
+        host_rate: 호스트별 초당 최대 캡처 수 (0 이하면 제한 없음)
+
+    Returns:
+        입력 순서대로 {url, ok, result 또는 error} 목록
+    """
+    items = [item if isinstance(item, dict) else {"url": item} for item in urls]
+    for item in items:
+        if not item.get("url"):
+            raise ValueError(f"url이 없는 항목입니다: {item}")
+    limiters: Dict[str, RateLimiter] = {}
+    lock = threading.Lock()
+
+    def capture(item: Dict[str, str]) -> Dict[str, Any]:
+        url = item["url"]
+        host = urllib.parse.urlsplit(url).hostname or ""
+        with lock:
+            limiter = limiters.setdefault(host, RateLimiter(host_rate))
+        limiter.acquire()
+        try:
+            result = grab_url(url, tags=item.get("tags", tags), return_id=return_id)
+        except Exception as e:
+            return {"url": url, "ok": False, "error": str(e)}
+        if return_id and not result:
+            return {"url": url, "ok": False, "error": "응답 없음 (xcall 확인)"}
+        return {"url": url, "ok": True, "result": result}
+
+    order = _by_host_round_robin([item["url"] for item in items])
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    for index, result in zip(order, map_concurrent(capture, [items[i] for i in order], max_workers=max_workers)):
+        results[index] = result
+    return results
+
+
+def file_size_limit(url_prefix: str = "bear://x-callback-url/add-file?&file=") -> int:
+    """
+    URL 하나로 보낼 수 있는 최대 파일 크기 (바이트)
+
+    base64는 3바이트를 4자로 늘리므로 (MAX_URL_LENGTH - 나머지 URL 길이) * 3 / 4이며,
+    MAX_FILE_SIZE가 더 작으면 그 값입니다. base64의 "+", "/"는 URL 인코딩에서 3자가 되므로
+    이 한도 안의 파일도 인코딩 결과가 MAX_URL_LENGTH를 넘으면 add_file이 ValueError를 냅니다.
+    """
+    return max(0, min(MAX_FILE_SIZE, (MAX_URL_LENGTH - len(url_prefix)) * 3 // 4))
+
+
+def _encode_file(path: str, prefix: str, limit: int) -> str:
+    """
+    prefix 뒤에 파일을 블록 단위로 읽어 base64 + URL 인코딩해 붙인 URL 반환
+
+    파일 전체나 base64 전체를 메모리에 올리지 않고 URL 하나를 버퍼에 한 번만 만들며,
+    길이가 limit을 넘으면 읽기를 멈추고 ValueError를 냅니다.
+    """
+    buffer = io.StringIO()
+    length = buffer.write(prefix)
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(_FILE_BLOCK_SIZE)
+            if not block:
+                break
+            length += buffer.write(urllib.parse.quote(base64.b64encode(block).decode("ascii"), safe=""))
+            if length > limit:
+                raise ValueError(
+                    f"인코딩한 파일이 URL 한도를 넘습니다: {path} (MAX_URL_LENGTH {limit}자 초과)"
+                )
+    return buffer.getvalue()
+
+
+@operation
+def add_file(
+    note_id: str = "",
+    path: str = "",
+    filename: str = "",
+    note_title: str = "",
+    mode: str = "append",
+    header: str = "",
+    return_response: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    기존 노트에 파일 첨부
+
+    Args:
+        note_id: 노트 ID (note_id, note_title 모두 없으면 새 노트 생성)
+        path: 첨부할 파일 경로
+        filename: Bear에 표시할 파일명 (기본값: path의 파일명)
+        note_title: 노트 제목 (note_id 없으면 대신 사용)
+        mode: 모드 (append, prepend, replace_all, replace)
+        header: 특정 헤더에만 적용 (선택사항)
+        return_response: 응답(노트 내용) 반환 여부
+
+    Returns:
+        return_response=True일 때 {note} 반환, 아니면 None
+
+    Raises:
+        ValueError: 파일이 file_size_limit()보다 크거나 인코딩한 URL이 MAX_URL_LENGTH를 넘는 경우
+    """
+    if not path:
+        raise ValueError("path는 필수입니다")
+    size = os.path.getsize(path)
+
+    params = {}
+    if note_id:
+        params["id"] = note_id
+    elif note_title:
+        params["title"] = note_title
+    params["filename"] = filename or os.path.basename(path)
+    if mode:
+        params["mode"] = mode
+    if header:
+        params["header"] = header
+
+    prefix = "bear://x-callback-url/add-file?" + urllib.parse.urlencode(params) + "&file="
+    limit = file_size_limit(prefix)
+    if size > limit:
+        raise ValueError(
+            f"파일이 너무 큽니다: {path} ({size} bytes > {limit} bytes, "
+            f"파일은 URL 하나로 보내므로 MAX_URL_LENGTH {MAX_URL_LENGTH}자와 MAX_FILE_SIZE로 제한됨)"
+        )
+
+    with span("call_bear", action="add-file", need_response=return_response) as s:
+        with span("encode", file_size=size) as enc:
+            url = _encode_file(path, prefix, MAX_URL_LENGTH)
+            enc.attrs["url_len"] = len(url)
+        return _send(url, return_response, s)
+
+
+@operation
+def add_files(
+    items: Iterable[Dict[str, str]],
+    max_workers: int = 4
+) -> List[Dict[str, Any]]:
+    """
+    여러 파일을 여러 노트에 병렬로 첨부
+
+    동시에 인코딩되는 파일은 max_workers개로 제한되고 파일마다 URL은 MAX_URL_LENGTH자를
+    넘지 않으므로, 인코딩 버퍼는 대략 max_workers * 2 * MAX_URL_LENGTH자 이하입니다.
+
+    Args:
+        items: add_file 인자 딕셔너리 목록 (note_id, path, filename 등)
+        max_workers: 최대 동시 첨부 수
+
+    Returns:
+        입력 순서대로 {item, ok, result 또는 error, type} 목록
+        (잘못된 항목이나 전송 실패는 해당 항목의 결과에만 기록되고 나머지는 계속 첨부)
+    """
+    def attach(item: Dict[str, str]) -> Dict[str, Any]:
+        try:
+            return {"item": item, "ok": True, "result": add_file(**item)}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # 알 수 없는 키(TypeError)나 응답 파싱 오류(KeyError)도 항목 하나의 실패로 기록
+            return {"item": item, "ok": False, "error": str(e), "type": type(e).__name__}
+
+    return map_concurrent(attach, items, max_workers=max_workers)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    명령행 진입점
+
+    Usage:
+        python3 bear.py serve --stdio    # 줄 단위 JSON-RPC 서버
+        python3 bear.py batch < ops.ndjson   # NDJSON 작업 일괄 실행
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="bear", description="Bear X-Callback-URL skill")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="run a long-lived JSON-RPC server")
+    serve.add_argument("--stdio", action="store_true", required=True,
+                       help="speak line-delimited JSON-RPC on stdin/stdout")
+    serve.add_argument("--workers", type=int, default=4, help="scheduler worker threads")
+    batch = sub.add_parser("batch", help="run NDJSON operations from stdin")
+    batch.add_argument("--concurrency", type=int, default=4, help="max concurrent operations")
+    batch.add_argument("--rate", type=float, default=0.0, help="max calls per second (0 = unlimited)")
+    batch.add_argument("--order", choices=["input", "completion"], default="input",
+                       help="output results in input order or as they complete")
+    args = parser.parse_args(argv)
+
+    # __main__으로 실행된 경우에도 다른 모듈과 같은 bear 모듈 상태를 쓰도록 지연 import
+    if args.command == "batch":
+        try:
+            from . import batch as batch_module
+        except ImportError:
+            import batch as batch_module
+        return batch_module.run_batch(
+            concurrency=args.concurrency, rate=args.rate, order=args.order
+        )
+
+    try:
+        from . import server
+    except ImportError:
+        import server
+    return server.serve_stdio(workers=args.workers)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+조건에 맞는 노트 일괄 보관/삭제
+
+태그, 날짜 범위, 제목 패턴, 태그 없음 같은 조건을 한 번만 노트 ID 목록으로 풀고,
+archive_note / trash_note를 ID로 묶어서 속도를 제한하며 실행합니다.
+제목으로 한 건씩 찾는 반복문보다 Bear 호출 수가 적고, 실행 전에 드라이런으로 대상을 확인할 수 있습니다.
+
+조건 (query dict, 모두 선택사항이며 AND로 결합):
+    tag              이 태그 또는 하위 태그가 있는 노트
+    term             Bear 검색어
+    title            제목 glob 패턴 (대소문자 무시, 예: "Daily *")
+    untagged         True면 태그 없는 노트만
+    created_after / created_before     생성 시각 범위
+    modified_after / modified_before   수정 시각 범위
+    (날짜는 epoch 초 또는 "2024-01-31" 같은 ISO 8601 문자열)
+
+Usage:
+    python3 bulk_notes.py archive --tag inbox --modified-before 2024-01-01 --dry-run
+    python3 bulk_notes.py trash --title 'Scratch *' --untagged --rate 20
+
+Example:
+    report = archive_where({"tag": "inbox", "modified_before": "2024-01-01"}, dry_run=True)
+    print(report["matched"], [n["title"] for n in report["notes"][:10]])
+"""
+
+import re
+import sys
+import time
+import fnmatch
+import argparse
+import threading
+from datetime import datetime
+from typing import Optional, Dict, List, Any, Callable, Set
+
+try:
+    from . import bear
+    from .snapshot import Snapshot, parse_date, note_tags
+except ImportError:
+    import bear
+    from snapshot import Snapshot, parse_date, note_tags
+
+
+QUERY_KEYS = (
+    "tag", "term", "title", "untagged",
+    "created_after", "created_before", "modified_after", "modified_before",
+)
+_DATE_KEYS = ("created_after", "created_before", "modified_after", "modified_before")
+# Bear 검색 결과에는 태그가 없으므로 Bear에 맡겨야 하는 조건
+_TAG_KEYS = ("tag", "untagged")
+_GLOB_RE = re.compile(r"[*?\[]")
+
+
+def _epoch(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"날짜 형식이 잘못되었습니다: {value!r}") from None
+    return parsed.timestamp()
+
+
+def normalize_query(query: Dict[str, Any]) -> Dict[str, Any]:
+    """조건 검증 및 날짜를 epoch 초로 변환 (알 수 없는 키는 ValueError)"""
+    unknown = set(query) - set(QUERY_KEYS)
+    if unknown:
+        raise ValueError(f"알 수 없는 조건입니다: {', '.join(sorted(unknown))}")
+    normalized = {k: v for k, v in query.items() if v not in (None, "", False)}
+    for key in _DATE_KEYS:
+        if key in normalized:
+            normalized[key] = _epoch(normalized[key])
+    if not normalized:
+        raise ValueError("조건이 비어 있습니다 (모든 노트가 대상이 되는 것을 막기 위해)")
+    return normalized
+
+
+def _under(tag: str, prefix: str) -> bool:
+    return tag == prefix or tag.startswith(prefix + "/")
+
+
+def note_matches(note: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    """
+    노트가 정규화된 조건에 맞는지 (term은 검사하지 않음)
+
+    tag/untagged 조건은 note에 "tags"가 있어야 검사할 수 있습니다. Bear 검색 결과에는
+    태그가 없으므로 이 경우 모든 노트를 태그 없음으로 보지 않고 ValueError를 냅니다
+    (resolve()는 이 조건을 Bear 검색으로 처리).
+    """
+    if "tag" in query or "untagged" in query:
+        if "tags" not in note:
+            raise ValueError("노트에 태그 정보가 없어 tag/untagged 조건을 검사할 수 없습니다")
+        tags = note_tags(note)
+        if query.get("untagged") and tags:
+            return False
+        if "tag" in query and not any(_under(t, query["tag"]) for t in tags):
+            return False
+    for key, column in (("created", "creationDate"), ("modified", "modificationDate")):
+        after, before = query.get(key + "_after"), query.get(key + "_before")
+        if after is None and before is None:
+            continue
+        value = parse_date(note.get(column))
+        if after is not None and value < after:
+            return False
+        if before is not None and value >= before:
+            return False
+    if "title" in query:
+        if not fnmatch.fnmatchcase((note.get("title") or "").casefold(), query["title"].casefold()):
+            return False
+    return True
+
+
+def resolve(
+    query: Dict[str, Any],
+    source: str = "search",
+    snapshot_path: Optional[str] = None,
+    cache: Any = None
+) -> List[Dict[str, str]]:
+    """
+    조건을 {identifier, title} 목록으로 변환 (Bear 호출은 최대 한 번)
+
+    Bear 검색 결과와 캐시의 노트 메타데이터에는 태그가 없으므로 tag는 search_notes(tag=...),
+    untagged는 untagged_notes()로 Bear에서 거르고, 나머지 조건만 결과에 적용합니다.
+
+    Args:
+        query: 조건 (normalize_query 전/후 모두 가능)
+        source: "search"면 Bear 검색(tag/untagged/term은 Bear에서 거름),
+            "cache"면 cache.notes(), "snapshot"이면 snapshot_path 파일
+        snapshot_path: source="snapshot"일 때 스냅샷 경로
+        cache: source="cache"일 때 WarmCache (없으면 get_cache())
+    """
+    query = normalize_query(query)
+    with bear.span("resolve_query", source=source, keys=",".join(sorted(query))):
+        if source == "snapshot":
+            if not snapshot_path:
+                raise ValueError("source='snapshot'에는 snapshot_path가 필요합니다")
+            if "term" in query:
+                raise ValueError("스냅샷으로는 term(본문 검색)을 처리할 수 없습니다")
+            return _resolve_snapshot(query, snapshot_path)
+        if source == "cache":
+            if "term" in query:
+                raise ValueError("캐시로는 term(본문 검색)을 처리할 수 없습니다")
+            if cache is None:
+                try:
+                    from .cache import get_cache
+                except ImportError:
+                    from cache import get_cache
+                cache = get_cache()
+            notes = cache.notes()
+            if notes is not None and any(key in query for key in _TAG_KEYS):
+                ids = _tag_ids(query)
+                notes = [n for n in notes if n.get("identifier") in ids]
+        elif source == "search":
+            if query.get("untagged"):
+                # 태그 없는 노트는 어떤 태그에도 속하지 않음
+                notes = [] if "tag" in query else bear.untagged_notes(search=query.get("term", ""), refresh=True)
+            else:
+                notes = bear.search_notes(term=query.get("term", ""), tag=query.get("tag", ""))
+        else:
+            raise ValueError(f"source는 search, cache, snapshot 중 하나여야 합니다: {source}")
+        if notes is None:
+            raise RuntimeError("노트 목록을 가져올 수 없습니다 (xcall과 BEAR_API_TOKEN 확인)")
+        rest = {k: v for k, v in query.items() if k not in _TAG_KEYS}
+        return [
+            {"identifier": n["identifier"], "title": n.get("title", "")}
+            for n in notes if n.get("identifier") and note_matches(n, rest)
+        ]
+
+
+def _tag_ids(query: Dict[str, Any]) -> Set[str]:
+    """tag/untagged 조건에 맞는 노트 ID (Bear 검색 한 번)"""
+    if query.get("untagged"):
+        if "tag" in query:
+            return set()
+        found = bear.untagged_notes(refresh=True)
+    else:
+        found = bear.search_notes(tag=query["tag"])
+    if found is None:
+        raise RuntimeError("노트 목록을 가져올 수 없습니다 (xcall과 BEAR_API_TOKEN 확인)")
+    return {n["identifier"] for n in found if n.get("identifier")}
+
+
+def _resolve_snapshot(query: Dict[str, Any], path: str) -> List[Dict[str, str]]:
+    pattern = query.get("title")
+    # 첫 와일드카드(*, ?, [) 앞의 고정 접두어로 스냅샷에서 먼저 거르고, 패턴 검사는 마지막에 적용
+    # (lower()와 casefold()가 다른 문자가 있으면 title_contains가 놓칠 수 있어 쓰지 않음)
+    literal = _GLOB_RE.split(pattern, 1)[0] if pattern else ""
+    if literal.lower() != literal.casefold():
+        literal = ""
+    with Snapshot(path) as snap:
+        rows = snap.filter(
+            tag=query.get("tag"),
+            modified_after=query.get("modified_after"),
+            modified_before=query.get("modified_before"),
+            title_contains=literal or None,
+            untagged=bool(query.get("untagged")),
+        )
+        created_after, created_before = query.get("created_after"), query.get("created_before")
+        result = []
+        for row in rows:
+            created = snap.created[row]
+            if created_after is not None and created < created_after:
+                continue
+            if created_before is not None and created >= created_before:
+                continue
+            title = snap.title(row)
+            if pattern and not fnmatch.fnmatchcase(title.casefold(), pattern.casefold()):
+                continue
+            result.append({"identifier": snap.identifier(row), "title": title})
+        return result
+
+
+def apply_notes(
+    action: str,
+    notes: List[Dict[str, str]],
+    dry_run: bool = False,
+    rate: float = 10.0,
+    batch_size: int = 100,
+    workers: int = 4,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Dict[str, Any]:
+    """
+    이미 찾은 노트 목록에 archive 또는 trash 적용 (ID로 호출)
+
+    Args:
+        action: "archive" 또는 "trash"
+        notes: {identifier, title} 목록
+        dry_run: True면 실행하지 않음
+        rate: 초당 최대 호출 수 (0 이하면 제한 없음)
+        batch_size: 진행 상황을 보고하는 묶음 크기
+        workers: 묶음 안의 최대 동시 실행 수
+        progress: 묶음이 끝날 때마다 (처리 수, 전체 수) 호출
+
+    Returns:
+        {action, matched, done, failed, notes, dry_run, elapsed} 요약
+    """
+    if action not in ("archive", "trash"):
+        raise ValueError(f"action은 archive 또는 trash여야 합니다: {action}")
+    func = bear.archive_note if action == "archive" else bear.trash_note
+    started = time.monotonic()
+    report: Dict[str, Any] = {
+        "action": action, "matched": len(notes), "done": 0, "failed": [],
+        "notes": notes, "dry_run": dry_run, "elapsed": 0.0,
+    }
+    if dry_run or not notes:
+        return report
+
+    limiter = bear.RateLimiter(rate, burst=max(1, workers))
+    lock = threading.Lock()
+
+    def run(note: Dict[str, str]) -> None:
+        limiter.acquire()
+        try:
+            func(note_id=note["identifier"])
+        except Exception as e:
+            with lock:
+                report["failed"].append({**note, "error": str(e)})
+        else:
+            with lock:
+                report["done"] += 1
+
+    with bear.span(f"{action}_notes", matched=len(notes)):
+        for start in range(0, len(notes), max(1, batch_size)):
+            batch = notes[start:start + max(1, batch_size)]
+            bear.map_concurrent(run, batch, max_workers=max(1, workers))
+            if progress is not None:
+                progress(start + len(batch), len(notes))
+    report["elapsed"] = time.monotonic() - started
+    return report
+
+
+def apply_where(
+    action: str,
+    query: Dict[str, Any],
+    dry_run: bool = False,
+    source: str = "search",
+    snapshot_path: Optional[str] = None,
+    cache: Any = None,
+    limit: Optional[int] = None,
+    **kwargs: Any
+) -> Dict[str, Any]:
+    """
+    조건에 맞는 노트에 archive 또는 trash 적용
+
+    Args:
+        action: "archive" 또는 "trash"
+        query: 조건 (모듈 설명 참고)
+        dry_run: True면 대상만 찾고 실행하지 않음
+        source / snapshot_path / cache: resolve() 참고
+        limit: 최대 처리 노트 수
+        **kwargs: rate, batch_size, workers, progress (apply_notes 참고)
+
+    Returns:
+        {action, matched, done, failed, notes, dry_run, elapsed} 요약
+        (notes는 대상 노트 {identifier, title} 목록)
+    """
+    if action not in ("archive", "trash"):
+        raise ValueError(f"action은 archive 또는 trash여야 합니다: {action}")
+    started = time.monotonic()
+    notes = resolve(query, source=source, snapshot_path=snapshot_path, cache=cache)
+    if limit is not None:
+        notes = notes[:limit]
+    report = apply_notes(action, notes, dry_run=dry_run, **kwargs)
+    report["elapsed"] = time.monotonic() - started
+    return report
+
+
+def archive_where(query: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+    """조건에 맞는 노트를 보관함으로 이동 (인자는 apply_where 참고)"""
+    return apply_where("archive", query, **kwargs)
+
+
+def trash_where(query: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+    """조건에 맞는 노트를 휴지통으로 이동 (인자는 apply_where 참고)"""
+    return apply_where("trash", query, **kwargs)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Archive or trash Bear notes matching a filter")
+    parser.add_argument("action", choices=["archive", "trash"])
+    parser.add_argument("--tag")
+    parser.add_argument("--term")
+    parser.add_argument("--title", help="title glob, e.g. 'Daily *'")
+    parser.add_argument("--untagged", action="store_true")
+    for key in _DATE_KEYS:
+        parser.add_argument("--" + key.replace("_", "-"), dest=key, metavar="DATE")
+    parser.add_argument("--source", choices=["search", "cache", "snapshot"], default="search")
+    parser.add_argument("--snapshot", dest="snapshot_path", help="snapshot file for --source snapshot")
+    parser.add_argument("--rate", type=float, default=10.0, help="max calls per second")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    query = {key: getattr(args, key) for key in QUERY_KEYS}
+
+    def show(done: int, total: int) -> None:
+        print(f"[{done}/{total}]", file=sys.stderr)
+
+    try:
+        report = apply_where(
+            args.action, query, dry_run=args.dry_run, source=args.source,
+            snapshot_path=args.snapshot_path, rate=args.rate, workers=args.workers,
+            limit=args.limit, progress=show
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    if args.dry_run:
+        print(f"Would {args.action} {report['matched']} note(s):")
+        for note in report["notes"][:50]:
+            print(f"  {note['identifier']}  {note['title']}")
+        if report["matched"] > 50:
+            print(f"  ... and {report['matched'] - 50} more")
+        return 0
+    print(f"{args.action}: {report['done']}/{report['matched']} done, "
+          f"{len(report['failed'])} failed in {report['elapsed']:.1f}s")
+    for failure in report["failed"][:20]:
+        print(f"  {failure['identifier']} {failure['title']}: {failure['error']}")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
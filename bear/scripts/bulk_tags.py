@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+하위 트리 단위 태그 일괄 이름 변경/삭제
+
+glob 패턴이나 접두어에 맞는 태그를 현재 태그 트리와 비교해 실행 계획을 만들고,
+충돌을 검사한 뒤 의존 순서대로 제한된 병렬성으로 rename_tag / delete_tag를 실행합니다.
+Bear는 상위 태그를 바꾸면 하위 태그도 함께 바꾸므로, 패턴에 맞는 가장 위쪽 태그만 실행합니다.
+
+Usage:
+    python3 bulk_tags.py rename 'project/*' archive/project --dry-run
+    python3 bulk_tags.py rename project archive/project --workers 2 --rate 5
+    python3 bulk_tags.py delete 'tmp/*'
+
+Example:
+    tree = TagTree.from_bear()
+    plan = plan_rename(tree, "project/*", "archive/project")
+    print(plan.preview())
+    report = execute(plan, tree, workers=2)
+"""
+
+import sys
+import time
+import argparse
+import threading
+from typing import Optional, Dict, List, Any, Callable
+
+try:
+    from . import bear
+    from .tagtree import TagTree, split_tag, is_glob, glob_base
+except ImportError:
+    import bear
+    from tagtree import TagTree, split_tag, is_glob, glob_base
+
+
+# 충돌 처리 방식
+ON_CONFLICT = ("error", "skip", "merge")
+
+
+class TagStep:
+    """계획의 한 단계 (태그 하나에 대한 rename 또는 delete)"""
+
+    __slots__ = ("index", "action", "source", "target", "tags", "notes", "after", "conflict")
+
+    def __init__(self, index: int, action: str, source: str, target: Optional[str] = None):
+        self.index = index
+        self.action = action
+        self.source = source
+        self.target = target
+        # 함께 바뀌는 태그 수(하위 태그 포함)와 노트 수
+        self.tags = 0
+        self.notes = 0
+        # 이 단계보다 먼저 실행해야 하는 단계 번호
+        self.after: List[int] = []
+        # 충돌 종류 (exists, duplicate, nested, cycle, invalid) 또는 None
+        self.conflict: Optional[str] = None
+
+    def describe(self) -> str:
+        if self.action == "rename":
+            text = f"rename {self.source} -> {self.target}"
+        else:
+            text = f"delete {self.source}"
+        text += f" ({self.tags} tag(s), {self.notes} note(s))"
+        if self.conflict:
+            text += f" [conflict: {self.conflict}]"
+        return text
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class TagPlan:
+    """
+    실행 계획
+
+    Attributes:
+        steps: 단계 목록
+        waves: 의존 관계에 따라 나눈 단계 번호 묶음 (같은 묶음은 병렬 실행 가능)
+    """
+
+    def __init__(self, action: str, pattern: str, steps: List[TagStep]):
+        self.action = action
+        self.pattern = pattern
+        self.steps = steps
+        self.waves: List[List[int]] = []
+        self._order()
+
+    @property
+    def conflicts(self) -> List[TagStep]:
+        return [step for step in self.steps if step.conflict]
+
+    def _order(self) -> None:
+        # 위상 정렬로 실행 단계(wave)를 나누고, 끝까지 남는 단계는 순환으로 표시
+        remaining = {step.index: set(step.after) for step in self.steps}
+        while remaining:
+            ready = sorted(i for i, deps in remaining.items() if not deps)
+            if not ready:
+                for i in remaining:
+                    self.steps[i].conflict = self.steps[i].conflict or "cycle"
+                break
+            self.waves.append(ready)
+            for i in ready:
+                del remaining[i]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def preview(self) -> str:
+        """드라이런 미리보기 문자열"""
+        lines = [f"{self.action} {self.pattern!r}: {len(self.steps)} step(s) "
+                 f"in {len(self.waves)} wave(s), {len(self.conflicts)} conflict(s)"]
+        for number, wave in enumerate(self.waves, 1):
+            lines.append(f"  wave {number}:")
+            lines.extend(f"    {self.steps[i].describe()}" for i in wave)
+        unordered = [s for s in self.steps if s.conflict == "cycle"]
+        if unordered:
+            lines.append("  not ordered (cycle):")
+            lines.extend(f"    {s.describe()}" for s in unordered)
+        return "\n".join(lines)
+
+
+def _measure(tree: TagTree, step: TagStep) -> None:
+    step.tags = sum(1 for _ in tree.walk(step.source))
+    step.notes = tree.note_count(step.source)
+
+
+def _ancestors(name: str) -> List[str]:
+    parts = split_tag(name)
+    return ["/".join(parts[:i]) for i in range(len(parts), 0, -1)]
+
+
+def plan_rename(tree: TagTree, pattern: str, destination: str) -> TagPlan:
+    """
+    패턴에 맞는 태그를 destination 아래로 옮기는 계획
+
+    패턴의 고정 경로 부분을 destination으로 바꿉니다.
+    예: "project/*" -> "archive/project" 이면 project/alpha -> archive/project/alpha,
+    와일드카드가 없는 "project" -> "archive/project" 이면 태그 하나를 옮깁니다.
+
+    Args:
+        tree: 현재 태그 트리
+        pattern: 태그 이름 또는 glob 패턴
+        destination: 고정 경로를 대신할 새 경로
+    """
+    base = glob_base(pattern) if is_glob(pattern) else "/".join(split_tag(pattern))
+    dest = "/".join(split_tag(destination))
+    steps = []
+    for index, source in enumerate(tree.match(pattern)):
+        rest = source[len(base):].lstrip("/") if base else source
+        target = "/".join(part for part in (dest, rest) if part)
+        step = TagStep(index, "rename", source, target)
+        _measure(tree, step)
+        steps.append(step)
+
+    by_source = {step.source: step for step in steps}
+    by_target: Dict[str, TagStep] = {}
+    for step in steps:
+        if not step.target:
+            step.conflict = "invalid"
+            continue
+        if step.target == step.source:
+            step.conflict = "invalid"
+            continue
+        if step.target.startswith(step.source + "/"):
+            step.conflict = "nested"
+            continue
+        if step.target in by_target:
+            step.conflict = by_target[step.target].conflict = "duplicate"
+            continue
+        by_target[step.target] = step
+
+    # 실행될 단계 (exists 충돌도 merge로 실행될 수 있으므로 아래 검사 전에 정함)
+    moving = {step.source: step for step in steps if not step.conflict}
+    for step in steps:
+        if step.conflict:
+            continue
+        # 대상 경로(또는 그 상위)가 다른 단계의 원본이면 그 단계가 먼저 비워야 함
+        for name in _ancestors(step.target):
+            other = by_source.get(name)
+            if other is not None and other is not step:
+                step.after.append(other.index)
+        # 다른 단계의 원본이 대상 아래에 있으면 합치기 전에 먼저 옮겨야 함
+        for name in _ancestors(step.source)[1:]:
+            owner = by_target.get(name)
+            if owner is not None and owner is not step:
+                owner.after.append(step.index)
+        # 실행 후의 태그 목록으로 판단: 대상(또는 그 상위)을 다른 단계가 옮기면 그 자리는 비게 됨
+        # (원본은 서로 겹치지 않는 최상위 태그이므로 다른 단계가 대상 경로로 태그를 옮겨 오지는 않음)
+        vacated = any(moving.get(name) not in (None, step) for name in _ancestors(step.target))
+        if step.target in tree and not vacated:
+            step.conflict = "exists"
+    return TagPlan("rename", pattern, steps)
+
+
+def plan_delete(tree: TagTree, pattern: str) -> TagPlan:
+    """패턴에 맞는 태그(와 하위 태그)를 삭제하는 계획"""
+    steps = []
+    for index, source in enumerate(tree.match(pattern)):
+        step = TagStep(index, "delete", source)
+        _measure(tree, step)
+        steps.append(step)
+    return TagPlan("delete", pattern, steps)
+
+
+def execute(
+    plan: TagPlan,
+    tree: Optional[TagTree] = None,
+    workers: int = 4,
+    rate: float = 0.0,
+    on_conflict: str = "error",
+    dry_run: bool = False,
+    progress: Optional[Callable[[int, int, TagStep, Optional[BaseException]], None]] = None
+) -> Dict[str, Any]:
+    """
+    계획을 wave 순서로 실행 (같은 wave 안에서는 workers개까지 병렬)
+
+    Args:
+        plan: plan_rename / plan_delete 결과
+        tree: 실행 결과를 반영할 트리 (install()된 트리면 훅이 반영)
+        workers: 최대 동시 실행 수
+        rate: 초당 최대 호출 수 (0 이하면 제한 없음)
+        on_conflict: "error"면 충돌 시 ValueError, "skip"이면 충돌 단계와
+            그에 의존하는 단계를 건너뜀, "merge"면 이미 있는 태그로 합치고
+            나머지 충돌은 건너뜀
+        dry_run: True면 실행하지 않고 미리보기만 반환 (on_conflict="error"여도 충돌을
+            예외 대신 conflicts에 담아 반환)
+        progress: 단계가 끝날 때마다 (완료 수, 전체 수, 단계, 오류) 호출
+
+    Returns:
+        {done, failed, skipped, conflicts, preview, elapsed} 요약
+        (conflicts는 on_conflict 설정으로 해결되지 않는 충돌 단계)
+    """
+    if on_conflict not in ON_CONFLICT:
+        raise ValueError(f"on_conflict는 {', '.join(ON_CONFLICT)} 중 하나여야 합니다: {on_conflict}")
+    blocking = [s for s in plan.conflicts if not (on_conflict == "merge" and s.conflict == "exists")]
+    if blocking and on_conflict == "error" and not dry_run:
+        raise ValueError(
+            f"{len(blocking)}개 단계에 충돌이 있습니다: "
+            + "; ".join(s.describe() for s in blocking[:5])
+        )
+
+    report: Dict[str, Any] = {
+        "done": [], "failed": [], "skipped": [], "conflicts": [s.to_dict() for s in blocking],
+        "preview": plan.preview(), "elapsed": 0.0
+    }
+    if dry_run:
+        return report
+
+    skipped = {s.index for s in blocking}
+    failed = set()
+    total = len(plan.steps) - len(skipped)
+    limiter = bear.RateLimiter(rate, burst=max(1, workers))
+    lock = threading.Lock()
+    started = time.monotonic()
+
+    def run(index: int) -> None:
+        step = plan.steps[index]
+        error: Optional[BaseException] = None
+        limiter.acquire()
+        try:
+            if step.action == "rename":
+                bear.rename_tag(step.source, step.target)
+            else:
+                bear.delete_tag(step.source)
+        except Exception as e:
+            error = e
+        with lock:
+            if error is None:
+                report["done"].append(step.to_dict())
+                if tree is not None and not tree.hooks:
+                    if step.action == "rename":
+                        tree.rename(step.source, step.target)
+                    else:
+                        tree.remove(step.source)
+            else:
+                report["failed"].append({"step": step.to_dict(), "error": str(error)})
+                failed.add(index)
+            if progress is not None:
+                progress(len(report["done"]) + len(report["failed"]), total, step, error)
+
+    with bear.span("bulk_tags", action=plan.action, pattern=plan.pattern, steps=len(plan.steps)):
+        for wave in plan.waves:
+            runnable = []
+            for index in wave:
+                step = plan.steps[index]
+                # 선행 단계가 실패했거나 건너뛰었으면 이 단계도 건너뜀
+                if index in skipped or any(i in skipped or i in failed for i in step.after):
+                    skipped.add(index)
+                    continue
+                runnable.append(index)
+            bear.map_concurrent(run, runnable, max_workers=max(1, workers))
+        # 순환으로 wave에 들어가지 못한 단계
+        skipped.update(s.index for s in plan.steps if s.conflict == "cycle")
+
+    report["skipped"] = [plan.steps[i].to_dict() for i in sorted(skipped)]
+    report["elapsed"] = time.monotonic() - started
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk rename or delete Bear tag subtrees")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rename = sub.add_parser("rename", help="move tags matching a pattern under a new path")
+    rename.add_argument("pattern", help="tag name or glob, e.g. 'project/*'")
+    rename.add_argument("destination", help="replacement for the pattern's fixed prefix")
+    delete = sub.add_parser("delete", help="delete tags matching a pattern")
+    delete.add_argument("pattern")
+    for p in (rename, delete):
+        p.add_argument("--dry-run", action="store_true", help="print the plan only")
+        p.add_argument("--workers", type=int, default=4)
+        p.add_argument("--rate", type=float, default=0.0, help="max calls per second")
+        p.add_argument("--on-conflict", choices=ON_CONFLICT, default="error")
+    args = parser.parse_args(argv)
+
+    tree = TagTree.from_bear()
+    if args.command == "rename":
+        plan = plan_rename(tree, args.pattern, args.destination)
+    else:
+        plan = plan_delete(tree, args.pattern)
+    if not plan.steps:
+        print(f"No tags match {args.pattern!r}")
+        return 0
+
+    def show(done: int, total: int, step: TagStep, error: Optional[BaseException]) -> None:
+        status = "ok" if error is None else f"failed: {error}"
+        print(f"[{done}/{total}] {step.describe()} {status}", file=sys.stderr)
+
+    try:
+        report = execute(
+            plan, tree, workers=args.workers, rate=args.rate,
+            on_conflict=args.on_conflict, dry_run=args.dry_run, progress=show
+        )
+    except ValueError as e:
+        print(plan.preview())
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if args.dry_run:
+        print(report["preview"])
+        if report["conflicts"] and args.on_conflict == "error":
+            print(f"{len(report['conflicts'])} conflicting step(s); "
+                  "use --on-conflict skip or merge to run", file=sys.stderr)
+            return 1
+        return 0
+    print(f"Done {len(report['done'])}, failed {len(report['failed'])}, "
+          f"skipped {len(report['skipped'])} in {report['elapsed']:.1f}s")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
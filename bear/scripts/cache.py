@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Bear 영속 캐시 (stale-while-revalidate)
+
+짧게 실행되는 스크립트도 get_tags(), search_notes(term="") 결과를 디스크에서 바로 받도록
+태그 목록, 노트 메타데이터, 제목 -> ID 맵을 SQLite에 보관합니다.
+
+- max_age 이내: 캐시를 그대로 반환
+- max_stale 이내: 캐시를 즉시 반환하고 백그라운드에서 갱신
+- 그 이후 또는 캐시 없음: Bear에서 동기로 가져옴
+
+install()을 호출하면 bear.py 쓰기 작업 후 관련 캐시를 자동으로 갱신/무효화합니다.
+
+Example:
+    cache = get_cache()
+    tags = cache.tags()
+    note_id = cache.title_to_id("Daily Standup - 2024-01-15")
+"""
+
+import os
+import time
+import uuid
+import threading
+from typing import Optional, Dict, List, Any, Callable
+
+try:
+    from . import bear
+    from .store import KVStore, default_path
+except ImportError:
+    import bear
+    from store import KVStore, default_path
+
+
+DEFAULT_CACHE_PATH = default_path("cache.sqlite")
+# 이 시간(초) 동안은 갱신 없이 캐시 사용
+DEFAULT_MAX_AGE = float(os.environ.get("BEAR_CACHE_MAX_AGE", "300"))
+# 이 시간(초)까지는 오래된 캐시를 반환하며 백그라운드 갱신
+DEFAULT_MAX_STALE = float(os.environ.get("BEAR_CACHE_MAX_STALE", str(7 * 24 * 3600)))
+# 다른 프로세스가 갱신 중이면 이 시간(초) 동안 갱신하지 않음
+_REFRESH_LEASE = 60.0
+# 무효화될 때 함께 무효화되는 파생 값
+_DEPENDENTS = {"tags": ("tag_counts",), "notes": ("tag_counts",)}
+
+
+class WarmCache:
+    """
+    태그, 노트 메타데이터, 제목 인덱스 캐시
+
+    Args:
+        path: SQLite 파일 경로
+        max_age: 신선한 것으로 보는 기간(초)
+        max_stale: 오래된 값을 반환해도 되는 최대 기간(초)
+        background: False면 오래된 값도 동기로 갱신
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_age: float = DEFAULT_MAX_AGE,
+        max_stale: float = DEFAULT_MAX_STALE,
+        background: bool = True
+    ):
+        self.path = path
+        self.max_age = max_age
+        self.max_stale = max_stale
+        self.background = background
+        self.meta = KVStore(path, "meta")
+        self.titles = KVStore(path, "titles")
+        self._fetchers: Dict[str, Callable[[], Optional[List[Dict[str, Any]]]]] = {
+            "tags": lambda: bear.get_tags(),
+            "notes": lambda: bear.search_notes(term=""),
+            "tag_counts": self._count_tags,
+        }
+        self._threads: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    # 조회
+
+    def tags(self) -> Optional[List[Dict[str, str]]]:
+        """get_tags() 결과"""
+        return self._get("tags")
+
+    def notes(self) -> Optional[List[Dict[str, Any]]]:
+        """search_notes(term="") 결과 (전체 노트 메타데이터)"""
+        return self._get("notes")
+
+    def tag_counts(self) -> Optional[Dict[str, Dict[str, int]]]:
+        """태그 이름 -> {"notes", "subtree"} 노트 수 (tagtree.tag_counts 결과)"""
+        return self._get("tag_counts")
+
+    def _count_tags(self) -> Dict[str, Dict[str, int]]:
+        try:
+            from .tagtree import tag_counts
+        except ImportError:
+            from tagtree import tag_counts
+        return tag_counts(cache=self)
+
+    def fresh_notes(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        신선한(max_age 이내이고 이후 쓰기가 없는) 노트 메타데이터, 아니면 None
+
+        bear.set_metadata_index()에 등록하는 용도로, 최신이 아닐 수 있는 값은 반환하지 않습니다.
+        """
+        if self._state("notes") != "fresh":
+            return None
+        return self.meta.get("notes")
+
+    def title_to_id(self, title: str) -> Optional[str]:
+        """
+        제목으로 노트 ID 조회
+
+        노트 목록 전체를 읽지 않고 제목 인덱스에서 바로 찾습니다.
+        인덱스가 없으면 노트 목록을 먼저 가져옵니다.
+        """
+        self._ensure_titles()
+        return self.titles.get(title)
+
+    def titles_to_ids(self, titles: List[str]) -> Dict[str, str]:
+        """여러 제목을 한 번에 조회 (있는 제목만 제목 -> ID로 반환)"""
+        self._ensure_titles()
+        return self.titles.get_many(titles)
+
+    def _ensure_titles(self) -> None:
+        state = self._state("notes")
+        if state == "missing" or (state == "stale" and not self.background):
+            self.refresh("notes")
+        elif state == "stale":
+            self._revalidate("notes")
+
+    def age(self, kind: str) -> Optional[float]:
+        """캐시된 값의 나이(초), 없으면 None"""
+        updated = self.meta.updated(kind)
+        return None if updated is None else time.time() - updated
+
+    def _state(self, kind: str) -> str:
+        """fresh, stale, expired, missing 중 하나 (값은 읽지 않음)"""
+        age = self.age(kind)
+        if age is None:
+            return "missing"
+        if age < self.max_age and not self.meta.get("dirty:" + kind, False):
+            return "fresh"
+        if age < self.max_stale:
+            return "stale"
+        return "expired"
+
+    def _get(self, kind: str) -> Optional[List[Dict[str, Any]]]:
+        state = self._state(kind)
+        if state == "fresh":
+            return self.meta.get(kind)
+        if state == "stale":
+            if self.background:
+                self._revalidate(kind)
+                return self.meta.get(kind)
+            return self.refresh(kind) or self.meta.get(kind)
+        return self.refresh(kind) or self.meta.get(kind)
+
+    # 갱신
+
+    def refresh(self, kind: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Bear에서 다시 가져와 캐시 갱신
+
+        Bear에 연결할 수 없어 None이 반환되면 기존 캐시를 유지합니다.
+        가져오는 동안 invalidate()가 있었으면 값은 저장하되 dirty 표시는 남겨
+        다음 조회 때 다시 갱신합니다.
+        """
+        marker = self.meta.get("dirty:" + kind)
+        with bear.span("cache_refresh", kind=kind):
+            value = self._fetchers[kind]()
+        if value is None:
+            return None
+        self.meta.put(kind, value)
+        if marker is not None:
+            self.meta.delete_if("dirty:" + kind, marker)
+        if kind == "notes":
+            self.titles.put_many(
+                ((n["title"], n["identifier"]) for n in value
+                 if n.get("title") and n.get("identifier")),
+                replace_all=True
+            )
+        return value
+
+    def _revalidate(self, kind: str) -> None:
+        """백그라운드 갱신 시작 (이미 진행 중이면 무시)"""
+        with self._lock:
+            thread = self._threads.get(kind)
+            if thread is not None and thread.is_alive():
+                return
+            if not self.meta.claim("lease:" + kind, _REFRESH_LEASE):
+                return
+
+            def run() -> None:
+                try:
+                    self.refresh(kind)
+                finally:
+                    self.meta.delete("lease:" + kind)
+
+            # 데몬 스레드가 아니므로 짧은 스크립트도 종료 전에 갱신을 마침
+            thread = threading.Thread(target=run, name=f"bear-cache-{kind}")
+            self._threads[kind] = thread
+            thread.start()
+
+    def wait(self) -> None:
+        """진행 중인 백그라운드 갱신이 끝날 때까지 대기"""
+        for thread in list(self._threads.values()):
+            thread.join()
+
+    def invalidate(self, kind: str) -> None:
+        """다음 조회 때 갱신하도록 표시 (값은 유지되어 stale로 반환됨)"""
+        # 표시마다 새 값을 써서 refresh()가 가져오는 도중의 무효화를 알아챌 수 있게 함
+        marker = uuid.uuid4().hex
+        self.meta.put_many(
+            ("dirty:" + name, marker) for name in (kind,) + _DEPENDENTS.get(kind, ())
+        )
+
+    # bear.py 쓰기 작업 추적
+
+    def _after(self, s: "bear.Span") -> None:
+        if s.error is not None:
+            return
+        if s.name == "create_note":
+            title = s.args.get("title")
+            result = s.result
+            if title and isinstance(result, dict) and result.get("identifier"):
+                self.titles.put(title, result["identifier"])
+            self.invalidate("notes")
+            if s.args.get("tags"):
+                self.invalidate("tags")
+        elif s.name in ("add_text", "add_file", "trash_note", "archive_note", "grab_url"):
+            self.invalidate("notes")
+            if s.name == "grab_url" and s.args.get("tags"):
+                self.invalidate("tags")
+        elif s.name in ("rename_tag", "delete_tag"):
+            self.invalidate("tags")
+            self.invalidate("notes")
+
+    def install(self) -> Callable[[], None]:
+        """
+        bear.py 작업 후 캐시를 갱신/무효화하는 훅을 등록하고,
+        today_notes()가 쓸 메타데이터 제공 함수로 fresh_notes를 등록
+
+        Returns:
+            훅과 제공 함수를 해제하는 함수
+        """
+        remove = bear.add_hook(after=self._after)
+        previous = bear.set_metadata_index(self.fresh_notes)
+
+        def uninstall() -> None:
+            remove()
+            bear.set_metadata_index(previous)
+
+        return uninstall
+
+
+_default: Optional[WarmCache] = None
+_default_lock = threading.Lock()
+
+
+def get_cache() -> WarmCache:
+    """기본 경로의 공용 캐시 반환 (처음 호출 시 생성 및 install)"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = WarmCache()
+            _default.install()
+        return _default
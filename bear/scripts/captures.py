@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+정규화 URL 기반 캡처 인덱스
+
+grab_url로 캡처한 페이지를 정규화한 URL -> 노트 ID로 기록해, 같은 글을 다시 캡처하지 않도록 합니다.
+정규화는 스킴(http -> https)과 호스트 대소문자, 기본 포트, 추적 파라미터(utm_* 등),
+fragment, 경로 끝 "/"와 쿼리 순서를 통일합니다.
+
+Usage:
+    python3 captures.py grab https://example.com/post?utm_source=x --tags research
+    python3 captures.py check urls.txt
+
+Example:
+    index = CaptureIndex()
+    index.install()                       # bear.grab_url(return_id=True) 결과도 자동 기록
+    result = index.grab("https://Example.com/post/?utm_source=rss", tags="research")
+    result["captured"]                    # 이미 캡처한 URL이면 False
+    plan = index.precheck(urls)           # {"new": [...], "existing": {...}}
+    report = index.grab_many(urls, tags="rss")   # 새 URL만 병렬 캡처
+"""
+
+import sys
+import time
+import argparse
+import urllib.parse
+from typing import Optional, Dict, List, Any, Iterable, Callable
+
+try:
+    from . import bear
+    from .store import KVStore
+    from .content_index import DEFAULT_INDEX_PATH
+except ImportError:
+    import bear
+    from store import KVStore
+    from content_index import DEFAULT_INDEX_PATH
+
+
+# 정규화할 때 지우는 쿼리 파라미터 (접두어가 "utm_"인 것도 모두 지움)
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_hsenc", "_hsmi", "mkt_tok", "ref_src", "ref_url", "spm", "si",
+})
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    캡처 중복 판단용 URL 정규화
+
+    예: "HTTP://Example.COM:80/a/b/?utm_source=x&b=2&a=1#top" -> "https://example.com/a/b?a=1&b=2"
+    """
+    parts = urllib.parse.urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https"):
+        if not scheme and not parts.netloc:
+            # "example.com/a"처럼 스킴 없이 쓴 경우
+            return normalize_url("https://" + url.strip())
+        return url.strip()
+    host = (parts.hostname or "").rstrip(".")
+    try:
+        port = parts.port
+    except ValueError:
+        # "example.com:abc"처럼 포트가 잘못된 URL은 정규화하지 않음
+        return url.strip()
+    netloc = host if port in (None, _DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+    path = parts.path.rstrip("/")
+    query = sorted(
+        (key, value)
+        for key, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urllib.parse.urlunsplit(("https", netloc, path, urllib.parse.urlencode(query), ""))
+
+
+class CaptureIndex:
+    """
+    정규화 URL -> {identifier, title, url, captured} 인덱스
+
+    Args:
+        path: SQLite 파일 경로 (기본값: ~/.cache/bear-skill/index.sqlite)
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.store = KVStore(path, "captures")
+        # trash_note 훅의 forget_note가 전체를 훑지 않도록 노트 ID로 찾는 인덱스
+        self.store.add_index("identifier")
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """이미 캡처한 URL이면 기록, 아니면 None"""
+        return self.store.get(normalize_url(url))
+
+    def precheck(self, urls: Iterable[str]) -> Dict[str, Any]:
+        """
+        URL 목록을 한 번의 조회로 분류
+
+        Returns:
+            {"new": 캡처할 URL 목록 (정규화 기준 중복 제거, 입력 순서 유지),
+             "existing": URL -> 기록, "duplicates": 목록 안에서 중복된 URL}
+        """
+        first: Dict[str, str] = {}
+        duplicates = []
+        for url in urls:
+            key = normalize_url(url)
+            if key in first:
+                duplicates.append(url)
+            else:
+                first[key] = url
+        found = self.store.get_many(first)
+        return {
+            "new": [url for key, url in first.items() if key not in found],
+            "existing": {url: found[key] for key, url in first.items() if key in found},
+            "duplicates": duplicates,
+        }
+
+    def record(self, url: str, identifier: str, title: str = "") -> None:
+        """캡처 결과 기록"""
+        self.store.put(normalize_url(url), {
+            "identifier": identifier, "title": title, "url": url, "captured": time.time(),
+        })
+
+    def forget(self, url: str) -> None:
+        """URL 기록 삭제 (다음 grab에서 다시 캡처)"""
+        self.store.delete(normalize_url(url))
+
+    def forget_note(self, identifier: str) -> int:
+        """노트 ID를 가리키는 기록 삭제, 삭제한 수 반환"""
+        keys = self.store.keys_by("identifier", identifier)
+        self.store.delete_many(keys)
+        return len(keys)
+
+    def prune(self, notes: Iterable[Dict[str, Any]]) -> int:
+        """notes(search_notes 형식)에 없는 노트를 가리키는 기록 삭제, 삭제한 수 반환"""
+        present = {note.get("identifier") for note in notes}
+        keys = [key for key, entry in self.store.items() if entry.get("identifier") not in present]
+        self.store.delete_many(keys)
+        return len(keys)
+
+    def grab(
+        self,
+        url: str,
+        tags: str = "",
+        force: bool = False,
+        open_existing: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        아직 캡처하지 않은 URL만 grab_url로 캡처
+
+        Args:
+            url: 캡처할 URL
+            tags: 태그 목록
+            force: True면 기록이 있어도 다시 캡처
+            open_existing: 이미 캡처했으면 그 노트를 Bear에서 열기
+
+        Returns:
+            {identifier, title, captured} (captured는 이번에 캡처했는지),
+            캡처했지만 노트 ID를 받지 못했으면(xcall 없음) None
+        """
+        if not force:
+            existing = self.lookup(url)
+            if existing is not None:
+                if open_existing:
+                    bear.open_note(note_id=existing["identifier"])
+                return {"identifier": existing["identifier"], "title": existing["title"], "captured": False}
+        result = bear.grab_url(url, tags=tags, return_id=True)
+        if not isinstance(result, dict) or not result.get("identifier"):
+            return None
+        self.record(url, result["identifier"], result.get("title", ""))
+        return {"identifier": result["identifier"], "title": result.get("title", ""), "captured": True}
+
+    def grab_many(
+        self,
+        urls: Iterable[Any],
+        tags: str = "",
+        force: bool = False,
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        아직 캡처하지 않은 URL만 bear.grab_urls로 병렬 캡처
+
+        Args:
+            urls: URL 문자열 또는 {url, tags} 딕셔너리 목록
+            tags: 공통 태그 목록
+            force: True면 기록이 있어도 다시 캡처
+            **kwargs: max_workers, host_rate (bear.grab_urls 참고)
+
+        Returns:
+            {"captured": URL -> {identifier, title}, "existing": URL -> 기록,
+             "duplicates": 목록 안에서 중복된 URL, "failed": URL -> 오류}
+        """
+        items = [item if isinstance(item, dict) else {"url": item} for item in urls]
+        if force:
+            plan = {"new": [item["url"] for item in items], "existing": {}, "duplicates": []}
+        else:
+            plan = self.precheck(item["url"] for item in items)
+        new = set(plan["new"])
+        targets = []
+        for item in items:
+            if item["url"] in new:
+                targets.append(item)
+                new.discard(item["url"])
+        report: Dict[str, Any] = {
+            "captured": {}, "existing": plan["existing"], "duplicates": plan["duplicates"], "failed": {},
+        }
+        results = bear.grab_urls(targets, tags=tags, return_id=True, **kwargs)
+        recorded = []
+        for outcome in results:
+            if not outcome["ok"] or not outcome["result"].get("identifier"):
+                report["failed"][outcome["url"]] = outcome.get("error", "노트 ID 없음")
+                continue
+            result = outcome["result"]
+            report["captured"][outcome["url"]] = {"identifier": result["identifier"], "title": result.get("title", "")}
+            recorded.append((normalize_url(outcome["url"]), {
+                "identifier": result["identifier"], "title": result.get("title", ""),
+                "url": outcome["url"], "captured": time.time(),
+            }))
+        self.store.put_many(recorded)
+        return report
+
+    # bear.py 작업 추적
+
+    def _after(self, s: "bear.Span") -> None:
+        if s.error is not None:
+            return
+        if s.name == "grab_url":
+            result = s.result
+            if isinstance(result, dict) and result.get("identifier"):
+                self.record(s.args["url"], result["identifier"], result.get("title", ""))
+        elif s.name == "trash_note" and s.args.get("note_id"):
+            self.forget_note(s.args["note_id"])
+
+    def install(self) -> Callable[[], None]:
+        """
+        bear.grab_url(return_id=True) 결과를 기록하고 trash_note된 노트 기록을 지우는 훅 등록
+
+        Returns:
+            훅을 해제하는 함수
+        """
+        return bear.add_hook(after=self._after)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Capture URLs into Bear without duplicates")
+    sub = parser.add_subparsers(dest="command", required=True)
+    grab = sub.add_parser("grab", help="capture a URL unless it was captured before")
+    grab.add_argument("url")
+    grab.add_argument("--tags", default="")
+    grab.add_argument("--force", action="store_true", help="capture even if already captured")
+    grab.add_argument("--open", action="store_true", help="open the existing note instead")
+    check = sub.add_parser("check", help="classify URLs (one per line, '-' for stdin)")
+    check.add_argument("file")
+    args = parser.parse_args(argv)
+
+    index = CaptureIndex()
+    if args.command == "grab":
+        result = index.grab(args.url, tags=args.tags, force=args.force, open_existing=args.open)
+        if result is None:
+            print("Captured, but no note ID was returned (xcall needed to record it)")
+            return 1
+        state = "Captured" if result["captured"] else "Already captured"
+        print(f"{state}: {result['title']} ({result['identifier']})")
+        return 0
+
+    source = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+    with source:
+        urls = [line.strip() for line in source if line.strip()]
+    plan = index.precheck(urls)
+    for url in plan["new"]:
+        print(f"new       {url}")
+    for url, entry in plan["existing"].items():
+        print(f"captured  {url}  -> {entry['title']}")
+    for url in plan["duplicates"]:
+        print(f"repeated  {url}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+노트 본문 기반 증분 인덱스의 공통 부분
+
+노트 메타데이터(search_notes 형식)와 저장된 modificationDate를 비교해
+바뀐 노트만 본문을 다시 가져와(get_note_contents) 파싱하고, 결과를 SQLite에 보관합니다.
+하위 클래스는 extract()로 본문에서 필요한 값만 뽑아냅니다.
+
+Example:
+    class WordCount(ContentIndex):
+        table = "word_count"
+
+        def extract(self, text):
+            return len(text.split())
+
+    index = WordCount()
+    index.sync(get_cache().notes())
+"""
+
+import threading
+from typing import Optional, Dict, List, Any, Callable, Iterable, Tuple
+
+try:
+    from . import bear
+    from .store import KVStore, default_path
+    from .snapshot import note_tags
+except ImportError:
+    import bear
+    from store import KVStore, default_path
+    from snapshot import note_tags
+
+
+DEFAULT_INDEX_PATH = default_path("index.sqlite")
+
+
+class ContentIndex:
+    """
+    본문 기반 인덱스 기본 클래스
+
+    항목은 노트 ID -> {title, tags, created, modified, data} 형식이며
+    메모리에 모두 올려 두고 조회합니다 (data는 extract() 결과).
+
+    Args:
+        path: SQLite 파일 경로
+        fetch: 노트 ID로 get_note_contents 형식의 dict를 반환하는 함수
+    """
+
+    # 하위 클래스에서 지정하는 테이블 이름
+    table = ""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_INDEX_PATH,
+        fetch: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None
+    ):
+        if not self.table:
+            raise TypeError("ContentIndex 하위 클래스는 table을 지정해야 합니다")
+        self.store = KVStore(path, self.table)
+        self.fetch = fetch or (lambda note_id: bear.get_note_contents(note_id=note_id))
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._loaded = False
+
+    def extract(self, text: str) -> Any:
+        """본문에서 인덱스에 저장할 값 추출 (JSON 직렬화 가능해야 함)"""
+        raise NotImplementedError
+
+    def extract_many(self, texts: List[str]) -> List[Any]:
+        """여러 본문을 한 번에 추출 (프로세스 풀 등으로 바꿀 때 재정의)"""
+        return [self.extract(text) for text in texts]
+
+    def _changed(self, identifier: str, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+        """항목이 바뀌거나(new) 삭제된(new=None) 뒤 호출 (파생 구조 갱신용)"""
+
+    def load(self) -> None:
+        """저장된 항목을 메모리로 읽기 (이미 읽었으면 무시)"""
+        with self._lock:
+            if self._loaded:
+                return
+            for identifier, entry in self.store.items():
+                self.entries[identifier] = entry
+                self._changed(identifier, None, entry)
+            self._loaded = True
+
+    def __len__(self) -> int:
+        self.load()
+        return len(self.entries)
+
+    def update_note(self, meta: Dict[str, Any], text: str) -> Dict[str, Any]:
+        """본문을 직접 넣어 항목 하나 갱신 (저장 포함)"""
+        entry = self._entry(meta, self.extract(text))
+        self._apply([(meta["identifier"], entry)], [])
+        return entry
+
+    def remove(self, identifier: str) -> None:
+        """항목 삭제"""
+        self._apply([], [identifier])
+
+    def _entry(self, meta: Dict[str, Any], data: Any) -> Dict[str, Any]:
+        return {
+            "title": meta.get("title") or "",
+            "tags": note_tags(meta),
+            "created": meta.get("creationDate") or "",
+            "modified": meta.get("modificationDate") or "",
+            "data": data,
+        }
+
+    def _apply(self, updated: List[Tuple[str, Dict[str, Any]]], removed: Iterable[str]) -> None:
+        self.load()
+        removed = [i for i in removed if i in self.entries]
+        with self._lock:
+            if updated:
+                self.store.put_many(updated)
+            if removed:
+                self.store.delete_many(removed)
+            for identifier, entry in updated:
+                old = self.entries.get(identifier)
+                self.entries[identifier] = entry
+                self._changed(identifier, old, entry)
+            for identifier in removed:
+                old = self.entries.pop(identifier)
+                self._changed(identifier, old, None)
+
+    def sync(
+        self,
+        notes: Optional[Iterable[Dict[str, Any]]] = None,
+        complete: bool = True,
+        workers: int = 4,
+        batch_size: int = 500
+    ) -> Dict[str, Any]:
+        """
+        메타데이터와 비교해 바뀐 노트만 다시 파싱
+
+        바뀐 노트는 batch_size개씩 가져와 추출하고 바로 저장하므로,
+        중간에 멈춰도 다음 sync는 남은 노트부터 처리합니다.
+
+        Args:
+            notes: search_notes 형식의 노트 목록 (없으면 search_notes(term="") 호출)
+            complete: True면 notes에 없는 노트를 인덱스에서 삭제
+            workers: 본문을 가져오는 최대 동시 실행 수
+            batch_size: 한 번에 가져와 저장하는 노트 수
+
+        Returns:
+            {checked, parsed, removed, failed} 요약 (failed는 본문을 못 가져온 노트 ID)
+        """
+        if notes is None:
+            notes = bear.search_notes(term="")
+            if notes is None:
+                raise RuntimeError("노트 목록을 가져올 수 없습니다 (xcall과 BEAR_API_TOKEN 확인)")
+        self.load()
+        notes = [n for n in notes if n.get("identifier")]
+        changed = [
+            n for n in notes
+            if self.entries.get(n["identifier"], {}).get("modified") != n.get("modificationDate")
+        ]
+        report: Dict[str, Any] = {"checked": len(notes), "parsed": 0, "removed": 0, "failed": []}
+
+        def load_one(meta: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], str]]:
+            try:
+                found = self.fetch(meta["identifier"])
+            except Exception:
+                found = None
+            if found is None:
+                return None
+            # 본문을 가져온 시점의 메타데이터가 더 최신이므로 우선 사용
+            merged = {**meta, **{k: v for k, v in found.items() if k != "note" and v}}
+            return merged, found.get("note") or ""
+
+        with bear.span(f"{self.table}_sync", checked=len(notes), changed=len(changed)):
+            size = max(1, batch_size)
+            for start in range(0, len(changed), size):
+                batch = changed[start:start + size]
+                loaded = []
+                for meta, result in zip(batch, bear.map_concurrent(load_one, batch, max_workers=workers)):
+                    if result is None:
+                        report["failed"].append(meta["identifier"])
+                    else:
+                        loaded.append(result)
+                data = self.extract_many([text for _, text in loaded])
+                self._apply([
+                    (meta["identifier"], self._entry(meta, value))
+                    for (meta, _), value in zip(loaded, data)
+                ], [])
+                report["parsed"] += len(loaded)
+            if complete:
+                present = {n["identifier"] for n in notes}
+                removed = [i for i in self.entries if i not in present]
+                self._apply([], removed)
+                report["removed"] = len(removed)
+        return report
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+날짜별 노트 (중복 없이 만들기, 기간 채우기)
+
+"Daily Standup - 2024-01-15"처럼 제목에 날짜가 들어가는 노트를 종류(kind)별 템플릿으로 만듭니다.
+만들기 전에 제목 인덱스(WarmCache)에서 먼저 찾으므로 여러 번 실행해도 노트가 한 번만 생기고,
+생성에는 날짜별 idempotency_key를 붙여 재시도도 안전합니다.
+
+템플릿은 한 번만 컴파일해 날짜 필드({date}, {day}, {week}, {year}, {month})만 바꿔 넣고,
+기간 채우기(backfill)는 없는 날짜만 배치 실행기(BatchRunner)로 병렬 생성합니다.
+
+Usage:
+    python3 daily.py today standup
+    python3 daily.py backfill plan 2024-01-01 2024-01-31
+
+Example:
+    note = get_or_create_daily("standup")            # {identifier, title, date, created}
+    report = backfill("plan", date(2024, 1, 1), date(2024, 1, 31))
+"""
+
+import sys
+import string
+import argparse
+from datetime import date, timedelta
+from typing import Optional, Dict, List, Any, Tuple
+
+try:
+    from . import bear
+    from .batch import BatchRunner
+    from .cache import WarmCache, get_cache
+except ImportError:
+    import bear
+    from batch import BatchRunner
+    from cache import WarmCache, get_cache
+
+
+# 템플릿에서 쓸 수 있는 날짜 필드
+FIELDS = ("date", "day", "week", "year", "month")
+# backfill 한 번에 만들 수 있는 최대 일수
+MAX_BACKFILL_DAYS = 366
+
+
+def date_fields(day: date) -> Dict[str, str]:
+    """날짜 하나의 템플릿 필드 값"""
+    return {
+        "date": day.isoformat(),
+        "day": day.strftime("%A"),
+        "week": day.strftime("%W"),
+        "year": day.strftime("%Y"),
+        "month": day.strftime("%m"),
+    }
+
+
+class Template:
+    """
+    날짜 필드만 치환하도록 미리 파싱한 템플릿
+
+    str.format 문법을 쓰며 ("{{"와 "}}"는 중괄호 그대로), FIELDS 외의 필드나
+    형식 지정자는 컴파일할 때 ValueError를 냅니다.
+    """
+
+    __slots__ = ("source", "_parts")
+
+    def __init__(self, source: str):
+        self.source = source
+        self._parts: List[Tuple[str, Optional[str]]] = []
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            if field is not None and (field not in FIELDS or spec or conversion):
+                raise ValueError(f"템플릿에서 쓸 수 없는 필드입니다: {{{field}}} (가능: {', '.join(FIELDS)})")
+            self._parts.append((literal, field))
+
+    def render(self, fields: Dict[str, str]) -> str:
+        """필드 값을 넣은 문자열"""
+        return "".join(literal + (fields[field] if field else "") for literal, field in self._parts)
+
+
+class DailyKind:
+    """
+    날짜별 노트 종류 (제목, 본문, 태그 템플릿)
+
+    Args:
+        title: 제목 템플릿 ({date}가 있어야 날짜마다 다른 노트가 됨)
+        text: 본문 템플릿
+        tags: 쉼표로 구분된 태그 목록
+    """
+
+    __slots__ = ("title", "text", "tags")
+
+    def __init__(self, title: str, text: str = "", tags: str = ""):
+        if "{date}" not in title:
+            raise ValueError(f"제목 템플릿에 {{date}}가 있어야 합니다: {title}")
+        self.title = Template(title)
+        self.text = Template(text)
+        self.tags = tags
+
+    def render(self, day: date) -> Dict[str, str]:
+        """날짜 하나의 create_note 인자 {title, text, tags}"""
+        fields = date_fields(day)
+        return {"title": self.title.render(fields), "text": self.text.render(fields), "tags": self.tags}
+
+
+KINDS: Dict[str, DailyKind] = {
+    "standup": DailyKind(
+        "Daily Standup - {date}",
+        """## Daily Standup - {date}
+
+### Yesterday
+- [ ] Task 1: (Completed/In Progress/Blocked)
+- [ ] Task 2: (Completed/In Progress/Blocked)
+
+### Today
+- [ ] Task 1: Planned completion time
+- [ ] Task 2: Planned completion time
+- [ ] Task 3: Planned completion time
+
+### Blockers
+- (None) or (List any blockers)
+
+### Notes
+- Team status: All good
+- No critical issues
+""",
+        "standup,daily",
+    ),
+    "journal": DailyKind(
+        "Daily Journal - {date}",
+        """# Daily Journal - {date} ({day})
+
+## Morning Reflection
+- How are you feeling today?
+- What's your top priority?
+- Any concerns or worries?
+
+## Evening Reflection
+- What went well today?
+- What could be improved?
+- Gratitude (3 things):
+  1.
+  2.
+  3.
+""",
+        "journal,daily,personal",
+    ),
+    "log": DailyKind(
+        "Daily Log - {date}",
+        """# Daily Log - {date}
+
+## Work
+- Morning meeting: [Time]
+- Focus session: [Task]
+- Meetings/Calls: [Count and summary]
+
+## Personal
+- Exercise: [None/Activity]
+- Sleep: [Hours]
+
+## Tomorrow's Focus
+- [ ] Priority 1
+- [ ] Priority 2
+- [ ] Priority 3
+""",
+        "log,daily,tracking",
+    ),
+    "plan": DailyKind(
+        "Daily Plan - {date}",
+        """# Daily Plan - {date} ({day})
+
+## Morning Routine
+- [ ] 6:00 AM Wake up
+- [ ] 6:15 AM Exercise
+- [ ] 6:45 AM Shower
+- [ ] 7:00 AM Breakfast
+
+## Work Focus
+- [ ] Priority 1:
+- [ ] Priority 2:
+- [ ] Priority 3:
+
+## Evening
+- [ ] Reflection
+- [ ] Prepare tomorrow
+- [ ] Bedtime routine
+
+## Notes
+(Add daily notes here)
+""",
+        "daily,planning,schedule",
+    ),
+}
+
+
+def register(kind: str, title: str, text: str = "", tags: str = "") -> DailyKind:
+    """노트 종류 추가 또는 교체"""
+    KINDS[kind] = DailyKind(title, text, tags)
+    return KINDS[kind]
+
+
+def _kind(kind: str) -> DailyKind:
+    if kind not in KINDS:
+        raise ValueError(f"알 수 없는 종류입니다: {kind} (가능: {', '.join(sorted(KINDS))})")
+    return KINDS[kind]
+
+
+def _idempotency_key(kind: str, day: date) -> str:
+    return f"daily:{kind}:{day.isoformat()}"
+
+
+def _sent_without_id(record: Optional[Dict[str, Any]]) -> bool:
+    return record is not None and record.get("state") == "sent" and not record.get("identifier")
+
+
+def get_or_create_daily(
+    kind: str,
+    day: Optional[date] = None,
+    cache: Optional[WarmCache] = None,
+    add_timestamp: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    날짜의 노트가 있으면 그 노트를, 없으면 새로 만든 노트를 반환
+
+    Args:
+        kind: 노트 종류 (KINDS의 키)
+        day: 날짜 (기본값: 오늘)
+        cache: 제목 인덱스로 쓸 캐시 (기본값: get_cache())
+        add_timestamp: 새로 만들 때 현재 날짜/시간 추가 여부
+
+    Returns:
+        {identifier, title, date, created} (created는 이번에 만들었는지),
+        노트 ID를 받지 못했으면(xcall 없음) identifier는 ""
+        (xcall 없이 이미 만든 날짜는 다시 만들지 않고 created=False, identifier "")
+    """
+    spec = _kind(kind)
+    day = day or date.today()
+    cache = cache or get_cache()
+    args = spec.render(day)
+    existing = cache.title_to_id(args["title"])
+    if existing:
+        return {"identifier": existing, "title": args["title"], "date": day.isoformat(), "created": False}
+    key = _idempotency_key(kind, day)
+    record = bear.idempotency_record(key)
+    if _sent_without_id(record):
+        # xcall 없이 보낸 노트는 제목 검색으로도 찾을 수 없으므로 ID 없이 "있음"으로 반환
+        return {"identifier": "", "title": args["title"], "date": day.isoformat(), "created": False}
+    # 제목 인덱스가 오래되어 못 찾았어도 이전에 같은 키로 만든 노트가 있으면 created=False
+    created = record is None
+    result = bear.create_note(**args, add_timestamp=add_timestamp, return_id=True, idempotency_key=key)
+    identifier = result.get("identifier", "") if isinstance(result, dict) else ""
+    if identifier:
+        cache.titles.put(args["title"], identifier)
+    return {"identifier": identifier, "title": args["title"], "date": day.isoformat(), "created": created}
+
+
+def backfill(
+    kind: str,
+    start: date,
+    end: date,
+    cache: Optional[WarmCache] = None,
+    concurrency: int = 4,
+    rate: float = 0.0,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    start부터 end까지(포함) 노트가 없는 날짜만 만들기
+
+    제목 인덱스를 한 번 조회해 없는 날짜를 고르고, 생성은 BatchRunner로 병렬 실행합니다.
+
+    Args:
+        kind: 노트 종류 (KINDS의 키)
+        start: 시작 날짜
+        end: 끝 날짜
+        cache: 제목 인덱스로 쓸 캐시 (기본값: get_cache())
+        concurrency: 최대 동시 생성 수
+        rate: 초당 최대 생성 수 (0 이하면 제한 없음)
+        dry_run: True면 만들지 않고 만들 날짜만 반환
+
+    Returns:
+        {"created": 날짜 -> 노트 ID ("" 이면 ID를 받지 못함), "existing": 날짜 -> 노트 ID ("" 이면 ID를 모름),
+         "failed": 날짜 -> 오류, "missing": 만들 날짜 목록}
+    """
+    spec = _kind(kind)
+    if end < start:
+        raise ValueError(f"end({end})가 start({start})보다 이릅니다")
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    if len(days) > MAX_BACKFILL_DAYS:
+        raise ValueError(f"한 번에 {MAX_BACKFILL_DAYS}일까지만 만들 수 있습니다: {len(days)}일")
+    cache = cache or get_cache()
+    rendered = [(day, spec.render(day)) for day in days]
+    found = cache.titles_to_ids([args["title"] for _, args in rendered])
+
+    report: Dict[str, Any] = {"created": {}, "existing": {}, "failed": {}, "missing": []}
+    todo = []
+    for day, args in rendered:
+        if args["title"] in found:
+            report["existing"][day.isoformat()] = found[args["title"]]
+        else:
+            report["missing"].append(day.isoformat())
+            todo.append((day, args))
+    if dry_run or not todo:
+        return report
+
+    # 제목 인덱스에는 없지만 같은 키로 이미 만든 날짜는 결과를 existing으로 분류
+    # (xcall 없이 만들어 ID를 모르는 날짜는 다시 요청하지 않음)
+    records = {day: bear.idempotency_record(_idempotency_key(kind, day)) for day, _ in todo}
+    known = {day for day, record in records.items() if record is not None}
+    for day in [day for day, record in records.items() if _sent_without_id(record)]:
+        report["existing"][day.isoformat()] = ""
+    todo = [(day, args) for day, args in todo if not _sent_without_id(records[day])]
+    if not todo:
+        return report
+    runner = BatchRunner(None, concurrency=concurrency, rate=rate)
+    runner.run_requests(
+        {"op": "create_note", **args, "return_id": True, "idempotency_key": _idempotency_key(kind, day)}
+        for day, args in todo
+    )
+    recorded = []
+    for record in runner.records:
+        day, args = todo[record["index"]]
+        if not record["ok"]:
+            report["failed"][day.isoformat()] = record["error"]
+            continue
+        result = record["result"]
+        identifier = result.get("identifier", "") if isinstance(result, dict) else ""
+        report["existing" if day in known else "created"][day.isoformat()] = identifier
+        if identifier:
+            recorded.append((args["title"], identifier))
+    cache.titles.put_many(recorded)
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Create dated Bear notes without duplicates")
+    sub = parser.add_subparsers(dest="command", required=True)
+    today = sub.add_parser("today", help="get or create the note for a date")
+    today.add_argument("kind", choices=sorted(KINDS))
+    today.add_argument("--date", type=date.fromisoformat)
+    fill = sub.add_parser("backfill", help="create missing notes for a date range")
+    fill.add_argument("kind", choices=sorted(KINDS))
+    fill.add_argument("start", type=date.fromisoformat)
+    fill.add_argument("end", type=date.fromisoformat)
+    fill.add_argument("--concurrency", type=int, default=4)
+    fill.add_argument("--rate", type=float, default=0.0)
+    fill.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "today":
+            note = get_or_create_daily(args.kind, args.date)
+            print(f"{'Created' if note['created'] else 'Found'}: {note['title']}")
+            return 0
+        report = backfill(args.kind, args.start, args.end,
+                          concurrency=args.concurrency, rate=args.rate, dry_run=args.dry_run)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    if args.dry_run:
+        print(f"Would create {len(report['missing'])} note(s): {', '.join(report['missing'])}")
+        return 0
+    print(f"Created {len(report['created'])}, existing {len(report['existing'])}, "
+          f"failed {len(report['failed'])}")
+    for day, error in sorted(report["failed"].items()):
+        print(f"  {day}: {error}", file=sys.stderr)
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+거의 같은 노트 찾기 (MinHash + LSH)
+
+노트 본문을 단어 n-gram(shingle)으로 나누고 MinHash 서명을 계산해,
+LSH 밴딩으로 후보 쌍만 비교하므로 노트 수의 제곱에 비례하지 않고 중복 묶음을 찾습니다.
+서명은 (노트 ID, modificationDate)별로 SQLite에 저장되어 다시 실행하면 바뀐 노트만 계산하고,
+계산은 프로세스 풀에서 병렬로 실행합니다.
+
+서명은 one-permutation hashing(해시 한 번으로 num_perm개 구간의 최솟값)과
+빈 구간 채우기(rotation densification)로 계산해 노트 하나에 해시를 shingle 수만큼만 계산합니다.
+
+Usage:
+    python3 dedup.py sync
+    python3 dedup.py clusters --threshold 0.8
+    python3 dedup.py archive --keep oldest --dry-run
+
+Example:
+    index = DedupIndex()
+    index.sync()
+    groups = index.clusters(threshold=0.8)
+    report = archive_duplicates(groups, index=index, threshold=0.8, keep="newest", dry_run=True)
+"""
+
+import os
+import re
+import sys
+import base64
+import hashlib
+import argparse
+from array import array
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Dict, List, Any, Set
+
+try:
+    from . import bulk_notes
+    from .content_index import ContentIndex, DEFAULT_INDEX_PATH
+except ImportError:
+    import bulk_notes
+    from content_index import ContentIndex, DEFAULT_INDEX_PATH
+
+
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 16
+DEFAULT_SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.8
+# 이보다 적은 본문은 프로세스 풀 없이 현재 프로세스에서 계산
+_POOL_MIN_TEXTS = 64
+# 이보다 큰 LSH 버킷은 모든 쌍 대신 대표 노트와만 비교
+_PAIRWISE_BUCKET = 32
+_EMPTY = 0xFFFFFFFF
+_WORD_RE = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = DEFAULT_SHINGLE_SIZE) -> Set[str]:
+    """대소문자와 구두점을 무시한 단어 size-gram 집합 (단어가 적으면 본문 전체 하나)"""
+    words = _WORD_RE.findall(text.casefold())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(
+    text: str,
+    num_perm: int = DEFAULT_NUM_PERM,
+    shingle_size: int = DEFAULT_SHINGLE_SIZE
+) -> Optional[str]:
+    """
+    본문의 MinHash 서명 (base64로 인코딩한 uint32[num_perm]), 단어가 없으면 None
+
+    프로세스 풀에서 호출되므로 모듈 최상위 함수로 둡니다.
+    """
+    values = shingles(text, shingle_size)
+    if not values:
+        return None
+    bins = [_EMPTY] * num_perm
+    for value in values:
+        h = int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+        slot = h % num_perm
+        low = h >> 32
+        if low < bins[slot]:
+            bins[slot] = low
+    # 빈 구간은 오른쪽의 가장 가까운 값에 거리만큼 섞은 값으로 채움
+    filled = list(bins)
+    for slot in range(num_perm):
+        if bins[slot] != _EMPTY:
+            continue
+        for distance in range(1, num_perm):
+            source = bins[(slot + distance) % num_perm]
+            if source != _EMPTY:
+                filled[slot] = (source + distance * 0x9E3779B1) & 0xFFFFFFFF
+                break
+    return base64.b64encode(array("I", filled).tobytes()).decode("ascii")
+
+
+def decode(signature: str) -> array:
+    """minhash() 결과를 uint32 배열로 변환"""
+    values = array("I")
+    values.frombytes(base64.b64decode(signature))
+    return values
+
+
+def similarity(a: array, b: array) -> float:
+    """두 서명의 Jaccard 유사도 추정값"""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class DedupIndex(ContentIndex):
+    """
+    노트 MinHash 서명 인덱스
+
+    Args:
+        path: SQLite 파일 경로 (기본값: ~/.cache/bear-skill/index.sqlite)
+        fetch: 노트 ID로 본문을 가져오는 함수 (기본값: get_note_contents)
+        num_perm: 서명 길이
+        shingle_size: shingle 단어 수
+        processes: 서명 계산 프로세스 수 (None이면 CPU 수, 1이면 풀 없이 계산)
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_INDEX_PATH,
+        fetch: Any = None,
+        num_perm: int = DEFAULT_NUM_PERM,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        processes: Optional[int] = None
+    ):
+        if num_perm < 1 or shingle_size < 1:
+            raise ValueError("num_perm과 shingle_size는 1 이상이어야 합니다")
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.processes = processes
+        # 설정이 다르면 서명을 비교할 수 없으므로 테이블을 나눔
+        self.table = f"minhash_{num_perm}_{shingle_size}"
+        self._pool: Optional[ProcessPoolExecutor] = None
+        super().__init__(path, fetch)
+
+    def extract(self, text: str) -> Optional[str]:
+        return minhash(text, self.num_perm, self.shingle_size)
+
+    def similarity(self, a: str, b: str) -> Optional[float]:
+        """두 노트의 Jaccard 유사도 추정값 (서명이 없는 노트가 있으면 None)"""
+        self.load()
+        first, second = self.entries.get(a), self.entries.get(b)
+        if not first or not second or not first["data"] or not second["data"]:
+            return None
+        return similarity(decode(first["data"]), decode(second["data"]))
+
+    def extract_many(self, texts: List[str]) -> List[Optional[str]]:
+        if len(texts) < _POOL_MIN_TEXTS or self.processes == 1:
+            return [self.extract(text) for text in texts]
+        processes = self.processes or os.cpu_count() or 1
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=processes)
+        func = partial(minhash, num_perm=self.num_perm, shingle_size=self.shingle_size)
+        chunk = max(1, len(texts) // (processes * 4))
+        return list(self._pool.map(func, texts, chunksize=chunk))
+
+    def sync(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        """ContentIndex.sync와 같음 (끝나면 프로세스 풀 종료)"""
+        try:
+            return super().sync(*args, **kwargs)
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def clusters(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        bands: int = DEFAULT_BANDS
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        유사도가 threshold 이상인 노트 묶음
+
+        Args:
+            threshold: 같은 묶음으로 볼 최소 Jaccard 유사도 추정값
+            bands: LSH 밴드 수 (num_perm의 약수, 많을수록 낮은 유사도도 후보가 됨)
+
+        Returns:
+            {identifier, title, created, modified} 목록의 목록
+            (큰 묶음부터, 묶음 안에서는 최근 수정순)
+        """
+        if self.num_perm % bands:
+            raise ValueError(f"bands({bands})는 num_perm({self.num_perm})의 약수여야 합니다")
+        self.load()
+        rows = self.num_perm // bands
+        signatures = {
+            identifier: decode(entry["data"])
+            for identifier, entry in self.entries.items() if entry["data"]
+        }
+        parent = {identifier: identifier for identifier in signatures}
+
+        def find(x: str) -> str:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        def union(a: str, b: str) -> None:
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[rb] = ra
+
+        checked: Set[tuple] = set()
+
+        def check(a: str, b: str) -> None:
+            key = (a, b) if a < b else (b, a)
+            if key in checked:
+                return
+            checked.add(key)
+            if similarity(signatures[a], signatures[b]) >= threshold:
+                union(a, b)
+
+        for band in range(bands):
+            buckets: Dict[bytes, List[str]] = {}
+            start = band * rows
+            for identifier, signature in signatures.items():
+                buckets.setdefault(signature[start:start + rows].tobytes(), []).append(identifier)
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                if len(members) <= _PAIRWISE_BUCKET:
+                    for i, a in enumerate(members):
+                        for b in members[i + 1:]:
+                            check(a, b)
+                else:
+                    # 템플릿처럼 큰 버킷은 대표 노트와만 비교해 제곱 비용을 피함
+                    for b in members[1:]:
+                        check(members[0], b)
+
+        groups: Dict[str, List[str]] = {}
+        for identifier in signatures:
+            groups.setdefault(find(identifier), []).append(identifier)
+        result = []
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            notes = [
+                {
+                    "identifier": identifier,
+                    "title": self.entries[identifier]["title"],
+                    "created": self.entries[identifier]["created"],
+                    "modified": self.entries[identifier]["modified"],
+                }
+                for identifier in members
+            ]
+            notes.sort(key=lambda note: note["modified"], reverse=True)
+            result.append(notes)
+        result.sort(key=len, reverse=True)
+        return result
+
+
+def archive_duplicates(
+    clusters: List[List[Dict[str, Any]]],
+    keep: str = "newest",
+    action: str = "archive",
+    index: Optional[DedupIndex] = None,
+    threshold: float = DEFAULT_THRESHOLD,
+    **kwargs: Any
+) -> Dict[str, Any]:
+    """
+    묶음마다 한 노트만 남기고, 남긴 노트와 유사도가 threshold 이상인 노트만 보관(또는 삭제)
+
+    묶음은 유사한 쌍을 이어 붙여 만들어지므로 (A~B, B~C이면 A, B, C가 한 묶음)
+    남긴 노트와 직접 비교하지 않은 노트가 섞여 있을 수 있습니다. 그런 노트는 건너뜁니다.
+
+    Args:
+        clusters: DedupIndex.clusters() 결과
+        keep: "newest"(최근 수정) 또는 "oldest"(가장 먼저 생성)
+        action: "archive" 또는 "trash"
+        index: 묶음을 만든 DedupIndex (기본값: DedupIndex())
+        threshold: 남긴 노트와의 최소 Jaccard 유사도 추정값
+        **kwargs: dry_run, rate, batch_size, workers, progress (bulk_notes.apply_notes 참고)
+
+    Returns:
+        bulk_notes.apply_notes 요약에 kept(남긴 노트 목록)와
+        skipped(유사도가 낮아 건너뛴 노트 {identifier, title, survivor, similarity} 목록)를 더한 dict
+    """
+    if keep not in ("newest", "oldest"):
+        raise ValueError(f"keep은 newest 또는 oldest여야 합니다: {keep}")
+    if index is None:
+        index = DedupIndex()
+    kept, targets, skipped = [], [], []
+    for cluster in clusters:
+        if keep == "newest":
+            survivor = max(cluster, key=lambda note: note["modified"])
+        else:
+            survivor = min(cluster, key=lambda note: note["created"])
+        kept.append(survivor)
+        for note in cluster:
+            if note is survivor:
+                continue
+            score = index.similarity(survivor["identifier"], note["identifier"])
+            entry = {"identifier": note["identifier"], "title": note["title"]}
+            if score is None or score < threshold:
+                skipped.append({**entry, "survivor": survivor["identifier"], "similarity": score})
+            else:
+                targets.append(entry)
+    report = bulk_notes.apply_notes(action, targets, **kwargs)
+    report["kept"] = kept
+    report["skipped"] = skipped
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Find near-duplicate Bear notes")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync = sub.add_parser("sync", help="hash notes modified since the last sync")
+    sync.add_argument("--workers", type=int, default=4)
+    sync.add_argument("--processes", type=int)
+    show = sub.add_parser("clusters", help="print groups of near-duplicate notes")
+    archive = sub.add_parser("archive", help="archive all but one note per group")
+    for p in (show, archive):
+        p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+        p.add_argument("--bands", type=int, default=DEFAULT_BANDS)
+    archive.add_argument("--keep", choices=["newest", "oldest"], default="newest")
+    archive.add_argument("--rate", type=float, default=10.0)
+    archive.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    index = DedupIndex(processes=getattr(args, "processes", None))
+    if args.command == "sync":
+        report = index.sync(workers=args.workers)
+        print(f"Checked {report['checked']}, hashed {report['parsed']}, "
+              f"removed {report['removed']}, failed {len(report['failed'])}")
+        return 1 if report["failed"] else 0
+
+    groups = index.clusters(threshold=args.threshold, bands=args.bands)
+    if args.command == "clusters":
+        for number, group in enumerate(groups, 1):
+            print(f"Group {number} ({len(group)} notes):")
+            for note in group:
+                print(f"  {note['modified'][:10]}  {note['title']}")
+        return 0
+
+    report = archive_duplicates(groups, keep=args.keep, index=index, threshold=args.threshold,
+                                rate=args.rate, dry_run=args.dry_run)
+    verb = "Would archive" if args.dry_run else "Archived"
+    print(f"{verb} {report['matched'] if args.dry_run else report['done']} note(s) "
+          f"from {len(groups)} group(s), skipped {len(report['skipped'])} below threshold, "
+          f"failed {len(report['failed'])}")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
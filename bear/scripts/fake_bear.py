@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Bear 에뮬레이터 (가짜 전송 계층)
+
+Bear 앱이나 xcall 없이 bear.py를 실행하기 위한 메모리 내 에뮬레이터입니다.
+벤치마크와 시나리오 실행에서 call_bear의 전송 계층을 대체합니다.
+
+Example:
+    with FakeBear() as fake:
+        create_note(title="Test", text="Hello #work")
+        print(search_notes(tag="work"))
+"""
+
+import re
+import json
+import time
+import uuid
+import base64
+import threading
+import urllib.parse
+from datetime import datetime, timezone
+from typing import Optional, Dict, List, Any, Callable
+
+try:
+    from . import bear
+except ImportError:
+    import bear
+
+
+# 본문 안의 #태그 (공백 없는 태그만 인식)
+_HASHTAG_RE = re.compile(r"(?<![\w#])#([^\s#][^\s]*)")
+
+
+class FakeBearError(Exception):
+    """에뮬레이터가 Bear/런처 오류를 흉내낼 때 발생"""
+
+
+def _now_iso(clock: Callable[[], float]) -> str:
+    return datetime.fromtimestamp(clock(), tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _split_tags(value: str) -> List[str]:
+    return [t.strip() for t in value.split(",") if t.strip()]
+
+
+def _under(tag: str, name: str) -> bool:
+    """tag가 name 자신이거나 name의 하위 태그인지 여부"""
+    return tag == name or tag.startswith(name + "/")
+
+
+class FakeBear:
+    """
+    메모리 내 Bear 에뮬레이터
+
+    Args:
+        latency: 호출마다 추가할 지연 시간(초), Bear 처리 시간 흉내
+        max_url_length: 초과 시 FakeBearError를 내는 URL 길이 제한
+        clock: 생성/수정 시각에 쓸 시간 함수
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        max_url_length: Optional[int] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.latency = latency
+        self.max_url_length = max_url_length
+        self.clock = clock
+        self.notes: Dict[str, Dict[str, Any]] = {}
+        self.calls: List[str] = []
+        self._lock = threading.Lock()
+        self._previous = None
+
+    # 설치/해제
+
+    def install(self) -> "FakeBear":
+        """call_bear 전송 계층을 이 에뮬레이터로 교체"""
+        self._previous = bear.set_transport(self)
+        return self
+
+    def uninstall(self) -> None:
+        """이전 전송 계층 복원"""
+        bear.set_transport(self._previous)
+
+    def __enter__(self) -> "FakeBear":
+        return self.install()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.uninstall()
+
+    # 전송 계층 인터페이스
+
+    def __call__(self, url: str, need_response: bool) -> Optional[str]:
+        if self.max_url_length is not None and len(url) > self.max_url_length:
+            raise FakeBearError(f"URL too long: {len(url)} > {self.max_url_length}")
+        if self.latency:
+            time.sleep(self.latency)
+
+        parsed = urllib.parse.urlsplit(url)
+        action = parsed.path.lstrip("/")
+        params = dict(urllib.parse.parse_qsl(parsed.query, keep_blank_values=True))
+        handler = getattr(self, "_do_" + action.replace("-", "_"), None)
+        if handler is None:
+            raise FakeBearError(f"Unknown action: {action}")
+
+        with self._lock:
+            self.calls.append(action)
+            result = handler(params)
+        if not need_response or result is None:
+            return None
+        return json.dumps(result, ensure_ascii=False)
+
+    # 내부 도우미
+
+    def add_note(
+        self,
+        title: str,
+        text: str = "",
+        tags: Optional[List[str]] = None,
+        locked: bool = False,
+        created: Optional[str] = None,
+        modified: Optional[str] = None
+    ) -> str:
+        """Bear를 거치지 않고 노트를 직접 추가 (시드 데이터용)"""
+        with self._lock:
+            return self._create(title, text, tags or [], locked, created, modified)
+
+    def _create(
+        self,
+        title: str,
+        text: str,
+        tags: List[str],
+        locked: bool = False,
+        created: Optional[str] = None,
+        modified: Optional[str] = None
+    ) -> str:
+        identifier = str(uuid.uuid4()).upper()
+        now = _now_iso(self.clock)
+        note = {
+            "identifier": identifier,
+            "title": title,
+            "text": text,
+            "tags": [],
+            "creationDate": created or now,
+            "modificationDate": modified or created or now,
+            "trashed": False,
+            "archived": False,
+            "locked": locked,
+            "files": [],
+        }
+        self.notes[identifier] = note
+        self._retag(note, tags)
+        return identifier
+
+    def _retag(self, note: Dict[str, Any], extra: List[str], text: Optional[str] = None) -> None:
+        found = _HASHTAG_RE.findall(note["text"] if text is None else text)
+        tags = list(dict.fromkeys(note["tags"] + extra + found))
+        note["tags"] = tags
+
+    def _touch(self, note: Dict[str, Any]) -> None:
+        note["modificationDate"] = _now_iso(self.clock)
+
+    def _find(self, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        if params.get("id"):
+            return self.notes.get(params["id"])
+        title = params.get("title")
+        if title:
+            for note in self.notes.values():
+                if note["title"] == title and not note["trashed"]:
+                    return note
+        return None
+
+    def _active(self) -> List[Dict[str, Any]]:
+        return [n for n in self.notes.values() if not n["trashed"] and not n["archived"]]
+
+    @staticmethod
+    def _summary(note: Dict[str, Any]) -> Dict[str, Any]:
+        # 실제 Bear의 /search 결과처럼 태그 없이 네 필드만 (references/actions.md)
+        return {
+            "title": note["title"],
+            "identifier": note["identifier"],
+            "modificationDate": note["modificationDate"],
+            "creationDate": note["creationDate"],
+        }
+
+    def _filter(self, notes: List[Dict[str, Any]], term: str) -> List[Dict[str, Any]]:
+        if term:
+            term = term.lower()
+            notes = [n for n in notes if term in n["title"].lower() or term in n["text"].lower()]
+        return [self._summary(n) for n in notes]
+
+    # 액션 처리
+
+    def _do_create(self, params: Dict[str, str]) -> Dict[str, str]:
+        title = params.get("title", "")
+        text = params.get("text", "")
+        if params.get("file"):
+            text += self._attachment(params)
+        identifier = self._create(title, text, _split_tags(params.get("tags", "")))
+        return {"identifier": identifier, "title": title}
+
+    def _do_add_text(self, params: Dict[str, str]) -> Optional[Dict[str, str]]:
+        note = self._find(params)
+        if note is None:
+            return None
+        text = params.get("text", "")
+        mode = params.get("mode", "append")
+        header = params.get("header", "")
+        body = note["text"]
+        if header:
+            marker = re.search(rf"^#+ {re.escape(header)}\s*$", body, re.M)
+            if marker:
+                pos = marker.end()
+                if mode == "append":
+                    nxt = re.search(r"^#+ ", body[pos:], re.M)
+                    pos = pos + nxt.start() if nxt else len(body)
+                    note["text"] = body[:pos].rstrip("\n") + "\n" + text + "\n" + body[pos:]
+                else:
+                    note["text"] = body[:pos] + "\n" + text + body[pos:]
+        elif mode == "prepend":
+            note["text"] = text + body
+        elif mode == "replace_all":
+            note["text"] = text
+        elif mode == "replace":
+            note["text"] = text
+        else:
+            if params.get("new_line") == "yes" and body and not body.endswith("\n"):
+                body += "\n"
+            note["text"] = body + text
+        self._retag(note, [], text if mode in ("append", "prepend") else None)
+        self._touch(note)
+        return {"note": note["text"], "title": note["title"]}
+
+    def _attachment(self, params: Dict[str, str]) -> str:
+        data = base64.b64decode(params["file"])
+        filename = params.get("filename", "file")
+        return f"\n[{filename}]({filename}) ({len(data)} bytes)"
+
+    def _do_add_file(self, params: Dict[str, str]) -> Dict[str, str]:
+        note = self._find(params)
+        if note is None:
+            identifier = self._create("", "", [])
+            note = self.notes[identifier]
+        note["files"].append(params.get("filename", "file"))
+        note["text"] += self._attachment(params)
+        self._touch(note)
+        return {"note": note["text"]}
+
+    def _do_open_note(self, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        note = self._find(params)
+        if note is None:
+            return None
+        result = self._summary(note)
+        result["tags"] = list(note["tags"])
+        result["note"] = note["text"]
+        result["is_trashed"] = "yes" if note["trashed"] else "no"
+        return result
+
+    def _do_search(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        notes = self._active()
+        tag = params.get("tag", "")
+        if tag:
+            notes = [n for n in notes if any(_under(t, tag) for t in n["tags"])]
+        return self._filter(notes, params.get("term", ""))
+
+    def _do_open_tag(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        names = _split_tags(params.get("name", ""))
+        notes = [
+            n for n in self._active()
+            if any(_under(t, name) for t in n["tags"] for name in names)
+        ]
+        return self._filter(notes, "")
+
+    def _do_tags(self, params: Dict[str, str]) -> List[Dict[str, str]]:
+        names = set()
+        for note in self._active():
+            for tag in note["tags"]:
+                parts = tag.split("/")
+                for i in range(1, len(parts) + 1):
+                    names.add("/".join(parts[:i]))
+        return [{"name": name} for name in sorted(names)]
+
+    def _do_rename_tag(self, params: Dict[str, str]) -> None:
+        old, new = params.get("name", ""), params.get("new_name", "")
+        for note in self.notes.values():
+            if any(_under(t, old) for t in note["tags"]):
+                note["tags"] = list(dict.fromkeys(
+                    new + t[len(old):] if _under(t, old) else t for t in note["tags"]
+                ))
+                note["text"] = re.sub(
+                    rf"(?<![\w#])#{re.escape(old)}(?=[/\s]|$)", "#" + new, note["text"]
+                )
+                self._touch(note)
+        return None
+
+    def _do_delete_tag(self, params: Dict[str, str]) -> None:
+        name = params.get("name", "")
+        for note in self.notes.values():
+            if any(_under(t, name) for t in note["tags"]):
+                note["tags"] = [t for t in note["tags"] if not _under(t, name)]
+                self._touch(note)
+        return None
+
+    def _do_trash(self, params: Dict[str, str]) -> None:
+        note = self._find(params)
+        if note is not None:
+            note["trashed"] = True
+            self._touch(note)
+        return None
+
+    def _do_archive(self, params: Dict[str, str]) -> None:
+        note = self._find(params)
+        if note is not None:
+            note["archived"] = True
+            self._touch(note)
+        return None
+
+    def _do_grab_url(self, params: Dict[str, str]) -> Dict[str, str]:
+        url = params.get("url", "")
+        title = urllib.parse.urlsplit(url).netloc + urllib.parse.urlsplit(url).path
+        text = f"# {title}\n\n[{url}]({url})\n"
+        identifier = self._create(title, text, _split_tags(params.get("tags", "")))
+        return {"identifier": identifier, "title": title}
+
+    def _do_todo(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        notes = [n for n in self._active() if "- [ ]" in n["text"]]
+        return self._filter(notes, params.get("search", ""))
+
+    def _do_today(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        today = _now_iso(self.clock)[:10]
+        notes = [
+            n for n in self._active()
+            if n["modificationDate"][:10] == today or n["creationDate"][:10] == today
+        ]
+        return self._filter(notes, params.get("search", ""))
+
+    def _do_untagged(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        notes = [n for n in self._active() if not n["tags"]]
+        return self._filter(notes, params.get("search", ""))
+
+    def _do_locked(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        notes = [n for n in self._active() if n["locked"]]
+        return self._filter(notes, params.get("search", ""))
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+노트 위키 링크([[Title]]) 그래프
+
+노트 본문의 [[Title]] 링크를 제목 -> ID 맵으로 풀어 정방향/역방향 간선을 유지합니다.
+간선은 "제목을 가리키는 노트" 형태로 저장하므로, 노트 제목이 바뀌거나 새 노트가 생겨도
+다른 노트를 다시 파싱하지 않고 링크 해석이 바로 바뀝니다.
+
+Usage:
+    python3 links.py sync
+    python3 links.py backlinks "Project Alpha"
+    python3 links.py orphans
+
+Example:
+    graph = LinkGraph()
+    graph.sync()
+    note_id = graph.resolve("Project Alpha")[0]
+    print(graph.backlinks(note_id), graph.k_hop(note_id, 2))
+"""
+
+import re
+import sys
+import argparse
+from collections import deque
+from typing import Optional, Dict, List, Any, Set
+
+try:
+    from .content_index import ContentIndex
+except ImportError:
+    from content_index import ContentIndex
+
+
+_LINK_RE = re.compile(r"\[\[([^\[\]\n]+?)\]\]")
+
+
+def parse_links(text: str) -> List[str]:
+    """
+    본문의 [[Title]] 링크 제목 목록 (중복 제거, 처음 나온 순서)
+
+    [[Title#Heading]], [[Title|별칭]] 형식은 제목 부분만 사용합니다.
+    """
+    titles: Dict[str, None] = {}
+    for match in _LINK_RE.finditer(text):
+        title = match.group(1).split("|", 1)[0].split("#", 1)[0].strip()
+        if title:
+            titles[title] = None
+    return list(titles)
+
+
+def title_key(title: str) -> str:
+    """링크 해석에 쓰는 제목 키 (대소문자, 앞뒤 공백 무시)"""
+    return title.strip().casefold()
+
+
+class LinkGraph(ContentIndex):
+    """
+    위키 링크 그래프
+
+    Args:
+        path: SQLite 파일 경로 (기본값: ~/.cache/bear-skill/index.sqlite)
+        fetch: 노트 ID로 본문을 가져오는 함수 (기본값: get_note_contents)
+    """
+
+    table = "links"
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        # 제목 키 -> 그 제목의 노트 ID, 제목 키 -> 그 제목으로 링크한 노트 ID
+        self._by_title: Dict[str, Set[str]] = {}
+        self._linked_from: Dict[str, Set[str]] = {}
+        super().__init__(*args, **kwargs)
+
+    def extract(self, text: str) -> List[str]:
+        return parse_links(text)
+
+    def _changed(self, identifier: str, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+        if old is not None:
+            _discard(self._by_title, title_key(old["title"]), identifier)
+            for title in old["data"]:
+                _discard(self._linked_from, title_key(title), identifier)
+        if new is not None:
+            self._by_title.setdefault(title_key(new["title"]), set()).add(identifier)
+            for title in new["data"]:
+                self._linked_from.setdefault(title_key(title), set()).add(identifier)
+
+    # 조회
+
+    def resolve(self, title: str) -> List[str]:
+        """제목의 노트 ID 목록 (같은 제목이 여러 개면 모두)"""
+        self.load()
+        return sorted(self._by_title.get(title_key(title), ()))
+
+    def links(self, identifier: str) -> Set[str]:
+        """이 노트가 링크한 노트 ID (정방향)"""
+        self.load()
+        entry = self.entries.get(identifier)
+        if entry is None:
+            return set()
+        found: Set[str] = set()
+        for title in entry["data"]:
+            found.update(self._by_title.get(title_key(title), ()))
+        found.discard(identifier)
+        return found
+
+    def backlinks(self, identifier: str) -> Set[str]:
+        """이 노트를 링크한 노트 ID (역방향)"""
+        self.load()
+        entry = self.entries.get(identifier)
+        if entry is None:
+            return set()
+        found = set(self._linked_from.get(title_key(entry["title"]), ()))
+        found.discard(identifier)
+        return found
+
+    def neighbours(self, identifier: str) -> Set[str]:
+        """정방향과 역방향으로 바로 연결된 노트 ID"""
+        return self.links(identifier) | self.backlinks(identifier)
+
+    def unresolved(self, identifier: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        대상 노트가 없는 링크
+
+        Returns:
+            노트 ID -> 해석되지 않은 링크 제목 목록 (identifier를 주면 그 노트만)
+        """
+        self.load()
+        ids = [identifier] if identifier is not None else list(self.entries)
+        result = {}
+        for note_id in ids:
+            entry = self.entries.get(note_id)
+            if entry is None:
+                continue
+            missing = [t for t in entry["data"] if title_key(t) not in self._by_title]
+            if missing:
+                result[note_id] = missing
+        return result
+
+    def k_hop(self, identifier: str, k: int, direction: str = "both") -> Dict[str, int]:
+        """
+        k단계 이내로 연결된 노트 (너비 우선 탐색)
+
+        Args:
+            k: 최대 단계 수
+            direction: "out"(정방향), "in"(역방향), "both"
+
+        Returns:
+            노트 ID -> 거리 (시작 노트 제외)
+        """
+        if direction not in ("out", "in", "both"):
+            raise ValueError(f"direction은 out, in, both 중 하나여야 합니다: {direction}")
+        step = {"out": self.links, "in": self.backlinks, "both": self.neighbours}[direction]
+        distance = {identifier: 0}
+        queue = deque([identifier])
+        while queue:
+            current = queue.popleft()
+            if distance[current] >= k:
+                continue
+            for nxt in step(current):
+                if nxt not in distance:
+                    distance[nxt] = distance[current] + 1
+                    queue.append(nxt)
+        del distance[identifier]
+        return distance
+
+    def orphans(self) -> List[str]:
+        """링크를 주지도 받지도 않는 노트 ID (간선 수에 비례하는 한 번의 훑기)"""
+        self.load()
+        connected: Set[str] = set()
+        for key, sources in self._linked_from.items():
+            targets = self._by_title.get(key)
+            if not targets:
+                continue
+            # 자기 자신으로의 링크만 있는 경우는 연결로 보지 않음
+            connected.update(t for t in targets if len(sources) > 1 or t not in sources)
+            connected.update(s for s in sources if len(targets) > 1 or s not in targets)
+        return sorted(i for i in self.entries if i not in connected)
+
+
+def _discard(index: Dict[str, Set[str]], key: str, value: str) -> None:
+    members = index.get(key)
+    if members is not None:
+        members.discard(value)
+        if not members:
+            del index[key]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Wiki-link graph of Bear notes")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync = sub.add_parser("sync", help="re-parse notes modified since the last sync")
+    sync.add_argument("--workers", type=int, default=4)
+    for name in ("links", "backlinks", "neighbours"):
+        sub.add_parser(name).add_argument("title")
+    hop = sub.add_parser("hop", help="notes within k links")
+    hop.add_argument("title")
+    hop.add_argument("-k", type=int, default=2)
+    sub.add_parser("orphans", help="notes with no links in or out")
+    sub.add_parser("unresolved", help="links to titles that don't exist")
+    args = parser.parse_args(argv)
+
+    graph = LinkGraph()
+    if args.command == "sync":
+        report = graph.sync(workers=args.workers)
+        print(f"Checked {report['checked']}, parsed {report['parsed']}, "
+              f"removed {report['removed']}, failed {len(report['failed'])}")
+        return 1 if report["failed"] else 0
+
+    def title(note_id: str) -> str:
+        return graph.entries[note_id]["title"]
+
+    if args.command == "orphans":
+        for note_id in graph.orphans():
+            print(title(note_id))
+        return 0
+    if args.command == "unresolved":
+        for note_id, missing in graph.unresolved().items():
+            print(f"{title(note_id)}: {', '.join(missing)}")
+        return 0
+
+    ids = graph.resolve(args.title)
+    if not ids:
+        print(f"No indexed note titled {args.title!r}", file=sys.stderr)
+        return 1
+    if args.command == "hop":
+        found = graph.k_hop(ids[0], args.k)
+        for note_id, distance in sorted(found.items(), key=lambda item: item[1]):
+            print(f"{distance}  {title(note_id)}")
+        return 0
+    for note_id in sorted(getattr(graph, args.command)(ids[0]), key=title):
+        print(title(note_id))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
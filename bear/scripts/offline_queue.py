@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Bear 오프라인 쓰기 큐
+
+Bear가 실행 중이 아닐 때도 쓰기 작업(노트 생성, 텍스트 추가, 태그, 휴지통/보관)을
+잃지 않도록 추가 전용(append-only) 파일에 기록해 두고,
+Bear에 연결할 수 있게 되면 순서대로 다시 실행합니다.
+
+Example:
+    queue = WriteQueue()
+    queue.submit("create_note", title="Nightly Report", text=report, tags="report")
+
+    # 나중에 (Bear 실행 중일 때)
+    queue.replay()
+
+Usage:
+    python3 offline_queue.py status
+    python3 offline_queue.py replay --rate 5
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import fcntl
+import atexit
+import inspect
+import argparse
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, List, Any
+
+try:
+    from . import bear
+except ImportError:
+    import bear
+
+
+# 큐 파일 기본 경로
+DEFAULT_QUEUE_PATH = os.environ.get(
+    "BEAR_QUEUE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "bear-skill", "write-queue.jsonl")
+)
+
+# 큐에 넣을 수 있는 쓰기 작업 (bear.py 함수명)
+QUEUEABLE_OPS = (
+    "create_note",
+    "add_text",
+    "rename_tag",
+    "delete_tag",
+    "trash_note",
+    "archive_note",
+)
+
+
+class WriteQueue:
+    """
+    fsync를 묶어서 수행하는 내구성 있는 쓰기 큐
+
+    레코드는 JSON Lines로 추가되고, 재실행 위치는 큐 파일의 inode와 함께 `<path>.offset`
+    파일에 저장됩니다. 모두 재실행하면 빈 파일로 교체하므로(inode가 바뀜) 교체 직후에
+    중단되어도 저장된 위치가 새 파일에 잘못 적용되지 않습니다.
+    여러 프로세스가 같은 큐를 써도 파일 잠금(flock)으로 순서가 보장됩니다.
+
+    Args:
+        path: 큐 파일 경로
+        fsync_batch: 이 개수만큼 쌓이면 fsync
+        fsync_interval: 마지막 fsync 후 이 시간(초)이 지나면 fsync
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_QUEUE_PATH,
+        fsync_batch: int = 32,
+        fsync_interval: float = 1.0
+    ):
+        self.path = path
+        self.offset_path = path + ".offset"
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._file = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        atexit.register(self.close)
+
+    # 기록
+
+    def enqueue(self, op: str, **kwargs: Any) -> None:
+        """
+        쓰기 작업을 큐에 추가
+
+        Args:
+            op: bear.py 함수명 (QUEUEABLE_OPS 중 하나)
+            **kwargs: 함수 인자
+        """
+        _check_args(op, kwargs)
+        if op == "create_note":
+            # 재실행 도중 중단되어 같은 레코드가 다시 실행돼도 노트가 한 번만 만들어지도록 함
+            kwargs.setdefault("idempotency_key", "queue:" + uuid.uuid4().hex)
+        record = json.dumps({"op": op, "kwargs": kwargs, "ts": time.time()}, ensure_ascii=False)
+        with self._lock:
+            f = self._open_locked()
+            try:
+                data = record.encode("utf-8") + b"\n"
+                size = os.fstat(f.fileno()).st_size
+                if size and os.pread(f.fileno(), 1, size - 1) != b"\n":
+                    # 다른 프로세스가 쓰다가 중단된 줄에 이어 붙지 않도록 줄을 끝냄
+                    data = b"\n" + data
+                f.write(data)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            self._pending += 1
+            if (self._pending >= self.fsync_batch
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync()
+
+    def submit(self, op: str, **kwargs: Any) -> Any:
+        """
+        Bear에 연결 가능하고 큐가 비어 있으면 바로 실행, 아니면 큐에 추가
+
+        큐에 밀린 작업이 있으면 순서를 지키기 위해 새 작업도 큐 뒤에 붙입니다.
+
+        Returns:
+            바로 실행한 경우 bear 함수의 반환값, 큐에 넣은 경우 None
+        """
+        _check_args(op, kwargs)
+        if op == "create_note":
+            # 바로 실행하다 전송 오류로 큐에 넣게 되어도 같은 키로 다시 실행되도록 미리 정함
+            kwargs.setdefault("idempotency_key", "queue:" + uuid.uuid4().hex)
+        if not self.has_pending() and bear.is_bear_running():
+            try:
+                return getattr(bear, op)(**kwargs)
+            except OSError:
+                # 전송 실패 (Bear/xcall 실행 불가 등): 잃지 않도록 큐에 넣음
+                pass
+        self.enqueue(op, **kwargs)
+        return None
+
+    def flush(self) -> None:
+        """기록된 레코드를 즉시 디스크에 fsync"""
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        """남은 레코드를 fsync하고 파일 닫기"""
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def _sync(self) -> None:
+        if self._file is not None and self._pending:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _open_locked(self):
+        """현재 큐 파일을 열어 잠근 뒤 반환 (재실행이 파일을 교체했으면 새 파일을 다시 엶)"""
+        while True:
+            if self._file is None:
+                self._file = open(self.path, "a+b")
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+            if _same_file(self._file, self.path):
+                return self._file
+            # 잠금을 기다리는 동안 재실행이 모두 처리하고 빈 파일로 교체함
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    # 재실행
+
+    def _read_offset(self) -> int:
+        """저장된 재실행 위치 (다른 inode의 큐 파일에 대한 위치면 0)"""
+        try:
+            with open(self.offset_path, encoding="utf-8") as f:
+                fields = f.read().split()
+            offset = int(fields[0]) if fields else 0
+            if len(fields) > 1 and int(fields[1]) != os.stat(self.path).st_ino:
+                return 0
+            return offset
+        except (OSError, ValueError):
+            return 0
+
+    def _write_offset(self, offset: int, f: Any) -> None:
+        tmp = self.offset_path + ".tmp"
+        inode = os.fstat(f.fileno()).st_ino
+        with open(tmp, "w", encoding="utf-8") as out:
+            out.write(f"{offset} {inode}")
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, self.offset_path)
+
+    def _rotate(self) -> Any:
+        """
+        큐 파일을 빈 파일로 원자적으로 교체하고 위치를 0으로 저장, 새 파일 반환
+
+        새 파일은 inode가 다르므로 교체와 위치 저장 사이에 중단되어도 이전 위치는 무시됩니다.
+        교체 전 파일을 연 채 잠금을 기다리던 기록자는 _open_locked()에서 새 파일로 옮겨 갑니다.
+        """
+        tmp = f"{self.path}.tmp{os.getpid()}"
+        fresh = open(tmp, "a+b")
+        os.fsync(fresh.fileno())
+        os.replace(tmp, self.path)
+        _fsync_dir(self.path)
+        self._write_offset(0, fresh)
+        return fresh
+
+    @contextmanager
+    def _exclusive(self):
+        """큐 파일 잠금 (재실행은 배치를 읽고 위치를 저장하는 동안만 잡음)"""
+        while True:
+            f = open(self.path, "a+b")
+            fcntl.flock(f, fcntl.LOCK_EX)
+            if _same_file(f, self.path):
+                break
+            f.close()
+        try:
+            yield f
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+            f.close()
+
+    def has_pending(self) -> bool:
+        """재실행되지 않은 레코드가 있는지 여부 (파일 크기만 확인)"""
+        try:
+            return os.path.getsize(self.path) > self._read_offset()
+        except OSError:
+            return False
+
+    def pending(self) -> int:
+        """아직 재실행되지 않은 레코드 수"""
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, "rb") as f:
+            f.seek(self._read_offset())
+            return sum(1 for line in f if line.strip())
+
+    def replay(
+        self,
+        batch_size: int = 50,
+        rate: float = 10.0,
+        stop_when_unreachable: bool = True
+    ) -> Dict[str, Any]:
+        """
+        큐에 쌓인 작업을 순서대로 Bear에 실행
+
+        큐 파일 잠금은 batch_size개를 읽을 때와 재실행 위치를 저장할 때만 잡으므로
+        재실행 중에도 다른 프로세스가 기록할 수 있습니다. 배치마다 Bear 실행 여부를 확인해
+        (open 전송은 Bear가 꺼져 있어도 실패를 알리지 않음) 연결할 수 없으면 위치를 그대로 두고 멈춥니다.
+        중간에 중단되어도 최대 한 배치만 다시 실행됩니다.
+
+        Args:
+            batch_size: 한 번에 읽고 재실행 위치를 저장하는 레코드 수
+            rate: 초당 최대 호출 수 (0 이하면 제한 없음)
+            stop_when_unreachable: Bear에 연결할 수 없으면 실행하지 않고 반환
+
+        Returns:
+            {replayed, failed, remaining} 요약
+        """
+        self.flush()
+        report: Dict[str, Any] = {"replayed": 0, "failed": [], "remaining": 0}
+        limiter = bear.RateLimiter(rate, burst=max(1, int(rate)))
+        with bear.span("replay_queue", path=self.path), self._replaying():
+            while True:
+                if stop_when_unreachable and not bear.is_bear_running():
+                    report["remaining"] = self.pending()
+                    return report
+                offset, batch = self._read_batch(max(1, batch_size))
+                if not batch:
+                    if self._rotate_if_done(offset):
+                        return report
+                    continue
+                try:
+                    for end, record, error in batch:
+                        if error is None:
+                            limiter.acquire()
+                            try:
+                                getattr(bear, record["op"])(**record["kwargs"])
+                                report["replayed"] += 1
+                            except ValueError as e:
+                                # 잘못된 인자는 다시 실행해도 실패하므로 보고 후 건너뜀
+                                error = str(e)
+                        if error is not None:
+                            # 끊긴 줄이나 잘못된 레코드도 다시 읽어도 같으므로 보고 후 건너뜀
+                            report["failed"].append({"record": record, "error": error})
+                        offset = end
+                except OSError:
+                    # 전송 실패는 일시적일 수 있으므로 이 레코드부터 다음에 다시 실행
+                    self._commit_offset(offset)
+                    report["remaining"] = self.pending()
+                    return report
+                except BaseException:
+                    # 예상하지 못한 오류: 이미 실행한 레코드가 다시 실행되지 않도록 위치를 저장한 뒤 전파
+                    self._commit_offset(offset)
+                    raise
+                self._commit_offset(offset)
+
+    @contextmanager
+    def _replaying(self):
+        """재실행은 한 번에 하나만 (기록은 막지 않는 별도 잠금 파일)"""
+        with open(self.path + ".replay.lock", "a+b") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read_batch(self, size: int):
+        """
+        잠금을 잡고 저장된 위치부터 최대 size개 레코드 읽기
+
+        Returns:
+            (시작 위치, [(레코드 끝 위치, 레코드, 오류 문자열 또는 None)])
+        """
+        batch = []
+        with self._exclusive() as f:
+            offset = self._read_offset()
+            f.seek(offset)
+            while len(batch) < size:
+                line = f.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    if not batch:
+                        offset = f.tell()
+                    continue
+                try:
+                    batch.append((f.tell(), _parse_record(line), None))
+                except (ValueError, KeyError, TypeError) as e:
+                    raw = {"raw": line.decode("utf-8", "replace").rstrip("\n")}
+                    batch.append((f.tell(), raw, f"잘못된 레코드: {e}"))
+        return offset, batch
+
+    def _commit_offset(self, offset: int) -> None:
+        """잠금을 잡고 재실행 위치 저장"""
+        with self._exclusive() as f:
+            self._write_offset(offset, f)
+
+    def _rotate_if_done(self, offset: int) -> bool:
+        """잠금을 잡은 채 더 읽을 레코드가 없으면 빈 큐 파일로 교체하고 True 반환"""
+        with self._exclusive() as f:
+            if os.fstat(f.fileno()).st_size > offset:
+                # 읽은 뒤 다른 프로세스가 레코드를 추가함
+                return False
+            self._rotate().close()
+            return True
+
+
+def _check_args(op: str, kwargs: Dict[str, Any]) -> None:
+    """op가 큐에 넣을 수 있는 작업이고 kwargs가 그 함수 시그니처에 맞는지 확인 (ValueError)"""
+    if op not in QUEUEABLE_OPS:
+        raise ValueError(f"큐에 넣을 수 없는 작업입니다: {op}")
+    try:
+        inspect.signature(getattr(bear, op)).bind(**kwargs)
+    except TypeError as e:
+        raise ValueError(f"{op} 인자가 잘못되었습니다: {e}") from None
+
+
+def _parse_record(line: bytes) -> Dict[str, Any]:
+    """큐 파일 한 줄을 레코드로 변환 (끊긴 줄, 잘못된 JSON이나 인자는 ValueError/KeyError/TypeError)"""
+    if not line.endswith(b"\n"):
+        raise ValueError("줄이 중간에 끊겼습니다")
+    record = json.loads(line.decode("utf-8"))
+    _check_args(record["op"], record["kwargs"])
+    return record
+
+
+def _same_file(f: Any, path: str) -> bool:
+    """열린 파일 f가 지금 path에 있는 파일인지 (재실행이 큐 파일을 교체했는지 확인)"""
+    try:
+        return os.fstat(f.fileno()).st_ino == os.stat(path).st_ino
+    except OSError:
+        return False
+
+
+def _fsync_dir(path: str) -> None:
+    """rename이 디스크에 남도록 디렉터리 fsync"""
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bear offline write queue")
+    parser.add_argument("command", choices=["status", "replay"])
+    parser.add_argument("--path", default=DEFAULT_QUEUE_PATH)
+    parser.add_argument("--rate", type=float, default=10.0, help="max calls per second")
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    queue = WriteQueue(args.path)
+    if args.command == "status":
+        print(f"{queue.pending()} pending write(s) in {args.path}")
+        return 0
+
+    report = queue.replay(batch_size=args.batch_size, rate=args.rate)
+    print(f"Replayed {report['replayed']}, failed {len(report['failed'])}, "
+          f"remaining {report['remaining']}")
+    for failure in report["failed"]:
+        print(f"  {failure['record'].get('op', 'invalid record')}: {failure['error']}")
+    return 1 if report["failed"] or report["remaining"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
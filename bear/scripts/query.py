@@ -0,0 +1,807 @@
+#!/usr/bin/env python3
+"""
+노트 검색 쿼리 언어와 실행 계획
+
+search_notes는 검색어 하나와 태그 하나만 받으므로, 여러 조건은 전체 노트를 받아 파이썬에서 걸러야 했습니다.
+이 모듈은 짧은 쿼리 문자열을 조건 트리로 파싱하고, 가장 선택적인 조건 하나를 Bear 호출 한 번
+(search/todo/untagged) 또는 로컬 인덱스(스냅샷, 캐시)로 내려 보낸 뒤,
+나머지 조건은 선택도와 비용 순으로 정렬한 스트리밍 필터로 적용합니다.
+
+문법 (공백은 AND, 우선순위 NOT > AND > OR, 괄호로 묶기):
+    #work  tag:work/project      이 태그 또는 하위 태그
+    is:untagged                  태그 없는 노트
+    has:todo                     미완료 할 일이 있는 노트
+    title:/^Weekly/i  title:"weekly review"  title:review
+                                 제목 정규식 / 포함 문자열 (대소문자 무시)
+    created:2024-01-05  modified:>=2024-01-01  modified:2024-01-01..2024-01-31  modified:>-7d
+                                 날짜 범위 (>, >=, <, <=, a..b, today, yesterday, -Nd)
+    python  "exact phrase"       Bear 본문 검색어 (최상위 AND 조건에서만)
+    NOT x  -x  x OR y  (x y)
+
+Usage:
+    python3 query.py '#work -#work/archive modified:>-30d has:todo'
+    python3 query.py --explain 'title:/^Weekly Review/ created:2024-01-01..2024-03-31'
+
+Example:
+    for note in select('#project (has:todo OR modified:>-7d) title:/alpha/i'):
+        print(note["title"])
+    print(compile_query('#work python').plan().explain())
+"""
+
+import re
+import sys
+import argparse
+from datetime import date, datetime, timedelta
+from typing import Optional, Dict, List, Any, Iterator, Iterable, Set, Tuple
+
+try:
+    from . import bear
+    from .snapshot import Snapshot, parse_date, note_tags
+except ImportError:
+    import bear
+    from snapshot import Snapshot, parse_date, note_tags
+
+
+# 통계가 없을 때 쓰는 조건별 선택도 추정값 (남는 노트 비율)
+_SELECTIVITY = {
+    "term": 0.02, "tag": 0.1, "untagged": 0.2, "todo": 0.1,
+    "title": 0.1, "date": 0.3, "range": 0.1,
+}
+# 노트 하나를 검사하는 상대 비용 (날짜 비교를 1로 봄)
+_COST = {"term": 1.0, "tag": 2.0, "untagged": 1.0, "todo": 1.5, "title": 5.0, "date": 1.0}
+
+
+# 조건 트리
+
+class Node:
+    """조건 트리 노드"""
+
+    __slots__ = ()
+    kind = ""
+
+    def matches(self, note: Dict[str, Any], ctx: "Context") -> bool:
+        raise NotImplementedError
+
+    def selectivity(self, stats: "Stats") -> float:
+        return _SELECTIVITY[self.kind]
+
+    def cost(self) -> float:
+        return _COST[self.kind]
+
+    def terms(self) -> List["Term"]:
+        return []
+
+
+class Term(Node):
+    """Bear 본문 검색어 (로컬에서는 검사할 수 없음)"""
+
+    __slots__ = ("text",)
+    kind = "term"
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def matches(self, note: Dict[str, Any], ctx: "Context") -> bool:
+        raise ValueError("검색어는 Bear 검색으로만 처리할 수 있습니다")
+
+    def terms(self) -> List["Term"]:
+        return [self]
+
+    def __repr__(self) -> str:
+        return f'"{self.text}"' if " " in self.text else self.text
+
+
+class Tag(Node):
+    """이 태그 또는 하위 태그"""
+
+    __slots__ = ("name",)
+    kind = "tag"
+
+    def __init__(self, name: str):
+        self.name = name.strip("#/")
+        if not self.name:
+            raise ValueError("태그 이름이 비어 있습니다")
+
+    def matches(self, note: Dict[str, Any], ctx: "Context") -> bool:
+        return ctx.has_tag(note, self.name)
+
+    def selectivity(self, stats: "Stats") -> float:
+        return stats.tag(self.name)
+
+    def __repr__(self) -> str:
+        return "#" + self.name
+
+
+class Untagged(Node):
+    """태그 없는 노트"""
+
+    __slots__ = ()
+    kind = "untagged"
+
+    def matches(self, note: Dict[str, Any], ctx: "Context") -> bool:
+        return ctx.is_untagged(note)
+
+    def __repr__(self) -> str:
+        return "is:untagged"
+
+
+class Todo(Node):
+    """미완료 할 일이 있는 노트"""
+
+    __slots__ = ()
+    kind = "todo"
+
+    def matches(self, note: Dict[str, Any], ctx: "Context") -> bool:
+        return note.get("identifier") in ctx.todo_ids()
+
+    def __repr__(self) -> str:
+        return "has:todo"
+
+
+class Title(Node):
+    """제목 정규식 또는 포함 문자열"""
+
+    __slots__ = ("pattern", "source")
+    kind = "title"
+
+    def __init__(self, source: str, regex: bool, flags: str = ""):
+        self.source = source
+        if regex:
+            try:
+                self.pattern = re.compile(source, re.IGNORECASE if "i" in flags else 0)
+            except re.error as e:
+                raise ValueError(f"제목 정규식이 잘못되었습니다: {source!r} ({e})") from None
+        else:
+            self.pattern = re.compile(re.escape(source), re.IGNORECASE)
+
+    def matches(self, note: Dict[str, Any], ctx: "Context") -> bool:
+        return self.pattern.search(note.get("title") or "") is not None
+
+    def selectivity(self, stats: "Stats") -> float:
+        # 시작 위치가 고정된 정규식은 더 선택적이라고 봄
+        return _SELECTIVITY["title"] / 2 if self.source.startswith("^") else _SELECTIVITY["title"]
+
+    def __repr__(self) -> str:
+        return f"title:/{self.source}/"
+
+
+class DateRange(Node):
+    """생성/수정 시각 범위 [after, before)"""
+
+    __slots__ = ("column", "after", "before")
+    kind = "date"
+
+    def __init__(self, column: str, after: Optional[float], before: Optional[float]):
+        self.column = column
+        self.after = after
+        self.before = before
+
+    def matches(self, note: Dict[str, Any], ctx: "Context") -> bool:
+        value = parse_date(note.get("creationDate" if self.column == "created" else "modificationDate"))
+        if self.after is not None and value < self.after:
+            return False
+        return self.before is None or value < self.before
+
+    def selectivity(self, stats: "Stats") -> float:
+        both = self.after is not None and self.before is not None
+        return _SELECTIVITY["range" if both else "date"]
+
+    def __repr__(self) -> str:
+        def fmt(value: Optional[float]) -> str:
+            return "" if value is None else datetime.fromtimestamp(value).isoformat(timespec="minutes")
+        return f"{self.column}:{fmt(self.after)}..{fmt(self.before)}"
+
+
+class Not(Node):
+    __slots__ = ("child",)
+
+    def __init__(self, child: Node):
+        self.child = child
+
+    def matches(self, note: Dict[str, Any], ctx: "Context") -> bool:
+        return not self.child.matches(note, ctx)
+
+    def selectivity(self, stats: "Stats") -> float:
+        return 1.0 - self.child.selectivity(stats)
+
+    def cost(self) -> float:
+        return self.child.cost()
+
+    def terms(self) -> List[Term]:
+        return self.child.terms()
+
+    def __repr__(self) -> str:
+        return f"NOT {self.child!r}"
+
+
+class And(Node):
+    __slots__ = ("children",)
+
+    def __init__(self, children: List[Node]):
+        self.children = children
+
+    def matches(self, note: Dict[str, Any], ctx: "Context") -> bool:
+        return all(child.matches(note, ctx) for child in self.children)
+
+    def selectivity(self, stats: "Stats") -> float:
+        result = 1.0
+        for child in self.children:
+            result *= child.selectivity(stats)
+        return result
+
+    def cost(self) -> float:
+        return sum(child.cost() for child in self.children)
+
+    def terms(self) -> List[Term]:
+        return [t for child in self.children for t in child.terms()]
+
+    def __repr__(self) -> str:
+        return "(" + " ".join(map(repr, self.children)) + ")"
+
+
+class Or(Node):
+    __slots__ = ("children",)
+
+    def __init__(self, children: List[Node]):
+        self.children = children
+
+    def matches(self, note: Dict[str, Any], ctx: "Context") -> bool:
+        return any(child.matches(note, ctx) for child in self.children)
+
+    def selectivity(self, stats: "Stats") -> float:
+        return min(1.0, sum(child.selectivity(stats) for child in self.children))
+
+    def cost(self) -> float:
+        return sum(child.cost() for child in self.children)
+
+    def terms(self) -> List[Term]:
+        return [t for child in self.children for t in child.terms()]
+
+    def __repr__(self) -> str:
+        return "(" + " OR ".join(map(repr, self.children)) + ")"
+
+
+# 파싱
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?P<neg>-(?=\S))?
+    (?:
+        (?P<lparen>\() | (?P<rparen>\)) |
+        (?P<regex>title:/(?:\\.|[^/\\])*/[a-z]*) |
+        (?P<quoted>(?:title:)?"(?:\\.|[^"\\])*") |
+        (?P<word>[^\s()]+)
+    )
+""", re.VERBOSE)
+_RELATIVE_RE = re.compile(r"^-(\d+)d$")
+
+
+def _day_bounds(value: str) -> Tuple[float, float]:
+    """날짜 값의 [시작, 끝) epoch 초 (날짜는 현지 자정 기준, 시각이 있으면 그 시각 하나)"""
+    today = date.today()
+    relative = _RELATIVE_RE.match(value)
+    if value == "today":
+        day = today
+    elif value == "yesterday":
+        day = today - timedelta(days=1)
+    elif relative:
+        day = today - timedelta(days=int(relative.group(1)))
+    elif len(value) == 10:
+        try:
+            day = date.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"날짜 형식이 잘못되었습니다: {value!r}") from None
+    else:
+        try:
+            moment = datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            raise ValueError(f"날짜 형식이 잘못되었습니다: {value!r}") from None
+        return moment, moment
+    start = datetime.combine(day, datetime.min.time()).timestamp()
+    end = datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()
+    return start, end
+
+
+def _date_range(column: str, value: str) -> DateRange:
+    if ".." in value:
+        low, high = value.split("..", 1)
+        return DateRange(column, _day_bounds(low)[0] if low else None, _day_bounds(high)[1] if high else None)
+    for op in (">=", "<=", ">", "<"):
+        if value.startswith(op):
+            start, end = _day_bounds(value[len(op):])
+            return {
+                ">=": DateRange(column, start, None),
+                ">": DateRange(column, end, None),
+                "<=": DateRange(column, None, end),
+                "<": DateRange(column, None, start),
+            }[op]
+    start, end = _day_bounds(value)
+    return DateRange(column, start, end if end > start else None)
+
+
+def _unquote(text: str) -> str:
+    return re.sub(r"\\(.)", r"\1", text[1:-1])
+
+
+def _predicate(token: Dict[str, str]) -> Node:
+    if token["regex"]:
+        body = token["regex"][len("title:"):]
+        end = body.rindex("/")
+        return Title(body[1:end], regex=True, flags=body[end + 1:])
+    if token["quoted"]:
+        text = token["quoted"]
+        if text.startswith("title:"):
+            return Title(_unquote(text[len("title:"):]), regex=False)
+        return Term(_unquote(text))
+    word = token["word"]
+    if word.startswith("#"):
+        return Tag(word)
+    key, sep, value = word.partition(":")
+    if not sep:
+        return Term(word)
+    if key == "tag":
+        return Tag(value)
+    if key == "title":
+        if not value:
+            raise ValueError("title: 뒤에 값이 없습니다")
+        return Title(value, regex=False)
+    if key in ("created", "modified"):
+        return _date_range(key, value)
+    if key == "is" and value == "untagged":
+        return Untagged()
+    if key == "has" and value == "todo":
+        return Todo()
+    if key in ("is", "has"):
+        raise ValueError(f"알 수 없는 조건입니다: {word} (is:untagged, has:todo)")
+    # URL처럼 ":"가 들어간 일반 검색어
+    return Term(word)
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens: List[Dict[str, str]] = []
+        position = 0
+        text = text.rstrip()
+        while position < len(text):
+            match = _TOKEN_RE.match(text, position)
+            if match is None or match.end() == position:
+                raise ValueError(f"쿼리를 해석할 수 없습니다 ({position}번째 문자): {text[position:]!r}")
+            self.tokens.append(match.groupdict())
+            position = match.end()
+        self.index = 0
+
+    def peek(self) -> Optional[Dict[str, str]]:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def keyword(self, name: str) -> bool:
+        token = self.peek()
+        if token is not None and token["word"] == name and not token["neg"]:
+            self.index += 1
+            return True
+        return False
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise ValueError("쿼리가 비어 있습니다")
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise ValueError("닫는 괄호가 짝이 맞지 않습니다")
+        return node
+
+    def parse_or(self) -> Node:
+        children = [self.parse_and()]
+        while self.keyword("OR"):
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def parse_and(self) -> Node:
+        children = [self.parse_not()]
+        while True:
+            token = self.peek()
+            if token is None or token["rparen"] or (token["word"] == "OR" and not token["neg"]):
+                break
+            self.keyword("AND")
+            children.append(self.parse_not())
+        return children[0] if len(children) == 1 else And(children)
+
+    def parse_not(self) -> Node:
+        if self.keyword("NOT"):
+            return Not(self.parse_not())
+        token = self.peek()
+        if token is None:
+            raise ValueError("쿼리가 조건 없이 끝났습니다")
+        self.index += 1
+        if token["rparen"]:
+            raise ValueError("여는 괄호 없이 닫는 괄호가 있습니다")
+        if token["lparen"]:
+            node = self.parse_or()
+            closing = self.peek()
+            if closing is None or not closing["rparen"]:
+                raise ValueError("괄호가 닫히지 않았습니다")
+            self.index += 1
+        elif token["word"] in ("AND", "OR", "NOT"):
+            raise ValueError(f"{token['word']} 앞뒤에 조건이 필요합니다")
+        else:
+            node = _predicate(token)
+        return Not(node) if token["neg"] else node
+
+
+def parse(text: str) -> Node:
+    """쿼리 문자열을 조건 트리로 파싱 (문법 오류는 ValueError)"""
+    return _Parser(text).parse()
+
+
+# 실행 계획
+
+class Stats:
+    """
+    선택도 추정에 쓰는 통계
+
+    Args:
+        tag_counts: tagtree.tag_counts() 결과 (태그 -> {"notes", "subtree"})
+        total: 전체 노트 수 (없으면 최상위 태그 노트 수 합으로 추정)
+    """
+
+    def __init__(self, tag_counts: Optional[Dict[str, Dict[str, int]]] = None, total: Optional[int] = None):
+        self.tag_counts = tag_counts or {}
+        if total is None and self.tag_counts:
+            total = sum(c["subtree"] for name, c in self.tag_counts.items() if "/" not in name)
+        self.total = max(1, total or 0)
+
+    def tag(self, name: str) -> float:
+        counts = self.tag_counts.get(name)
+        if counts is None:
+            return _SELECTIVITY["tag"] if not self.tag_counts else 0.0
+        return min(1.0, counts["subtree"] / self.total)
+
+
+class Context:
+    """
+    조건 검사 중에 한 번만 계산하는 값 (할 일이 있는 노트 ID, 태그별 노트 ID 등)
+
+    Bear 검색 결과와 캐시의 노트 메타데이터에는 태그가 없으므로, 태그 조건은 노트에
+    "tags"가 있을 때(스냅샷)만 직접 검사하고 그 밖에는 태그마다 search_notes(tag=...)나
+    untagged_notes()를 한 번 호출해 얻은 ID 집합으로 검사합니다.
+    """
+
+    def __init__(self, tasks: Any = None):
+        self.tasks = tasks
+        self._todo: Optional[Set[str]] = None
+        self._tagged: Dict[str, Set[str]] = {}
+        self._untagged: Optional[Set[str]] = None
+
+    def has_tag(self, note: Dict[str, Any], name: str) -> bool:
+        """note에 name 태그 또는 하위 태그가 있는지"""
+        if "tags" in note:
+            prefix = name + "/"
+            return any(t == name or t.startswith(prefix) for t in note_tags(note))
+        return note.get("identifier") in self.tag_ids(name)
+
+    def is_untagged(self, note: Dict[str, Any]) -> bool:
+        """note에 태그가 없는지"""
+        if "tags" in note:
+            return not note_tags(note)
+        return note.get("identifier") in self.untagged_ids()
+
+    def tag_ids(self, name: str) -> Set[str]:
+        ids = self._tagged.get(name)
+        if ids is None:
+            notes = bear.search_notes(tag=name)
+            if notes is None:
+                raise RuntimeError("노트 목록을 가져올 수 없습니다 (xcall과 BEAR_API_TOKEN 확인)")
+            ids = self._tagged[name] = {n["identifier"] for n in notes if n.get("identifier")}
+        return ids
+
+    def untagged_ids(self) -> Set[str]:
+        if self._untagged is None:
+            notes = bear.untagged_notes()
+            if notes is None:
+                raise RuntimeError("노트 목록을 가져올 수 없습니다 (xcall과 BEAR_API_TOKEN 확인)")
+            self._untagged = {n["identifier"] for n in notes if n.get("identifier")}
+        return self._untagged
+
+    def todo_ids(self) -> Set[str]:
+        if self._todo is None:
+            if self.tasks is not None:
+                self.tasks.load()
+                self._todo = {
+                    identifier for identifier, entry in self.tasks.entries.items()
+                    if any(not task[2] for task in entry["data"] or ())
+                }
+            else:
+                notes = bear.todo_notes()
+                if notes is None:
+                    raise RuntimeError("할 일 목록을 가져올 수 없습니다 (xcall과 BEAR_API_TOKEN 확인)")
+                self._todo = {n["identifier"] for n in notes if n.get("identifier")}
+        return self._todo
+
+
+def _conjuncts(node: Node) -> List[Node]:
+    return list(node.children) if isinstance(node, And) else [node]
+
+
+def _rank(node: Node, stats: Stats) -> float:
+    # 버리는 비율이 크고 비용이 낮은 조건부터 검사 ((선택도 - 1) / 비용 오름차순)
+    return (node.selectivity(stats) - 1.0) / node.cost()
+
+
+def _apply(stream: Iterable[Dict[str, Any]], node: Node, ctx: Context) -> Iterator[Dict[str, Any]]:
+    return (note for note in stream if node.matches(note, ctx))
+
+
+class Plan:
+    """
+    쿼리 실행 계획
+
+    Attributes:
+        source: "search", "todo", "untagged" (Bear 호출 한 번), "cache", "snapshot"
+        pushed: 원본에서 처리하는 조건 목록
+        residual: 스트리밍으로 적용할 조건 목록 (검사 순서)
+        term: Bear에 보내는 검색어
+        estimate: 전체 조건의 선택도 추정값
+    """
+
+    def __init__(self, query: "Query", source: str, pushed: List[Node], residual: List[Node],
+                 term: str, estimate: float, snapshot_path: Optional[str], cache: Any, ctx: Context):
+        self.query = query
+        self.source = source
+        self.pushed = pushed
+        self.residual = residual
+        self.term = term
+        self.estimate = estimate
+        self.snapshot_path = snapshot_path
+        self.cache = cache
+        self.ctx = ctx
+
+    def explain(self) -> str:
+        """계획 설명 (사람이 읽는 형식)"""
+        lines = [f"query:    {self.query.text}"]
+        source = self.source
+        if self.source in ("search", "todo", "untagged"):
+            args = []
+            if self.term:
+                args.append(f"term={self.term!r}")
+            tag = next((n.name for n in self.pushed if isinstance(n, Tag)), None)
+            if tag:
+                args.append(f"tag={tag!r}")
+            source = f"bear {self.source}({', '.join(args)})"
+        lines.append(f"source:   {source}")
+        lines.append(f"pushed:   {' '.join(map(repr, self.pushed)) or '-'}")
+        lines.append(f"filters:  {' -> '.join(map(repr, self.residual)) or '-'}")
+        lines.append(f"estimate: {self.estimate:.3f} of notes")
+        return "\n".join(lines)
+
+    def _source_notes(self) -> Iterator[Dict[str, Any]]:
+        if self.source == "snapshot":
+            yield from self._snapshot_notes()
+            return
+        if self.source == "cache":
+            notes = self.cache.notes()
+        elif self.source == "todo":
+            notes = bear.todo_notes(search=self.term)
+        elif self.source == "untagged":
+            notes = bear.untagged_notes(search=self.term)
+        else:
+            tag = next((n.name for n in self.pushed if isinstance(n, Tag)), "")
+            notes = bear.search_notes(term=self.term, tag=tag)
+        if notes is None:
+            raise RuntimeError("노트 목록을 가져올 수 없습니다 (xcall과 BEAR_API_TOKEN 확인)")
+        for note in notes:
+            if note.get("identifier"):
+                yield note
+
+    def _snapshot_notes(self) -> Iterator[Dict[str, Any]]:
+        tag = next((n.name for n in self.pushed if isinstance(n, Tag)), None)
+        ranges = [n for n in self.pushed if isinstance(n, DateRange)]
+        afters = [n.after for n in ranges if n.after is not None]
+        befores = [n.before for n in ranges if n.before is not None]
+        after = max(afters) if afters else None
+        before = min(befores) if befores else None
+        with Snapshot(self.snapshot_path) as snap:
+            rows = snap.filter(
+                tag=tag, modified_after=after, modified_before=before,
+                untagged=any(isinstance(n, Untagged) for n in self.pushed),
+            )
+            for row in rows:
+                yield snap.record(row)
+
+    def run(self, limit: Optional[int] = None) -> "Results":
+        """조건에 맞는 노트를 하나씩 반환하는 이터레이터 (limit개를 찾으면 원본을 더 읽지 않음)"""
+        return Results(self, limit)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.run()
+
+
+class Results:
+    """
+    Plan.run()의 결과 이터레이터
+
+    "query" 스팬은 노트를 하나 꺼내는 동안에만 현재 스팬으로 설정되므로, 호출자가 결과를
+    처리하며 부르는 Bear 작업은 이 스팬의 자식이 되지 않습니다. 끝까지 읽거나 close()
+    (또는 with 블록 종료) 시 스팬을 끝내고 matched에 찾은 수를 기록하며, 열려 있던
+    스냅샷도 닫습니다. 중간에 멈출 때는 close()를 호출하세요.
+
+    Example:
+        with plan.run() as results:
+            for note in results:
+                ...
+                break
+    """
+
+    def __init__(self, plan: Plan, limit: Optional[int] = None):
+        self.limit = limit
+        self.count = 0
+        self._span = bear.start_span("query", source=plan.source, filters=len(plan.residual))
+        self._source = plan._source_notes()
+        stream: Iterable[Dict[str, Any]] = self._source
+        for node in plan.residual:
+            stream = _apply(stream, node, plan.ctx)
+        self._stream = iter(stream)
+
+    def __iter__(self) -> "Results":
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        if self._span.end is not None:
+            raise StopIteration
+        if self.limit is not None and self.count >= self.limit:
+            self.close()
+            raise StopIteration
+        try:
+            with bear.use_span(self._span):
+                note = next(self._stream)
+        except StopIteration:
+            self.close()
+            raise
+        except BaseException as e:
+            self.close(e)
+            raise
+        self.count += 1
+        return note
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        """원본(스냅샷 등)을 닫고 스팬 종료"""
+        if self._span.end is not None:
+            return
+        try:
+            with bear.use_span(self._span):
+                self._source.close()
+        finally:
+            self._span.attrs["matched"] = self.count
+            bear.finish_span(self._span, error)
+
+    def __enter__(self) -> "Results":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class Query:
+    """
+    파싱된 쿼리
+
+    Args:
+        text: 쿼리 문자열
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.root = parse(text)
+        conjuncts = _conjuncts(self.root)
+        self.terms = [node for node in conjuncts if isinstance(node, Term)]
+        if any(node.terms() for node in conjuncts if not isinstance(node, Term)):
+            raise ValueError("검색어는 NOT/OR 밖의 최상위 AND 조건에서만 쓸 수 있습니다")
+
+    def plan(
+        self,
+        source: str = "auto",
+        snapshot_path: Optional[str] = None,
+        cache: Any = None,
+        tasks: Any = None,
+        stats: Optional[Stats] = None
+    ) -> Plan:
+        """
+        실행 계획 만들기
+
+        Args:
+            source: "auto"(검색어가 있으면 Bear, 로컬 인덱스가 있으면 로컬, 아니면 Bear),
+                "bear", "cache", "snapshot"
+            snapshot_path: 스냅샷 파일 경로 (auto에서 주면 스냅샷 사용)
+            cache: WarmCache (auto에서 notes가 신선하면 사용, source="cache"면 필수 아님)
+            tasks: has:todo 검사에 쓸 TaskIndex (없으면 bear.todo_notes() 한 번 호출)
+            stats: 선택도 추정용 통계 (기본값: cache가 있으면 캐시된 태그 수)
+        """
+        if source not in ("auto", "bear", "cache", "snapshot"):
+            raise ValueError(f"source는 auto, bear, cache, snapshot 중 하나여야 합니다: {source}")
+        if self.terms and source in ("cache", "snapshot"):
+            raise ValueError(f"{source}로는 검색어(본문 검색)를 처리할 수 없습니다")
+        if source == "snapshot" and not snapshot_path:
+            raise ValueError("source='snapshot'에는 snapshot_path가 필요합니다")
+        if source == "cache" and cache is None:
+            try:
+                from .cache import get_cache
+            except ImportError:
+                from cache import get_cache
+            cache = get_cache()
+        if stats is None:
+            stats = Stats(cache.meta.get("tag_counts") if cache is not None else None)
+
+        if source == "auto":
+            if self.terms:
+                source = "bear"
+            elif snapshot_path:
+                source = "snapshot"
+            elif cache is not None and cache.fresh_notes() is not None:
+                source = "cache"
+            else:
+                source = "bear"
+
+        conjuncts = [node for node in _conjuncts(self.root) if not isinstance(node, Term)]
+        term = " ".join(t.text for t in self.terms)
+        pushed: List[Node] = []
+        plan_source = source
+        if source == "bear":
+            # Bear 호출 한 번으로 처리할 수 있는 가장 선택적인 조건 하나 (검색어와 함께 보냄)
+            anchors = [n for n in conjuncts if isinstance(n, (Tag, Todo, Untagged))]
+            if anchors:
+                anchor = min(anchors, key=lambda n: n.selectivity(stats))
+                pushed.append(anchor)
+                plan_source = {"tag": "search", "todo": "todo", "untagged": "untagged"}[anchor.kind]
+            else:
+                plan_source = "search"
+        elif source == "snapshot":
+            tags = [n for n in conjuncts if isinstance(n, Tag)]
+            if tags:
+                pushed.append(min(tags, key=lambda n: n.selectivity(stats)))
+            pushed.extend(n for n in conjuncts if isinstance(n, Untagged)
+                          or (isinstance(n, DateRange) and n.column == "modified"))
+        residual = [n for n in conjuncts if not any(n is p for p in pushed)]
+        residual.sort(key=lambda n: _rank(n, stats))
+        estimate = self.root.selectivity(stats)
+        return Plan(self, plan_source, pushed, residual, term, estimate,
+                    snapshot_path, cache, Context(tasks))
+
+
+def compile_query(text: str) -> Query:
+    """쿼리 문자열 파싱 (Query(text)와 같음)"""
+    return Query(text)
+
+
+def select(text: str, limit: Optional[int] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+    """
+    쿼리에 맞는 노트 목록 (search_notes 형식)
+
+    Args:
+        text: 쿼리 문자열
+        limit: 최대 개수
+        **kwargs: source, snapshot_path, cache, tasks, stats (Query.plan 참고)
+    """
+    with Query(text).plan(**kwargs).run(limit=limit) as results:
+        return list(results)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Query Bear notes with a small filter language")
+    parser.add_argument("query")
+    parser.add_argument("--source", choices=["auto", "bear", "cache", "snapshot"], default="auto")
+    parser.add_argument("--snapshot", help="snapshot file for --source snapshot")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--explain", action="store_true", help="print the plan instead of running it")
+    args = parser.parse_args(argv)
+
+    try:
+        plan = Query(args.query).plan(source=args.source, snapshot_path=args.snapshot)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    if args.explain:
+        print(plan.explain())
+        return 0
+    for note in plan.run(limit=args.limit):
+        print(f"{note.get('modificationDate', '')[:10]}  {note.get('title', '')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Bear 작업 스케줄러 (우선순위 레인)
+
+대량 작업(가져오기/내보내기) 중에도 에이전트의 대화형 호출(open_note, search_notes)이
+먼저 실행되도록 interactive / normal / bulk 세 레인으로 작업을 나눠 실행합니다.
+
+- 워커는 항상 우선순위가 높은 레인부터 작업을 가져갑니다.
+- 레인별 동시 실행 상한으로 bulk가 모든 워커를 차지하지 못하게 합니다.
+- 같은 레인 안에서는 마감 시각이 빠른 작업이 먼저, 마감이 지난 작업은 실행하지 않습니다.
+
+Example:
+    scheduler = get_scheduler()
+    future = scheduler.submit(search_notes, term="python", lane="interactive", deadline=5)
+    results = future.result()
+
+    scheduler.map(lambda n: create_note(**n), notes, lane="bulk")
+"""
+
+import time
+import heapq
+import itertools
+import threading
+import contextvars
+from concurrent.futures import Future
+from typing import Optional, Dict, List, Any, Callable, Iterable
+
+try:
+    from . import bear
+except ImportError:
+    import bear
+
+
+# 우선순위 순서 (앞쪽이 먼저 실행)
+LANES = ("interactive", "normal", "bulk")
+
+# 레인별 기본 동시 실행 상한
+DEFAULT_LANE_CAPS = {"interactive": 4, "normal": 3, "bulk": 2}
+
+# bear.py 함수별 기본 레인 (없으면 normal)
+LANE_FOR_OP = {
+    "open_note": "interactive",
+    "get_note_contents": "interactive",
+    "search_notes": "interactive",
+    "get_tags": "interactive",
+    "open_tag": "interactive",
+    "todo_notes": "interactive",
+    "today_notes": "interactive",
+    "untagged_notes": "interactive",
+    "locked_notes": "interactive",
+}
+
+
+class DeadlineExceeded(TimeoutError):
+    """마감 시각이 지나 실행되지 않은 작업"""
+
+
+class _Task:
+    __slots__ = ("future", "func", "args", "kwargs", "context", "deadline", "enqueued")
+
+    def __init__(self, func, args, kwargs, deadline):
+        self.future: Future = Future()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.context = contextvars.copy_context()
+        self.deadline = deadline
+        self.enqueued = time.monotonic()
+
+
+class Scheduler:
+    """
+    우선순위 레인 스케줄러
+
+    Args:
+        max_workers: 전체 워커 스레드 수
+        lane_caps: 레인별 최대 동시 실행 수
+    """
+
+    def __init__(self, max_workers: int = 4, lane_caps: Optional[Dict[str, int]] = None):
+        self.max_workers = max_workers
+        self.lane_caps = dict(DEFAULT_LANE_CAPS)
+        if lane_caps:
+            self.lane_caps.update(lane_caps)
+        self._queues: Dict[str, List[Any]] = {lane: [] for lane in LANES}
+        self._running = {lane: 0 for lane in LANES}
+        self._stats = {
+            lane: {"submitted": 0, "completed": 0, "failed": 0, "expired": 0,
+                   "max_depth": 0, "total_wait": 0.0}
+            for lane in LANES
+        }
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._shutdown = False
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"bear-scheduler-{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        lane: str = "normal",
+        deadline: Optional[float] = None,
+        **kwargs: Any
+    ) -> Future:
+        """
+        작업 제출
+
+        Args:
+            func: 실행할 함수
+            lane: interactive, normal, bulk 중 하나
+            deadline: 제출 시점부터 이 시간(초) 안에 시작하지 못하면 DeadlineExceeded
+
+        Returns:
+            결과를 담을 Future
+        """
+        if lane not in self._queues:
+            raise ValueError(f"알 수 없는 레인입니다: {lane} (사용 가능: {', '.join(LANES)})")
+        due = time.monotonic() + deadline if deadline is not None else None
+        task = _Task(func, args, kwargs, due)
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("스케줄러가 종료되었습니다")
+            # 마감이 있는 작업이 먼저, 같으면 제출 순서
+            key = (due if due is not None else float("inf"), next(self._seq))
+            heapq.heappush(self._queues[lane], (key, task))
+            stats = self._stats[lane]
+            stats["submitted"] += 1
+            stats["max_depth"] = max(stats["max_depth"], len(self._queues[lane]))
+            self._cond.notify()
+        return task.future
+
+    def call(
+        self,
+        op: str,
+        lane: Optional[str] = None,
+        deadline: Optional[float] = None,
+        **kwargs: Any
+    ) -> Future:
+        """bear.py 함수를 이름으로 제출 (레인 미지정 시 LANE_FOR_OP 사용)"""
+        return self.submit(
+            getattr(bear, op), lane=lane or LANE_FOR_OP.get(op, "normal"),
+            deadline=deadline, **kwargs
+        )
+
+    def map(
+        self,
+        func: Callable[[Any], Any],
+        items: Iterable[Any],
+        lane: str = "bulk",
+        deadline: Optional[float] = None
+    ) -> List[Any]:
+        """여러 항목을 한 레인에 제출하고 입력 순서대로 결과 반환"""
+        futures = [self.submit(func, item, lane=lane, deadline=deadline) for item in items]
+        return [f.result() for f in futures]
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """레인별 대기열 깊이, 실행 수, 완료/실패/만료 수, 평균 대기 시간"""
+        with self._cond:
+            result = {}
+            for lane in LANES:
+                stats = dict(self._stats[lane])
+                total_wait = stats.pop("total_wait")
+                started = stats["completed"] + stats["failed"]
+                stats["avg_wait"] = total_wait / started if started else 0.0
+                stats["depth"] = len(self._queues[lane])
+                stats["running"] = self._running[lane]
+                stats["cap"] = self.lane_caps[lane]
+                result[lane] = stats
+            return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        """새 작업을 받지 않고, 대기 중인 작업을 모두 실행한 뒤 워커 종료"""
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _next_task(self, expired: List[_Task]):
+        """
+        실행할 작업 선택 (호출자가 _cond를 잡고 있어야 함)
+
+        마감이 지난 작업은 expired에 담기만 하고, 실패 처리는 호출자가 잠금을 놓은 뒤에 합니다
+        (Future 콜백이 잠금을 잡은 채 실행되어 submit()에서 교착되지 않도록).
+        """
+        now = time.monotonic()
+        for lane in LANES:
+            queue = self._queues[lane]
+            while queue and self._running[lane] < self.lane_caps[lane]:
+                _, task = heapq.heappop(queue)
+                if task.deadline is not None and task.deadline < now:
+                    self._stats[lane]["expired"] += 1
+                    expired.append(task)
+                    continue
+                self._running[lane] += 1
+                self._stats[lane]["total_wait"] += now - task.enqueued
+                return lane, task
+        return None
+
+    def _worker(self) -> None:
+        while True:
+            expired: List[_Task] = []
+            stop = False
+            with self._cond:
+                picked = self._next_task(expired)
+                while picked is None and not expired:
+                    if self._shutdown and not any(self._queues.values()):
+                        stop = True
+                        break
+                    self._cond.wait()
+                    picked = self._next_task(expired)
+            for task in expired:
+                # 호출자가 이미 취소한 Future에는 결과를 설정할 수 없음
+                if task.future.set_running_or_notify_cancel():
+                    task.future.set_exception(DeadlineExceeded("마감 시각이 지나 실행하지 않았습니다"))
+            if stop:
+                return
+            if picked is None:
+                continue
+            lane, task = picked
+            outcome = None
+            if task.future.set_running_or_notify_cancel():
+                try:
+                    result = task.context.run(task.func, *task.args, **task.kwargs)
+                    task.future.set_result(result)
+                    outcome = "completed"
+                except BaseException as e:
+                    task.future.set_exception(e)
+                    outcome = "failed"
+            with self._cond:
+                self._running[lane] -= 1
+                if outcome:
+                    self._stats[lane][outcome] += 1
+                # 레인 상한 때문에 기다리던 워커 깨우기
+                self._cond.notify_all()
+
+
+_default: Optional[Scheduler] = None
+_default_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """프로세스 공용 스케줄러 반환 (처음 호출 시 생성)"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = Scheduler()
+        return _default
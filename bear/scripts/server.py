@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Bear 상주 서버 (줄 단위 JSON-RPC over stdio)
+
+도구 호출마다 새 인터프리터를 띄우는 대신 프로세스 하나를 계속 실행해
+import 비용을 한 번만 치르고 캐시, 인덱스, 워커 풀을 요청 간에 유지합니다.
+
+요청은 한 줄에 하나씩 JSON-RPC 2.0 형식으로 보내며, 응답 순서는 완료 순서입니다.
+여러 요청을 응답을 기다리지 않고 연달아 보낼 수 있습니다 (pipelining).
+
+Usage:
+    python3 bear.py serve --stdio
+
+    -> {"jsonrpc": "2.0", "id": 1, "method": "search_notes", "params": {"term": "python"}}
+    <- {"jsonrpc": "2.0", "id": 1, "result": [...]}
+
+확장 필드:
+    "lane": "interactive" | "normal" | "bulk" (기본값은 작업별 LANE_FOR_OP)
+    "deadline": 시작 마감 시간(초)
+
+내장 메서드:
+    rpc.methods    사용 가능한 메서드 목록
+    rpc.metrics    스케줄러 레인 지표
+    rpc.shutdown   대기 중인 요청을 마치고 종료
+"""
+
+import sys
+import json
+import inspect
+import threading
+from typing import Optional, Dict, Any, Callable, IO
+
+try:
+    from . import bear
+    from .scheduler import Scheduler, LANE_FOR_OP
+except ImportError:
+    import bear
+    from scheduler import Scheduler, LANE_FOR_OP
+
+
+# JSON-RPC 오류 코드
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+# "id"가 없는 요청(알림)의 표시 ("id": null은 응답해야 하므로 None과 구분)
+_NOTIFICATION = object()
+
+
+def methods() -> Dict[str, Callable[..., Any]]:
+    """서버가 노출하는 bear.py 함수 (이름 -> 함수)"""
+    exposed = dict(bear.OPERATIONS)
+    for name in ("call_bear", "has_xcall", "is_bear_running"):
+        exposed[name] = getattr(bear, name)
+    return exposed
+
+
+class StdioServer:
+    """
+    줄 단위 JSON-RPC 서버
+
+    Args:
+        reader: 요청을 읽을 스트림
+        writer: 응답을 쓸 스트림
+        workers: 스케줄러 워커 스레드 수
+    """
+
+    def __init__(self, reader: IO[str], writer: IO[str], workers: int = 4):
+        self.reader = reader
+        self.writer = writer
+        self.scheduler = Scheduler(max_workers=workers)
+        self.methods = methods()
+        self._write_lock = threading.Lock()
+        self._stopping = False
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        line = json.dumps(message, ensure_ascii=False, default=str)
+        with self._write_lock:
+            self.writer.write(line + "\n")
+            self.writer.flush()
+
+    def _reply(self, request_id: Any, result: Any = None, error: Optional[Dict[str, Any]] = None) -> None:
+        if request_id is _NOTIFICATION:
+            # 알림(notification)에는 응답하지 않음
+            return
+        message: Dict[str, Any] = {"jsonrpc": "2.0", "id": request_id}
+        if error is not None:
+            message["error"] = error
+        else:
+            message["result"] = result
+        self._send(message)
+
+    def _builtin(self, method: str) -> Any:
+        if method == "rpc.methods":
+            return {
+                name: str(inspect.signature(func))
+                for name, func in sorted(self.methods.items())
+            }
+        if method == "rpc.metrics":
+            return self.scheduler.metrics()
+        if method == "rpc.shutdown":
+            self._stopping = True
+            return True
+        raise KeyError(method)
+
+    def handle(self, line: str) -> None:
+        """요청 한 줄 처리 (bear 작업은 스케줄러에서 비동기 실행)"""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            self._send({"jsonrpc": "2.0", "id": None,
+                        "error": {"code": PARSE_ERROR, "message": str(e)}})
+            return
+
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            self._send({"jsonrpc": "2.0", "id": None,
+                        "error": {"code": INVALID_REQUEST, "message": "Invalid Request"}})
+            return
+
+        request_id = request.get("id", _NOTIFICATION)
+        method = request["method"]
+        params = request.get("params", {})
+
+        if method.startswith("rpc."):
+            try:
+                self._reply(request_id, self._builtin(method))
+            except KeyError:
+                self._reply(request_id, error={"code": METHOD_NOT_FOUND, "message": method})
+            return
+
+        func = self.methods.get(method)
+        if func is None:
+            self._reply(request_id, error={"code": METHOD_NOT_FOUND, "message": method})
+            return
+        if isinstance(params, list):
+            args, kwargs = params, {}
+        elif isinstance(params, dict):
+            args, kwargs = [], params
+        else:
+            self._reply(request_id, error={"code": INVALID_PARAMS, "message": "params must be array or object"})
+            return
+        try:
+            inspect.signature(func).bind(*args, **kwargs)
+        except TypeError as e:
+            self._reply(request_id, error={"code": INVALID_PARAMS, "message": str(e)})
+            return
+
+        lane, deadline = request.get("lane"), request.get("deadline")
+        if lane is not None and not isinstance(lane, str):
+            self._reply(request_id, error={"code": INVALID_PARAMS, "message": "lane must be a string"})
+            return
+        if deadline is not None and (isinstance(deadline, bool) or not isinstance(deadline, (int, float))):
+            self._reply(request_id, error={"code": INVALID_PARAMS, "message": "deadline must be a number"})
+            return
+
+        try:
+            future = self.scheduler.submit(
+                func, *args,
+                lane=lane or LANE_FOR_OP.get(method, "normal"),
+                deadline=deadline,
+                **kwargs
+            )
+        except (ValueError, TypeError) as e:
+            # 알 수 없는 레인 등 요청 인자 오류
+            self._reply(request_id, error={"code": INVALID_PARAMS, "message": str(e)})
+            return
+
+        def done(f):
+            error = f.exception()
+            if error is None:
+                self._reply(request_id, f.result())
+            else:
+                self._reply(request_id, error={
+                    "code": SERVER_ERROR,
+                    "message": str(error),
+                    "data": {"type": type(error).__name__},
+                })
+
+        future.add_done_callback(done)
+
+    def serve(self) -> int:
+        """입력이 끝나거나 rpc.shutdown을 받을 때까지 요청 처리"""
+        for line in self.reader:
+            if line.strip():
+                try:
+                    self.handle(line)
+                except Exception as e:
+                    # 요청 하나의 예상하지 못한 오류로 서버가 멈추지 않도록 함
+                    self._send({"jsonrpc": "2.0", "id": None, "error": {
+                        "code": SERVER_ERROR, "message": str(e), "data": {"type": type(e).__name__},
+                    }})
+            if self._stopping:
+                break
+        # 이미 받은 요청은 모두 끝내고 종료
+        self.scheduler.shutdown(wait=True)
+        return 0
+
+
+def serve_stdio(workers: int = 4) -> int:
+    """표준 입출력으로 서버 실행"""
+    return StdioServer(sys.stdin, sys.stdout, workers=workers).serve()
+
+
+if __name__ == "__main__":
+    sys.exit(serve_stdio())
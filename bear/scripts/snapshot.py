@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+노트 메타데이터 열 기반(columnar) 스냅샷
+
+수십만 개 노트 메타데이터를 dict 목록으로 불러오는 대신, 열 배열과 문자열 테이블로 된
+바이너리 파일을 mmap으로 열어 노트별 객체를 만들지 않고 스캔/필터/top-k를 수행합니다.
+
+파일 구조 (리틀 엔디언, 섹션은 8바이트 정렬):
+    header        magic, version, 노트 수, 문자열 수, 태그 참조 수, 섹션 오프셋
+    str_offsets   uint64[문자열 수 + 1]  문자열 데이터 내 시작 위치
+    str_data      UTF-8 바이트 (제목, ID, 태그가 한 번씩만 저장됨)
+    title         uint32[노트 수]        문자열 ID
+    identifier    uint32[노트 수]        문자열 ID
+    created       float64[노트 수]       epoch 초
+    modified      float64[노트 수]       epoch 초
+    tag_start     uint32[노트 수 + 1]    tag_refs 내 노트별 시작 위치
+    tag_refs      uint32[태그 참조 수]   문자열 ID
+    tag_ids       uint32[태그 종류 수]   태그로 쓰인 문자열 ID
+
+Example:
+    snapshot_from_search("notes.snap")      # 태그는 태그별 검색으로 채움
+    with Snapshot("notes.snap") as snap:
+        rows = snap.filter(tag="work", modified_after=time.time() - 7 * 86400)
+        for row in snap.top_k(10, rows):
+            print(snap.title(row))
+"""
+
+import os
+import sys
+import json
+import mmap
+import heapq
+import struct
+from array import array
+from datetime import datetime, timezone
+from typing import Optional, Dict, List, Any, Iterable, Iterator
+
+try:
+    from . import bear
+except ImportError:
+    import bear
+
+
+MAGIC = b"BEARSNAP"
+VERSION = 1
+_SECTIONS = (
+    "str_offsets", "str_data", "title", "identifier",
+    "created", "modified", "tag_start", "tag_refs", "tag_ids",
+)
+# magic, version, count, string_count, tag_ref_count, tag_id_count, 섹션 오프셋
+_HEADER = struct.Struct("<8sIIIII" + "Q" * len(_SECTIONS))
+
+
+def parse_date(value: Optional[str]) -> float:
+    """Bear 날짜 문자열(ISO 8601)을 epoch 초로 변환 (없으면 0)"""
+    if not value:
+        return 0.0
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def note_tags(note: Dict[str, Any]) -> List[str]:
+    """노트의 태그 목록 (search_notes 결과의 문자열/목록 형식 모두 처리)"""
+    tags = note.get("tags") or []
+    if isinstance(tags, str):
+        # Bear가 태그 목록을 JSON 문자열로 돌려주는 경우
+        try:
+            tags = json.loads(tags)
+        except ValueError:
+            tags = [t.strip() for t in tags.split(",") if t.strip()]
+    return list(tags)
+
+
+def write_snapshot(path: str, notes: Iterable[Dict[str, Any]]) -> int:
+    """
+    노트 메타데이터(search_notes 결과 형식)로 스냅샷 파일 생성
+
+    임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 항상 완전한 파일을 봅니다.
+    tag/untagged 필터는 notes의 "tags"를 쓰므로, Bear 검색 결과는
+    snapshot_from_search()처럼 태그를 채운 뒤 넘겨야 합니다.
+
+    Returns:
+        기록한 노트 수
+    """
+    if sys.byteorder != "little":
+        raise RuntimeError("스냅샷 형식은 리틀 엔디언 시스템만 지원합니다")
+
+    strings: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    title, identifier = array("I"), array("I")
+    created, modified = array("d"), array("d")
+    tag_start, tag_refs = array("I", [0]), array("I")
+    tag_ids: Dict[int, None] = {}
+    for note in notes:
+        title.append(intern(note.get("title") or ""))
+        identifier.append(intern(note.get("identifier") or ""))
+        created.append(parse_date(note.get("creationDate")))
+        modified.append(parse_date(note.get("modificationDate")))
+        for tag in note_tags(note):
+            ref = intern(tag)
+            tag_refs.append(ref)
+            tag_ids[ref] = None
+        tag_start.append(len(tag_refs))
+
+    str_offsets = array("Q", [0])
+    chunks = []
+    for value in strings:
+        data = value.encode("utf-8")
+        chunks.append(data)
+        str_offsets.append(str_offsets[-1] + len(data))
+    sections = {
+        "str_offsets": str_offsets.tobytes(),
+        "str_data": b"".join(chunks),
+        "title": title.tobytes(),
+        "identifier": identifier.tobytes(),
+        "created": created.tobytes(),
+        "modified": modified.tobytes(),
+        "tag_start": tag_start.tobytes(),
+        "tag_refs": tag_refs.tobytes(),
+        "tag_ids": array("I", sorted(tag_ids)).tobytes(),
+    }
+
+    offsets = []
+    position = _HEADER.size
+    for name in _SECTIONS:
+        position += -position % 8
+        offsets.append(position)
+        position += len(sections[name])
+
+    tmp = f"{path}.tmp{os.getpid()}"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(
+            MAGIC, VERSION, len(title), len(strings), len(tag_refs), len(tag_ids), *offsets
+        ))
+        for name, offset in zip(_SECTIONS, offsets):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(sections[name])
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return len(title)
+
+
+class Snapshot:
+    """
+    mmap으로 연 스냅샷 (읽기 전용)
+
+    열은 mmap 버퍼 위의 memoryview이므로 파일을 메모리로 복사하지 않습니다.
+    행(row)은 0부터 시작하는 노트 번호입니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = _HEADER.unpack_from(self._mm, 0)
+        magic, version, count, string_count, ref_count, tag_id_count = header[:6]
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"스냅샷 파일이 아니거나 버전이 다릅니다: {path}")
+        offsets = dict(zip(_SECTIONS, header[6:]))
+        view = memoryview(self._mm)
+
+        def column(name: str, fmt: str, length: int) -> memoryview:
+            start = offsets[name]
+            return view[start:start + length * struct.calcsize(fmt)].cast(fmt)
+
+        self.count = count
+        self._str_offsets = column("str_offsets", "Q", string_count + 1)
+        data_start = offsets["str_data"]
+        self._str_data = view[data_start:data_start + self._str_offsets[string_count]]
+        self.title_ids = column("title", "I", count)
+        self.identifier_ids = column("identifier", "I", count)
+        self.created = column("created", "d", count)
+        self.modified = column("modified", "d", count)
+        self._tag_start = column("tag_start", "I", count + 1)
+        self._tag_refs = column("tag_refs", "I", ref_count)
+        self._tag_ids = column("tag_ids", "I", tag_id_count)
+        self._tag_lookup: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """mmap과 파일 닫기 (열 memoryview도 더 이상 쓸 수 없음)"""
+        for name in ("_str_offsets", "_str_data", "title_ids", "identifier_ids", "created",
+                     "modified", "_tag_start", "_tag_refs", "_tag_ids"):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        if getattr(self, "_mm", None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    # 값 접근
+
+    def string(self, index: int) -> str:
+        """문자열 테이블의 index번째 문자열"""
+        start, end = self._str_offsets[index], self._str_offsets[index + 1]
+        return bytes(self._str_data[start:end]).decode("utf-8")
+
+    def title(self, row: int) -> str:
+        return self.string(self.title_ids[row])
+
+    def identifier(self, row: int) -> str:
+        return self.string(self.identifier_ids[row])
+
+    def tag_ids_of(self, row: int) -> List[int]:
+        """row의 태그 문자열 ID 목록 (복사본이므로 close() 뒤에도 쓸 수 있음)"""
+        # mmap 위의 memoryview를 내보내면 호출자가 들고 있는 동안 close()가 BufferError로 실패함
+        return self._tag_refs[self._tag_start[row]:self._tag_start[row + 1]].tolist()
+
+    def tags(self, row: int) -> List[str]:
+        return [self.string(i) for i in self.tag_ids_of(row)]
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """row를 search_notes 결과와 같은 형식의 dict로 변환"""
+        return {
+            "title": self.title(row),
+            "identifier": self.identifier(row),
+            "tags": self.tags(row),
+            "creationDate": _iso(self.created[row]),
+            "modificationDate": _iso(self.modified[row]),
+        }
+
+    def all_tags(self) -> Dict[str, int]:
+        """태그 이름 -> 문자열 ID (태그 종류 수만큼만 디코딩)"""
+        if self._tag_lookup is None:
+            self._tag_lookup = {self.string(i): i for i in self._tag_ids}
+        return self._tag_lookup
+
+    # 스캔
+
+    def filter(
+        self,
+        tag: Optional[str] = None,
+        modified_after: Optional[float] = None,
+        modified_before: Optional[float] = None,
+        title_contains: Optional[str] = None,
+        untagged: bool = False,
+        rows: Optional[Iterable[int]] = None
+    ) -> Iterator[int]:
+        """
+        조건에 맞는 row 순회
+
+        Args:
+            tag: 이 태그 또는 하위 태그가 있는 노트
+            modified_after / modified_before: 수정 시각 범위 (epoch 초)
+            title_contains: 제목에 포함된 문자열 (대소문자 무시)
+            untagged: 태그 없는 노트만
+            rows: 이 row들 안에서만 검색 (기본값: 전체)
+        """
+        # 싼 열 비교를 먼저, 문자열 디코딩이 필요한 제목 검사를 마지막에 적용
+        candidates: Iterable[int] = range(self.count) if rows is None else rows
+        start, refs, modified = self._tag_start, self._tag_refs, self.modified
+        if untagged:
+            candidates = (r for r in candidates if start[r] == start[r + 1])
+        if modified_after is not None:
+            candidates = (r for r in candidates if modified[r] >= modified_after)
+        if modified_before is not None:
+            candidates = (r for r in candidates if modified[r] < modified_before)
+        if tag is not None:
+            wanted = {
+                i for name, i in self.all_tags().items()
+                if name == tag or name.startswith(tag + "/")
+            }
+            candidates = (
+                r for r in candidates
+                if not wanted.isdisjoint(refs[start[r]:start[r + 1]])
+            )
+        if title_contains:
+            needle = title_contains.lower()
+            candidates = (r for r in candidates if needle in self.title(r).lower())
+        return iter(candidates)
+
+    def top_k(self, k: int, rows: Optional[Iterable[int]] = None, by: str = "modified") -> List[int]:
+        """by(created 또는 modified) 기준 최신 k개 row"""
+        column = self.created if by == "created" else self.modified
+        if rows is None:
+            # 열을 직접 순회하는 편이 row마다 인덱싱하는 것보다 빠름
+            return [r for _, r in heapq.nlargest(k, zip(column, range(self.count)))]
+        return heapq.nlargest(k, rows, key=column.__getitem__)
+
+
+def _iso(timestamp: float) -> str:
+    if not timestamp:
+        return ""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def snapshot_from_search(path: str, workers: int = 4) -> int:
+    """
+    search_notes(term="") 결과로 스냅샷 생성
+
+    검색 결과에는 태그가 없으므로 get_tags()와 태그별 search_notes(tag=...)로
+    태그 열을 채웁니다 (tagtree.attach_tags).
+    """
+    try:
+        from .tagtree import attach_tags
+    except ImportError:
+        from tagtree import attach_tags
+    notes = bear.search_notes(term="")
+    if notes is None:
+        raise RuntimeError("노트 목록을 가져올 수 없습니다 (xcall과 BEAR_API_TOKEN 확인)")
+    if notes and not any("tags" in note for note in notes):
+        notes = attach_tags(notes, workers=workers)
+    return write_snapshot(path, notes)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+SQLite 기반 로컬 키-값 저장소
+
+캐시, 인덱스 등 여러 모듈이 공유하는 작은 영속 저장소입니다.
+WAL 모드와 busy timeout을 사용하므로 여러 프로세스가 동시에 읽고 써도 안전합니다.
+
+Example:
+    store = KVStore(default_path("cache.sqlite"), "tags")
+    store.put("all", [{"name": "work"}])
+    value, updated = store.get_with_time("all")
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Optional, Dict, List, Any, Iterable, Iterator, Tuple
+
+
+# 로컬 저장소 기본 디렉터리
+DEFAULT_DIR = os.environ.get(
+    "BEAR_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "bear-skill")
+)
+
+
+def default_path(filename: str) -> str:
+    """기본 디렉터리 안의 파일 경로"""
+    return os.path.join(DEFAULT_DIR, filename)
+
+
+class KVStore:
+    """
+    테이블 하나를 키-값 저장소로 쓰는 SQLite 래퍼
+
+    값은 JSON으로 직렬화되며 키마다 마지막 갱신 시각이 함께 저장됩니다.
+    연결은 스레드별로 만들어 재사용합니다.
+
+    Args:
+        path: SQLite 파일 경로
+        table: 테이블 이름
+    """
+
+    def __init__(self, path: str, table: str):
+        if not table.isidentifier():
+            raise ValueError(f"잘못된 테이블 이름입니다: {table}")
+        self.path = path
+        self.table = table
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn().execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """값 조회 (없으면 default)"""
+        found = self.get_with_time(key)
+        return default if found is None else found[0]
+
+    def get_with_time(self, key: str) -> Optional[Tuple[Any, float]]:
+        """(값, 갱신 시각) 조회 (없으면 None)"""
+        row = self._conn().execute(
+            f"SELECT value, updated FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def updated(self, key: str) -> Optional[float]:
+        """값은 읽지 않고 마지막 갱신 시각만 조회 (없으면 None)"""
+        row = self._conn().execute(
+            f"SELECT updated FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """여러 키를 한 번에 조회 (있는 키만 반환)"""
+        keys = list(keys)
+        result: Dict[str, Any] = {}
+        conn = self._conn()
+        for i in range(0, len(keys), 500):
+            part = keys[i:i + 500]
+            rows = conn.execute(
+                f"SELECT key, value FROM {self.table} WHERE key IN ({','.join('?' * len(part))})",
+                part
+            )
+            result.update((k, json.loads(v)) for k, v in rows)
+        return result
+
+    def put(self, key: str, value: Any) -> None:
+        """값 저장"""
+        self.put_many([(key, value)])
+
+    def put_many(self, items: Iterable[Tuple[str, Any]], replace_all: bool = False) -> None:
+        """
+        여러 값을 한 트랜잭션으로 저장
+
+        Args:
+            items: (키, 값) 목록
+            replace_all: True면 기존 키를 모두 지우고 items로 교체
+        """
+        now = time.time()
+        rows = [(k, json.dumps(v, ensure_ascii=False), now) for k, v in items]
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if replace_all:
+                conn.execute(f"DELETE FROM {self.table}")
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, updated) VALUES (?, ?, ?)", rows
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, key: str) -> None:
+        """키 삭제"""
+        self._conn().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def delete_if(self, key: str, value: Any) -> bool:
+        """키의 값이 value일 때만 삭제 (그 사이 다른 쓰기가 있었으면 유지), 삭제 여부 반환"""
+        cursor = self._conn().execute(
+            f"DELETE FROM {self.table} WHERE key = ? AND value = ?",
+            (key, json.dumps(value, ensure_ascii=False))
+        )
+        return cursor.rowcount > 0
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """여러 키를 한 트랜잭션으로 삭제"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", ((k,) for k in keys))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def claim(self, key: str, ttl: float) -> bool:
+        """
+        프로세스 간 임대(lease) 획득
+
+        key가 없거나 ttl보다 오래되었으면 현재 시각으로 기록하고 True를 반환합니다.
+        여러 프로세스가 동시에 같은 작업(예: 백그라운드 갱신)을 하지 않도록 할 때 씁니다.
+        """
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                f"SELECT updated FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[0] < ttl:
+                conn.execute("COMMIT")
+                return False
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, updated) VALUES (?, ?, ?)",
+                (key, json.dumps(os.getpid()), now)
+            )
+            conn.execute("COMMIT")
+            return True
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def put_if_absent(self, key: str, value: Any, ttl: float) -> Optional[Tuple[Any, float]]:
+        """
+        key가 없거나 ttl보다 오래되었을 때만 값 저장 (한 트랜잭션으로 확인 후 기록)
+
+        Returns:
+            저장했으면 None, 이미 있으면 기존 (값, 갱신 시각)
+        """
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                f"SELECT value, updated FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] < ttl:
+                conn.execute("COMMIT")
+                return json.loads(row[0]), row[1]
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, updated) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now)
+            )
+            conn.execute("COMMIT")
+            return None
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def replace(self, key: str, old: Any, new: Any) -> bool:
+        """키의 값이 old일 때만 new로 교체 (compare-and-swap), 교체 여부 반환"""
+        cursor = self._conn().execute(
+            f"UPDATE {self.table} SET value = ?, updated = ? WHERE key = ? AND value = ?",
+            (json.dumps(new, ensure_ascii=False), time.time(), key,
+             json.dumps(old, ensure_ascii=False))
+        )
+        return cursor.rowcount > 0
+
+    def add_index(self, field: str) -> None:
+        """값(JSON 객체)의 field에 인덱스 생성 (keys_by 조회용, 이미 있으면 무시)"""
+        if not field.isidentifier():
+            raise ValueError(f"잘못된 필드 이름입니다: {field}")
+        self._conn().execute(
+            f"CREATE INDEX IF NOT EXISTS {self.table}_{field} "
+            f"ON {self.table} (json_extract(value, '$.{field}'))"
+        )
+
+    def keys_by(self, field: str, value: Any) -> List[str]:
+        """값의 field가 value인 키 목록 (add_index로 만든 인덱스 사용)"""
+        if not field.isidentifier():
+            raise ValueError(f"잘못된 필드 이름입니다: {field}")
+        rows = self._conn().execute(
+            f"SELECT key FROM {self.table} WHERE json_extract(value, '$.{field}') = ?", (value,)
+        )
+        return [row[0] for row in rows]
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """모든 (키, 값) 순회"""
+        for k, v in self._conn().execute(f"SELECT key, value FROM {self.table}"):
+            yield k, json.loads(v)
+
+    def __len__(self) -> int:
+        return self._conn().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def clear(self) -> None:
+        """모든 키 삭제"""
+        self._conn().execute(f"DELETE FROM {self.table}")
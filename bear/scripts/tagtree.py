@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+Bear 태그 계층 트리 (trie)
+
+get_tags() 결과를 "/"로 나눈 세그먼트 단위 트리로 보관합니다.
+태그 조회와 접두어 검색은 태그 깊이에만 비례하고, 하위 트리 순회와
+하위 트리별 노트 수 집계를 지원합니다.
+
+install()을 호출하면 bear.py로 실행한 rename_tag / delete_tag 결과가
+트리에 바로 반영되므로 태그 목록을 다시 가져올 필요가 없습니다.
+
+Example:
+    tree = TagTree.from_bear()
+    tree.install()
+    for name in tree.walk("project"):
+        print(name, tree.note_count(name))
+    tree.complete("proj")   # ["project", "projects-old"]
+"""
+
+import re
+import fnmatch
+import threading
+from typing import Optional, Dict, List, Any, Iterable, Iterator, Set, Callable
+
+try:
+    from . import bear
+    from .snapshot import note_tags
+except ImportError:
+    import bear
+    from snapshot import note_tags
+
+
+def split_tag(name: str) -> List[str]:
+    """태그 이름을 세그먼트 목록으로 분리 (앞뒤 "/"와 "#" 무시)"""
+    return [part for part in name.strip().lstrip("#").split("/") if part]
+
+
+def is_glob(pattern: str) -> bool:
+    """패턴에 와일드카드(*, ?, [)가 있는지"""
+    return any(c in pattern for c in "*?[")
+
+
+def glob_base(pattern: str) -> str:
+    """와일드카드가 처음 나오는 세그먼트 앞까지의 고정 경로 ("project/*/x" -> "project")"""
+    base = []
+    for part in split_tag(pattern):
+        if is_glob(part):
+            break
+        base.append(part)
+    return "/".join(base)
+
+
+class TagNode:
+    """트리 노드 하나 (태그 경로의 한 세그먼트)"""
+
+    __slots__ = ("segment", "path", "parent", "children", "is_tag", "notes", "_total")
+
+    def __init__(self, segment: str, path: str, parent: Optional["TagNode"]):
+        self.segment = segment
+        self.path = path
+        self.parent = parent
+        self.children: Dict[str, "TagNode"] = {}
+        # get_tags()에 실제로 있는 태그인지 (중간 경로만 있는 노드는 False)
+        self.is_tag = False
+        # 이 태그가 직접 붙은 노트 ID
+        self.notes: Set[str] = set()
+        # 하위 트리 노트 수 캐시 (None이면 다시 계산)
+        self._total: Optional[int] = None
+
+
+class TagTree:
+    """
+    "/"로 구분된 중첩 태그의 trie
+
+    노트 수는 build()나 add_note()로 노트 메타데이터를 넣었을 때만 집계됩니다.
+    """
+
+    def __init__(self):
+        self.root = TagNode("", "", None)
+        self._lock = threading.RLock()
+        self._size = 0
+        # install()로 등록된 훅 수 (0이 아니면 bear.py 작업이 자동 반영됨)
+        self.hooks = 0
+
+    @classmethod
+    def build(
+        cls,
+        tags: Iterable[Dict[str, Any]],
+        notes: Optional[Iterable[Dict[str, Any]]] = None
+    ) -> "TagTree":
+        """
+        태그 목록(get_tags 형식)과 노트 목록(search_notes 형식)으로 트리 생성
+
+        Args:
+            tags: {name} 목록
+            notes: {identifier, tags} 목록 (선택사항, 노트 수 집계용)
+        """
+        tree = cls()
+        nodes: Dict[str, TagNode] = {}
+        for tag in tags:
+            nodes[tag["name"]] = tree.add(tag["name"])
+        # 새 트리이므로 노트 수 캐시 무효화 없이 직접 채움
+        for note in notes or ():
+            identifier = note.get("identifier")
+            if not identifier:
+                continue
+            for tag in note_tags(note):
+                node = nodes.get(tag)
+                if node is None:
+                    node = nodes[tag] = tree.add(tag)
+                node.notes.add(identifier)
+        return tree
+
+    @classmethod
+    def from_bear(cls, counts: bool = True, cache: Any = None) -> "TagTree":
+        """
+        Bear(또는 cache.WarmCache)에서 태그와 노트 메타데이터를 가져와 트리 생성
+
+        Args:
+            counts: True면 노트 목록도 가져와 노트 수 집계 (검색 결과에 태그가 없으면
+                태그별 search_notes(tag=...)로 채움)
+            cache: tags()/notes()를 제공하는 캐시 (없으면 Bear에 직접 요청)
+        """
+        tags = cache.tags() if cache is not None else bear.get_tags()
+        if tags is None:
+            raise RuntimeError("태그 목록을 가져올 수 없습니다 (xcall과 BEAR_API_TOKEN 확인)")
+        notes = None
+        if counts:
+            notes = cache.notes() if cache is not None else bear.search_notes(term="")
+            if notes and not any("tags" in note for note in notes):
+                notes = attach_tags(notes, tags)
+        return cls.build(tags, notes)
+
+    # 조회
+
+    def find(self, name: str) -> Optional[TagNode]:
+        """태그 경로의 노드 (없으면 None), 태그 깊이에 비례"""
+        node = self.root
+        for part in split_tag(name):
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node if node is not self.root else None
+
+    def __contains__(self, name: str) -> bool:
+        node = self.find(name)
+        return node is not None and node.is_tag
+
+    def __len__(self) -> int:
+        return self._size
+
+    def children(self, name: str = "") -> List[str]:
+        """바로 아래 하위 태그 이름 목록 (name이 비면 최상위 태그)"""
+        node = self.find(name) if name else self.root
+        if node is None:
+            return []
+        return sorted(child.path for child in node.children.values())
+
+    def walk(self, name: str = "", include_self: bool = True) -> Iterator[str]:
+        """
+        하위 트리의 태그를 이름순(전위 순회)으로 순회
+
+        Args:
+            name: 시작 태그 (비면 전체)
+            include_self: 시작 태그 자신도 포함할지
+        """
+        start = self.find(name) if name else self.root
+        if start is None:
+            return
+        for node in self._nodes(start):
+            if node.is_tag and (include_self or node is not start):
+                yield node.path
+
+    def _nodes(self, start: TagNode) -> Iterator[TagNode]:
+        # 깊은 트리에서도 재귀 한도에 걸리지 않도록 스택으로 순회
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.children[k] for k in sorted(node.children, reverse=True))
+
+    def complete(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """
+        prefix로 시작하는 태그 이름 (마지막 세그먼트는 부분 일치)
+
+        예: "project/al" -> ["project/alpha", "project/alpha/phase1", ...]
+        """
+        if not prefix.strip("/#"):
+            names = self.walk()
+        else:
+            parts = split_tag(prefix)
+            head, last = parts[:-1], parts[-1]
+            if prefix.endswith("/"):
+                head, last = parts, ""
+            node = self.find("/".join(head)) if head else self.root
+            if node is None:
+                return []
+            names = (
+                name
+                for key in sorted(node.children) if key.startswith(last)
+                for name in self.walk(node.children[key].path)
+            )
+        result = []
+        for name in names:
+            result.append(name)
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+    def match(self, pattern: str) -> List[str]:
+        """
+        패턴에 맞는 태그 중 가장 위쪽 태그만 반환 (하위 태그는 함께 처리되므로 생략)
+
+        와일드카드가 없으면 그 태그 하나, 있으면 전체 경로에 fnmatch를 적용합니다
+        ("*"는 "/"도 포함). 고정 경로 아래 하위 트리만 탐색합니다.
+        """
+        if not is_glob(pattern):
+            return ["/".join(split_tag(pattern))] if pattern in self else []
+        base = glob_base(pattern)
+        start = self.find(base) if base else self.root
+        if start is None:
+            return []
+        regex = re.compile(fnmatch.translate("/".join(split_tag(pattern))))
+        result = []
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            if node.is_tag and regex.match(node.path):
+                result.append(node.path)
+                continue
+            stack.extend(node.children[k] for k in sorted(node.children, reverse=True))
+        return result
+
+    def note_count(self, name: str, subtree: bool = True) -> int:
+        """
+        태그의 노트 수
+
+        Args:
+            subtree: True면 하위 태그 노트까지 중복 없이 셈
+        """
+        node = self.find(name)
+        if node is None:
+            return 0
+        if not subtree:
+            return len(node.notes)
+        return self._subtree_total(node)
+
+    def _subtree_total(self, node: TagNode) -> int:
+        if node._total is None:
+            if not node.children:
+                node._total = len(node.notes)
+            else:
+                seen: Set[str] = set()
+                for child in self._nodes(node):
+                    seen.update(child.notes)
+                node._total = len(seen)
+        return node._total
+
+    def stats(self, name: str = "") -> Dict[str, Any]:
+        """하위 트리 통계 (태그 수, 최대 깊이, 노트 수)"""
+        start = self.find(name) if name else self.root
+        if start is None:
+            return {"tags": 0, "depth": 0, "notes": 0}
+        base = len(split_tag(start.path))
+        tags = depth = 0
+        for node in self._nodes(start):
+            if node.is_tag:
+                tags += 1
+                depth = max(depth, len(split_tag(node.path)) - base)
+        return {"tags": tags, "depth": depth, "notes": self._subtree_total(start)}
+
+    # 변경
+
+    def add(self, name: str) -> TagNode:
+        """태그 추가 (중간 경로도 태그로 추가, Bear와 같은 동작)"""
+        parts = split_tag(name)
+        if not parts:
+            raise ValueError(f"잘못된 태그 이름입니다: {name!r}")
+        with self._lock:
+            node = self.root
+            for part in parts:
+                child = node.children.get(part)
+                if child is None:
+                    path = part if node is self.root else f"{node.path}/{part}"
+                    child = node.children[part] = TagNode(part, path, node)
+                node = child
+                if not node.is_tag:
+                    node.is_tag = True
+                    self._size += 1
+            return node
+
+    def add_note(self, identifier: str, tags: Iterable[str]) -> None:
+        """노트의 태그를 트리에 반영 (없는 태그는 추가)"""
+        with self._lock:
+            for tag in tags:
+                node = self.add(tag)
+                if identifier not in node.notes:
+                    node.notes.add(identifier)
+                    self._invalidate(node)
+
+    def remove_note(self, identifier: str, tags: Optional[Iterable[str]] = None) -> None:
+        """노트를 주어진 태그(없으면 모든 태그)에서 제거"""
+        with self._lock:
+            if tags is None:
+                nodes: Iterable[TagNode] = list(self._nodes(self.root))
+            else:
+                nodes = [n for n in map(self.find, tags) if n is not None]
+            for node in nodes:
+                if identifier in node.notes:
+                    node.notes.discard(identifier)
+                    self._invalidate(node)
+
+    def remove(self, name: str) -> bool:
+        """태그와 하위 태그 삭제 (delete_tag와 같은 동작), 없으면 False"""
+        with self._lock:
+            node = self.find(name)
+            if node is None:
+                return False
+            self._detach(node)
+            self._size -= sum(1 for n in self._nodes(node) if n.is_tag)
+            return True
+
+    def rename(self, old_name: str, new_name: str) -> bool:
+        """
+        태그와 하위 태그 이름 변경 (rename_tag와 같은 동작), 없으면 False
+
+        새 이름이 이미 있으면 두 하위 트리를 합칩니다.
+        """
+        if not split_tag(new_name):
+            raise ValueError(f"잘못된 태그 이름입니다: {new_name!r}")
+        with self._lock:
+            node = self.find(old_name)
+            if node is None:
+                return False
+            self._detach(node)
+            self._size -= sum(1 for n in self._nodes(node) if n.is_tag)
+            target = self.add(new_name)
+            self._merge(node, target)
+            return True
+
+    def _detach(self, node: TagNode) -> None:
+        parent = node.parent
+        del parent.children[node.segment]
+        node.parent = None
+        self._invalidate(parent)
+
+    def _merge(self, source: TagNode, target: TagNode) -> None:
+        # source 하위 트리를 target 아래로 옮김 (같은 이름은 합침)
+        stack = [(source, target)]
+        while stack:
+            src, dst = stack.pop()
+            if src.notes:
+                dst.notes |= src.notes
+                self._invalidate(dst)
+            if src.is_tag and not dst.is_tag:
+                dst.is_tag = True
+                self._size += 1
+            for segment, child in src.children.items():
+                existing = dst.children.get(segment)
+                if existing is None:
+                    existing = dst.children[segment] = TagNode(
+                        segment, f"{dst.path}/{segment}", dst
+                    )
+                stack.append((child, existing))
+
+    def _invalidate(self, node: Optional[TagNode]) -> None:
+        # 노드와 조상의 노트 수 캐시 무효화 (깊이에 비례)
+        while node is not None:
+            node._total = None
+            node = node.parent
+
+    # bear.py 작업 추적
+
+    def _after(self, s: "bear.Span") -> None:
+        if s.error is not None:
+            return
+        if s.name == "rename_tag":
+            self.rename(s.args["old_name"], s.args["new_name"])
+        elif s.name == "delete_tag":
+            self.remove(s.args["name"])
+
+    def install(self) -> Callable[[], None]:
+        """
+        bear.py의 rename_tag / delete_tag 결과를 트리에 반영하는 훅 등록
+
+        Returns:
+            훅을 해제하는 함수
+        """
+        remove = bear.add_hook(after=self._after)
+        self.hooks += 1
+        removed = False
+
+        def uninstall() -> None:
+            nonlocal removed
+            if not removed:
+                removed = True
+                self.hooks -= 1
+                remove()
+
+        return uninstall
+
+
+def count_tags(notes: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """
+    태그가 들어 있는 노트 목록을 한 번 훑어 태그별 노트 수 계산
+
+    Bear search_notes 결과에는 태그가 없으므로 (모든 태그가 0이 됨) Bear에서 가져온
+    노트는 count_tags_by_search()나 tag_counts()를 쓰고, 이 함수는 스냅샷 레코드나
+    attach_tags() 결과처럼 태그를 채운 목록에 씁니다.
+
+    Returns:
+        태그 이름 -> {"notes": 직접 붙은 노트 수, "subtree": 하위 태그 포함 노트 수}
+        (하위 트리 수는 노트마다 한 번만 셈)
+    """
+    counts: Dict[str, Dict[str, int]] = {}
+    for note in notes:
+        direct: Set[str] = set()
+        subtree: Set[str] = set()
+        for tag in note_tags(note):
+            parts = split_tag(tag)
+            if not parts:
+                continue
+            direct.add("/".join(parts))
+            for i in range(1, len(parts) + 1):
+                subtree.add("/".join(parts[:i]))
+        for name in subtree:
+            entry = counts.get(name)
+            if entry is None:
+                entry = counts[name] = {"notes": 0, "subtree": 0}
+            entry["subtree"] += 1
+            if name in direct:
+                entry["notes"] += 1
+    return counts
+
+
+def tag_members(names: Iterable[str], workers: int = 4) -> Dict[str, Set[str]]:
+    """
+    태그마다 search_notes(tag=...)를 병렬로 호출해 태그 -> 노트 ID 집합 반환
+
+    Bear 태그 검색은 하위 태그 노트도 포함하므로 각 집합은 하위 트리 전체의 노트입니다.
+    같은 태그는 한 번만 검색합니다.
+    """
+    unique = sorted({"/".join(split_tag(name)) for name in names} - {""})
+
+    def search(name: str) -> Set[str]:
+        found = bear.search_notes(tag=name)
+        if found is None:
+            raise RuntimeError(f"태그 검색에 실패했습니다: {name}")
+        return {n["identifier"] for n in found if n.get("identifier")}
+
+    with bear.span("tag_members", tags=len(unique)):
+        return dict(zip(unique, bear.map_concurrent(search, unique, max_workers=workers)))
+
+
+def attach_tags(
+    notes: Iterable[Dict[str, Any]],
+    tags: Optional[Iterable[Dict[str, Any]]] = None,
+    workers: int = 4
+) -> List[Dict[str, Any]]:
+    """
+    search_notes 결과(태그 없음)에 태그별 검색으로 알아낸 "tags"를 채운 사본 반환
+
+    노트마다 자신을 포함하는 가장 깊은 태그만 남기므로 ("project"와 "project/alpha"에
+    모두 속하면 "project/alpha"), 상위 태그와 하위 태그를 함께 붙인 노트는 구분하지 못합니다.
+
+    Args:
+        notes: search_notes 형식의 노트 목록
+        tags: get_tags 형식의 태그 목록 (없으면 get_tags() 호출)
+        workers: 태그별 검색의 최대 동시 실행 수
+    """
+    if tags is None:
+        tags = bear.get_tags()
+        if tags is None:
+            raise RuntimeError("태그 목록을 가져올 수 없습니다 (xcall과 BEAR_API_TOKEN 확인)")
+    members = tag_members((tag["name"] for tag in tags), workers=workers)
+    found: Dict[str, Set[str]] = {}
+    for name, ids in members.items():
+        for identifier in ids:
+            found.setdefault(identifier, set()).add(name)
+    result = []
+    for note in notes:
+        names = found.get(note.get("identifier"), set())
+        deepest = sorted(
+            name for name in names
+            if not any(other.startswith(name + "/") for other in names)
+        )
+        result.append({**note, "tags": deepest})
+    return result
+
+
+def count_tags_by_search(names: Iterable[str], workers: int = 4) -> Dict[str, Dict[str, int]]:
+    """
+    태그마다 search_notes(tag=...)를 병렬로 호출해 노트 수 계산
+
+    Bear에서 가져온 노트 목록(search_notes 결과)에는 태그가 없으므로 Bear 노트의
+    태그별 노트 수는 이 함수로 구합니다. "notes"는 어느 하위 태그에도 속하지 않는 노트 수입니다.
+    """
+    members = tag_members(names, workers=workers)
+    tree = TagTree.build({"name": name} for name in members)
+    counts = {}
+    for name, ids in members.items():
+        in_children = set().union(*(members.get(child, ()) for child in tree.children(name)))
+        counts[name] = {"notes": len(ids - in_children), "subtree": len(ids)}
+    return counts
+
+
+def tag_counts(
+    cache: Any = None,
+    workers: int = 4,
+    snapshot_path: Optional[str] = None
+) -> Dict[str, Dict[str, int]]:
+    """
+    모든 태그의 노트 수 ({"notes", "subtree"})
+
+    스냅샷이나 캐시가 태그가 든 노트 레코드를 가지고 있으면 한 번 훑어 계산하고,
+    그 밖에는 태그 목록으로 태그별 검색을 병렬 실행합니다 (count_tags_by_search).
+    Bear 검색 결과에는 태그가 없으므로 전체 노트 목록을 가져오지 않습니다.
+    반복 조회는 cache.WarmCache.tag_counts()를 쓰면 쓰기 작업 전까지 재사용됩니다.
+
+    Args:
+        cache: tags()를 제공하는 캐시 (없으면 Bear에 직접 요청)
+        workers: 태그별 검색의 최대 동시 실행 수
+        snapshot_path: 태그 열이 있는 스냅샷 파일 (snapshot.write_snapshot 결과)
+    """
+    if snapshot_path:
+        try:
+            from .snapshot import Snapshot
+        except ImportError:
+            from snapshot import Snapshot
+        with Snapshot(snapshot_path) as snap:
+            return count_tags({"tags": snap.tags(row)} for row in range(len(snap)))
+    if cache is not None:
+        # 이미 있는 값만 보고 새로 가져오지는 않음 (가져와도 검색 결과라 태그가 없음)
+        fresh = getattr(cache, "fresh_notes", None)
+        notes = fresh() if fresh is not None else cache.notes()
+        if notes and any("tags" in note for note in notes):
+            return count_tags(notes)
+    tags = cache.tags() if cache is not None else bear.get_tags()
+    if tags is None:
+        raise RuntimeError("태그 목록을 가져올 수 없습니다 (xcall과 BEAR_API_TOKEN 확인)")
+    return count_tags_by_search((tag["name"] for tag in tags), workers=workers)
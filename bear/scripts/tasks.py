@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+노트 체크박스 할 일 인덱스
+
+노트 본문의 "- [ ]" / "- [x]" 항목을 노트, 헤더, 줄 번호와 함께 인덱싱합니다.
+modificationDate가 바뀐 노트만 다시 파싱하므로, 동기화 후 조회는 메모리에서 바로 처리됩니다.
+
+Usage:
+    python3 tasks.py sync
+    python3 tasks.py list --title 'Daily Standup*' --header Today --last 7
+
+Example:
+    index = TaskIndex()
+    index.sync()
+    for task in index.tasks(title="Daily Standup*", header="Today", last=7):
+        print(task["title"], task["line"], task["text"])
+"""
+
+import re
+import sys
+import fnmatch
+import argparse
+from typing import Optional, Dict, List, Any
+
+try:
+    from .content_index import ContentIndex
+except ImportError:
+    from content_index import ContentIndex
+
+
+_HEADER_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_TASK_RE = re.compile(r"^(\s*)[-*+]\s+\[([ xX])\]\s+(.*?)\s*$")
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+
+
+def parse_tasks(text: str) -> List[List[Any]]:
+    """
+    본문에서 체크박스 항목 추출 (코드 블록 안은 무시)
+
+    Returns:
+        [줄 번호(1부터), 헤더, 완료 여부, 들여쓰기, 내용] 목록
+        (헤더는 항목 위에 있는 가장 가까운 제목, 없으면 "")
+    """
+    tasks = []
+    header = ""
+    in_fence = False
+    for number, line in enumerate(text.splitlines(), 1):
+        if _FENCE_RE.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        if line.startswith("#"):
+            match = _HEADER_RE.match(line)
+            if match:
+                header = match.group(2)
+                continue
+        if "[" not in line:
+            continue
+        match = _TASK_RE.match(line)
+        if match:
+            indent, mark, content = match.groups()
+            tasks.append([number, header, mark != " ", len(indent.expandtabs(4)), content])
+    return tasks
+
+
+def _header_key(value: str) -> str:
+    return value.lstrip("#").strip().casefold()
+
+
+class TaskIndex(ContentIndex):
+    """
+    체크박스 할 일 인덱스
+
+    Args:
+        path: SQLite 파일 경로 (기본값: ~/.cache/bear-skill/index.sqlite)
+        fetch: 노트 ID로 본문을 가져오는 함수 (기본값: get_note_contents)
+    """
+
+    table = "tasks"
+
+    def extract(self, text: str) -> List[List[Any]]:
+        return parse_tasks(text)
+
+    def tasks(
+        self,
+        done: Optional[bool] = False,
+        header: Optional[str] = None,
+        title: Optional[str] = None,
+        tag: Optional[str] = None,
+        last: Optional[int] = None,
+        note_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        할 일 조회
+
+        Args:
+            done: False면 미완료만, True면 완료만, None이면 모두
+            header: 이 제목 아래 항목만 ("Today" 또는 "### Today", 대소문자 무시)
+            title: 노트 제목 glob 패턴 (대소문자 무시, 예: "Daily Standup*")
+            tag: 이 태그 또는 하위 태그가 있는 노트만
+            last: 조건에 맞는 노트 중 수정일 기준 최근 N개만 (할 일이 없는 노트도 N개에 포함)
+            note_id: 이 노트만
+
+        Returns:
+            {identifier, title, line, header, done, indent, text} 목록
+            (노트는 최근 수정순, 노트 안에서는 줄 순서)
+        """
+        self.load()
+        title_re = re.compile(fnmatch.translate(title.casefold())) if title else None
+        header_key = _header_key(header) if header is not None else None
+
+        if note_id is not None:
+            candidates = [(note_id, self.entries[note_id])] if note_id in self.entries else []
+        elif last is not None:
+            # 최근 N개는 할 일 유무와 관계없이 조건에 맞는 노트 기준
+            candidates = list(self.entries.items())
+        else:
+            candidates = [(i, e) for i, e in self.entries.items() if e["data"]]
+        notes = []
+        for identifier, entry in candidates:
+            if title_re is not None and not title_re.match(entry["title"].casefold()):
+                continue
+            if tag is not None and not any(t == tag or t.startswith(tag + "/") for t in entry["tags"]):
+                continue
+            notes.append((identifier, entry))
+        notes.sort(key=lambda item: item[1]["modified"], reverse=True)
+        if last is not None:
+            notes = notes[:last]
+
+        result = []
+        for identifier, entry in notes:
+            for line, task_header, is_done, indent, text in entry["data"]:
+                if done is not None and is_done != done:
+                    continue
+                if header_key is not None and _header_key(task_header) != header_key:
+                    continue
+                result.append({
+                    "identifier": identifier,
+                    "title": entry["title"],
+                    "line": line,
+                    "header": task_header,
+                    "done": is_done,
+                    "indent": indent,
+                    "text": text,
+                })
+        return result
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """노트별 미완료/완료 개수 (미완료가 있는 노트만, 최근 수정순)"""
+        self.load()
+        rows = []
+        for identifier, entry in self.entries.items():
+            open_count = sum(1 for task in entry["data"] if not task[2])
+            if open_count:
+                rows.append({
+                    "identifier": identifier,
+                    "title": entry["title"],
+                    "modified": entry["modified"],
+                    "open": open_count,
+                    "done": len(entry["data"]) - open_count,
+                })
+        rows.sort(key=lambda row: row["modified"], reverse=True)
+        return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Index and query checkbox tasks in Bear notes")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync = sub.add_parser("sync", help="re-parse notes modified since the last sync")
+    sync.add_argument("--workers", type=int, default=4)
+    query = sub.add_parser("list", help="list tasks from the index")
+    query.add_argument("--title", help="note title glob, e.g. 'Daily Standup*'")
+    query.add_argument("--header", help="only tasks under this heading")
+    query.add_argument("--tag")
+    query.add_argument("--last", type=int, help="only the N most recently modified matching notes")
+    query.add_argument("--all", action="store_true", help="include completed tasks")
+    sub.add_parser("summary", help="open task counts per note")
+    args = parser.parse_args(argv)
+
+    index = TaskIndex()
+    if args.command == "sync":
+        report = index.sync(workers=args.workers)
+        print(f"Checked {report['checked']}, parsed {report['parsed']}, "
+              f"removed {report['removed']}, failed {len(report['failed'])}")
+        return 1 if report["failed"] else 0
+    if args.command == "summary":
+        for row in index.summary():
+            print(f"{row['open']:4d} open  {row['title']}")
+        return 0
+
+    for task in index.tasks(
+        done=None if args.all else False, header=args.header,
+        title=args.title, tag=args.tag, last=args.last
+    ):
+        mark = "x" if task["done"] else " "
+        print(f"[{mark}] {task['text']}  ({task['title']}:{task['line']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+노트 제목 퍼지 검색 (트라이그램 인덱스)
+
+"weekly review week 41"처럼 조금 틀린 제목으로도 "Weekly Review - Week 41"을 찾도록
+제목을 정규화(NFKC, casefold, 구두점/공백 정리)한 뒤 세 글자 조각(trigram)별 역색인을 만들고,
+겹치는 조각 수로 후보를 모아 Dice 계수로 순위를 매깁니다.
+
+install()을 호출하면 search_notes 등의 결과와 create_note/grab_url로 만든 노트가
+인덱스에 바로 반영되고, trash_note한 노트는 빠집니다.
+
+Usage:
+    python3 titles.py "weekly review week 41"
+
+Example:
+    index = TitleIndex.from_notes(get_cache().notes())
+    index.install()
+    for match in index.match("weekly review week 41", limit=3):
+        print(match["score"], match["title"])
+    note_id = index.best("project alpa")
+"""
+
+import re
+import sys
+import heapq
+import argparse
+import threading
+import unicodedata
+from typing import Optional, Dict, List, Any, Iterable, Set, Callable
+
+try:
+    from . import bear
+except ImportError:
+    import bear
+
+
+DEFAULT_THRESHOLD = 0.3
+# best()가 노트를 고르는 최소 점수
+DEFAULT_BEST_SCORE = 0.5
+_SEPARATOR_RE = re.compile(r"[\W_]+")
+
+
+def normalize_title(title: str) -> str:
+    """비교용 제목 (NFKC, 대소문자 무시, 구두점과 연속 공백을 공백 하나로)"""
+    text = unicodedata.normalize("NFKC", title).casefold()
+    return _SEPARATOR_RE.sub(" ", text).strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    """정규화된 문자열의 trigram 집합 (단어 경계를 살리도록 앞뒤에 공백을 붙임)"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleIndex:
+    """
+    제목 trigram 역색인 (메모리, 스레드 안전)
+
+    노트마다 제목과 trigram 집합을 보관하고, trigram -> 노트 ID 집합으로 후보를 찾습니다.
+    """
+
+    def __init__(self):
+        self.titles: Dict[str, str] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_notes(cls, notes: Optional[Iterable[Dict[str, Any]]]) -> "TitleIndex":
+        """search_notes 형식의 노트 목록으로 만들기"""
+        index = cls()
+        index.update(notes or ())
+        return index
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __contains__(self, identifier: str) -> bool:
+        return identifier in self.titles
+
+    # 변경
+
+    def add(self, identifier: str, title: str) -> None:
+        """노트 추가 또는 제목 변경"""
+        with self._lock:
+            if self.titles.get(identifier) == title:
+                return
+            self._discard(identifier)
+            grams = trigrams(normalize_title(title))
+            self.titles[identifier] = title
+            self._grams[identifier] = grams
+            postings = self._postings
+            for gram in grams:
+                posting = postings.get(gram)
+                if posting is None:
+                    postings[gram] = {identifier}
+                else:
+                    posting.add(identifier)
+
+    def update(self, notes: Iterable[Dict[str, Any]]) -> int:
+        """노트 목록 반영 (제목이 바뀐 노트만 다시 색인), 반영한 수 반환"""
+        count = 0
+        with self._lock:
+            for note in notes:
+                identifier, title = note.get("identifier"), note.get("title")
+                if identifier and title is not None and self.titles.get(identifier) != title:
+                    self.add(identifier, title)
+                    count += 1
+        return count
+
+    def remove(self, identifier: str) -> None:
+        """노트 삭제"""
+        with self._lock:
+            self._discard(identifier)
+
+    def _discard(self, identifier: str) -> None:
+        grams = self._grams.pop(identifier, None)
+        if grams is None:
+            return
+        del self.titles[identifier]
+        for gram in grams:
+            posting = self._postings[gram]
+            posting.discard(identifier)
+            if not posting:
+                del self._postings[gram]
+
+    # 조회
+
+    def match(
+        self,
+        title: str,
+        limit: int = 10,
+        threshold: float = DEFAULT_THRESHOLD
+    ) -> List[Dict[str, Any]]:
+        """
+        비슷한 제목의 노트
+
+        Args:
+            title: 찾을 제목 (대충 맞아도 됨)
+            limit: 최대 개수
+            threshold: 최소 점수 (0~1)
+
+        Returns:
+            {identifier, title, score} 목록 (점수 높은 순, 정규화한 제목이 같으면 1.0)
+        """
+        query = trigrams(normalize_title(title))
+        size = len(query)
+        if not size or limit < 1:
+            return []
+        with self._lock:
+            # 희귀한 trigram부터 훑으며 새 후보는 바로 정확한 점수를 계산하고,
+            # 아직 안 본 trigram만으로는 현재 limit위 점수를 넘을 수 없게 되면 멈춤
+            postings = sorted(
+                (self._postings[g] for g in query if g in self._postings), key=len
+            )
+            heap: List[tuple] = []
+            seen: Set[str] = set()
+            grams = self._grams
+            for position, posting in enumerate(postings):
+                remaining = len(postings) - position
+                bar = heap[0][0] if len(heap) >= limit else threshold
+                # 이제 처음 보는 노트는 많아야 remaining개가 겹치므로 점수 상한은 2r / (|q| + r)
+                if 2 * remaining / (size + remaining) < bar:
+                    break
+                for identifier in posting - seen:
+                    other = grams[identifier]
+                    score = 2 * len(query & other) / (size + len(other))
+                    if score < bar:
+                        continue
+                    if len(heap) < limit:
+                        heapq.heappush(heap, (score, identifier))
+                    else:
+                        heapq.heappushpop(heap, (score, identifier))
+                    if len(heap) >= limit:
+                        bar = heap[0][0]
+                seen |= posting
+            found = sorted(heap, key=lambda item: (-item[0], self.titles[item[1]]))
+            return [
+                {"identifier": identifier, "title": self.titles[identifier], "score": round(score, 4)}
+                for score, identifier in found
+            ]
+
+    def best(self, title: str, min_score: float = DEFAULT_BEST_SCORE) -> Optional[str]:
+        """가장 비슷한 노트 ID (min_score 미만이거나 1, 2위가 동점이면 None)"""
+        found = self.match(title, limit=2, threshold=min_score)
+        if not found or (len(found) > 1 and found[0]["score"] == found[1]["score"]):
+            return None
+        return found[0]["identifier"]
+
+    # bear.py 작업 추적
+
+    def _after(self, s: "bear.Span") -> None:
+        if s.error is not None:
+            return
+        result = s.result
+        if isinstance(result, list):
+            # search_notes, todo_notes 등 노트 목록을 반환하는 작업
+            self.update(n for n in result if isinstance(n, dict))
+        elif s.name in ("create_note", "grab_url"):
+            if isinstance(result, dict) and result.get("identifier") and result.get("title") is not None:
+                self.add(result["identifier"], result["title"])
+        elif s.name == "trash_note" and s.args.get("note_id"):
+            self.remove(s.args["note_id"])
+
+    def install(self) -> Callable[[], None]:
+        """
+        bear.py 작업 결과로 인덱스를 갱신하는 훅 등록
+
+        Returns:
+            훅을 해제하는 함수
+        """
+        return bear.add_hook(after=self._after)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Find Bear notes by approximate title")
+    parser.add_argument("title")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    try:
+        from .cache import get_cache
+    except ImportError:
+        from cache import get_cache
+    notes = get_cache().notes()
+    if notes is None:
+        print("Error: note list unavailable (check xcall and BEAR_API_TOKEN)", file=sys.stderr)
+        return 1
+    index = TitleIndex.from_notes(notes)
+    for match in index.match(args.title, limit=args.limit, threshold=args.threshold):
+        print(f"{match['score']:.2f}  {match['title']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
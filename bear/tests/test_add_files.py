@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+add_files 회귀 테스트 (FakeBear 사용)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import tempfile
+import unittest
+
+import bear
+from fake_bear import FakeBear
+
+
+class AddFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "a.txt")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("hello")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_bad_items_are_recorded_without_stopping_the_batch(self):
+        with FakeBear() as fake:
+            note_id = fake.add_note("A", "body")
+            results = bear.add_files([
+                {"note_id": note_id, "path": self.path},
+                {"note_id": note_id, "path": self.path, "titel": "typo"},
+                {"note_id": note_id, "path": os.path.join(self.dir.name, "missing.txt")},
+                {"note_id": note_id, "path": self.path, "filename": "b.txt"},
+            ], max_workers=2)
+        self.assertEqual([r["ok"] for r in results], [True, False, False, True])
+        self.assertEqual(results[1]["type"], "TypeError")
+        self.assertEqual(results[2]["type"], "FileNotFoundError")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+trash_where / archive_where 회귀 테스트 (FakeBear 사용)
+
+FakeBear의 검색 결과에는 실제 Bear처럼 태그가 없으므로, 태그 조건이
+검색 결과의 빈 태그로 판단되지 않는지 확인합니다.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import unittest
+
+from fake_bear import FakeBear
+from bulk_notes import trash_where, archive_where, note_matches, normalize_query
+
+
+class TrashWhereTest(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeBear().install()
+        self.ids = {
+            "tagged scratch": self.fake.add_note("Scratch 1", "x", tags=["work"]),
+            "untagged scratch": self.fake.add_note("Scratch 2", "x"),
+            "untagged other": self.fake.add_note("Other", "x"),
+            "archived work": self.fake.add_note("Old", "x", tags=["work/archive"]),
+            "personal": self.fake.add_note("Home", "x", tags=["personal"]),
+        }
+
+    def tearDown(self):
+        self.fake.uninstall()
+
+    def trashed(self):
+        return {name for name, i in self.ids.items() if self.fake.notes[i]["trashed"]}
+
+    def test_search_results_have_no_tags(self):
+        self.assertTrue(all("tags" not in note for note in self.fake._do_search({})))
+
+    def test_untagged_trashes_only_untagged_notes(self):
+        report = trash_where({"untagged": True}, rate=0)
+        self.assertEqual(report["done"], 2)
+        self.assertEqual(self.trashed(), {"untagged scratch", "untagged other"})
+
+    def test_untagged_with_title_pattern(self):
+        trash_where({"untagged": True, "title": "scratch *"}, rate=0)
+        self.assertEqual(self.trashed(), {"untagged scratch"})
+
+    def test_tag_includes_subtags(self):
+        report = archive_where({"tag": "work"}, rate=0)
+        self.assertEqual(report["done"], 2)
+        archived = {name for name, i in self.ids.items() if self.fake.notes[i]["archived"]}
+        self.assertEqual(archived, {"tagged scratch", "archived work"})
+
+    def test_dry_run_changes_nothing(self):
+        report = trash_where({"untagged": True}, dry_run=True)
+        self.assertEqual(report["matched"], 2)
+        self.assertEqual(self.trashed(), set())
+
+    def test_empty_query_is_rejected(self):
+        with self.assertRaises(ValueError):
+            trash_where({})
+        self.assertEqual(self.trashed(), set())
+
+    def test_tag_condition_needs_tags(self):
+        note = self.fake._do_search({})[0]
+        with self.assertRaises(ValueError):
+            note_matches(note, normalize_query({"untagged": True}))
+
+
+if __name__ == "__main__":
+    unittest.main()
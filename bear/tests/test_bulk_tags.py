@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+plan_rename 충돌 판정 회귀 테스트
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import unittest
+
+from tagtree import TagTree
+from bulk_tags import plan_rename
+
+
+def tree_of(*names):
+    tree = TagTree()
+    for name in names:
+        tree.add(name)
+    return tree
+
+
+class PlanRenameTest(unittest.TestCase):
+
+    def test_existing_target_is_a_conflict(self):
+        plan = plan_rename(tree_of("p/a/b", "p/q/a/b"), "p/a/*", "p/q/a")
+        self.assertEqual([(s.target, s.conflict) for s in plan.steps], [("p/q/a/b", "exists")])
+
+    def test_target_vacated_by_another_step_is_not_a_conflict(self):
+        # p/x/y/z는 p/x/y가 옮겨지면서 비므로 p/y/z가 그 자리로 갈 수 있음
+        plan = plan_rename(tree_of("p/x/y", "p/x/y/z", "p/y/z"), "p/*/*", "p/x")
+        steps = {s.source: s for s in plan.steps}
+        self.assertEqual(steps["p/y/z"].target, "p/x/y/z")
+        self.assertEqual(plan.conflicts, [])
+        self.assertIn(steps["p/x/y"].index, steps["p/y/z"].after)
+
+
+if __name__ == "__main__":
+    unittest.main()
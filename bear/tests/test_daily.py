@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+날짜별 노트 get-or-create 회귀 테스트 (FakeBear 사용)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import tempfile
+import unittest
+from datetime import date
+
+import bear
+from store import KVStore
+from cache import WarmCache
+from fake_bear import FakeBear
+from daily import get_or_create_daily, backfill
+
+
+class OpenOnlyBear(FakeBear):
+    """xcall 없이 open으로만 호출하는 경우처럼 응답을 돌려주지 않는 에뮬레이터"""
+
+    def __call__(self, url, need_response):
+        super().__call__(url, need_response)
+        return None
+
+
+class DailyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.previous_store = bear.set_idempotency_store(
+            KVStore(os.path.join(self.dir.name, "idempotency.sqlite"), "create_note")
+        )
+        self.day = date(2024, 1, 15)
+
+    def tearDown(self):
+        bear.set_idempotency_store(self.previous_store)
+        self.dir.cleanup()
+
+    def cache(self):
+        return WarmCache(os.path.join(self.dir.name, "cache.sqlite"), background=False)
+
+    def test_second_call_finds_note(self):
+        with FakeBear() as fake:
+            first = get_or_create_daily("standup", self.day, cache=self.cache(), add_timestamp=True)
+            second = get_or_create_daily("standup", self.day, cache=self.cache())
+            self.assertTrue(first["created"])
+            self.assertFalse(second["created"])
+            self.assertEqual(first["identifier"], second["identifier"])
+            self.assertEqual(len(fake.notes), 1)
+
+    def test_stale_title_index_does_not_report_created(self):
+        with FakeBear() as fake:
+            cache = self.cache()
+            first = get_or_create_daily("standup", self.day, cache=cache)
+            cache.titles.clear()
+            second = get_or_create_daily("standup", self.day, cache=cache)
+            self.assertFalse(second["created"])
+            self.assertEqual(second["identifier"], first["identifier"])
+            self.assertEqual(len(fake.notes), 1)
+
+    def test_without_xcall_second_run_does_not_raise(self):
+        with OpenOnlyBear() as fake:
+            first = get_or_create_daily("standup", self.day, cache=self.cache())
+            second = get_or_create_daily("standup", self.day, cache=self.cache())
+            self.assertEqual((first["created"], first["identifier"]), (True, ""))
+            self.assertEqual((second["created"], second["identifier"]), (False, ""))
+            self.assertEqual(len(fake.notes), 1)
+
+    def test_backfill_without_xcall_skips_sent_days(self):
+        with OpenOnlyBear() as fake:
+            get_or_create_daily("standup", self.day, cache=self.cache())
+            report = backfill("standup", self.day, date(2024, 1, 16), cache=self.cache())
+            self.assertEqual(report["failed"], {})
+            self.assertEqual(report["existing"], {"2024-01-15": ""})
+            self.assertEqual(report["created"], {"2024-01-16": ""})
+            self.assertEqual(len(fake.notes), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
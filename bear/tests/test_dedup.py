@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+archive_duplicates 회귀 테스트 (FakeBear 사용)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import tempfile
+import unittest
+
+from fake_bear import FakeBear
+from dedup import DedupIndex, archive_duplicates
+
+
+def words(start, count):
+    return " ".join(f"word{i}" for i in range(start, start + count))
+
+
+class ArchiveDuplicatesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.fake = FakeBear().install()
+        body = words(0, 200)
+        self.ids = {
+            "new": self.fake.add_note("Copy", body, modified="2024-03-01T00:00:00Z"),
+            "old": self.fake.add_note("Copy", body, modified="2024-01-01T00:00:00Z"),
+            "other": self.fake.add_note("Other", words(1000, 200), modified="2024-02-01T00:00:00Z"),
+        }
+        self.index = DedupIndex(os.path.join(self.dir.name, "index.sqlite"), processes=1)
+        self.index.sync(workers=1)
+
+    def tearDown(self):
+        self.fake.uninstall()
+        self.dir.cleanup()
+
+    def archived(self):
+        return {name for name, i in self.ids.items() if self.fake.notes[i]["archived"]}
+
+    def test_keeps_newest_and_archives_copy(self):
+        clusters = self.index.clusters()
+        self.assertEqual(len(clusters), 1)
+        report = archive_duplicates(clusters, index=self.index, rate=0)
+        self.assertEqual(report["done"], 1)
+        self.assertEqual([n["identifier"] for n in report["kept"]], [self.ids["new"]])
+        self.assertEqual(self.archived(), {"old"})
+
+    def test_keep_oldest(self):
+        archive_duplicates(self.index.clusters(), keep="oldest", index=self.index, rate=0)
+        self.assertEqual(len(self.archived()), 1)
+
+    def test_skips_members_not_similar_to_kept_note(self):
+        # 유사한 쌍을 이어 붙인 묶음에는 남긴 노트와 비슷하지 않은 노트가 섞일 수 있음
+        entries = {i: dict(self.index.entries[i], identifier=i) for i in self.ids.values()}
+        cluster = [entries[self.ids[name]] for name in ("new", "old", "other")]
+        report = archive_duplicates([cluster], index=self.index, rate=0)
+        self.assertEqual(self.archived(), {"old"})
+        self.assertEqual([s["identifier"] for s in report["skipped"]], [self.ids["other"]])
+
+    def test_dry_run_changes_nothing(self):
+        report = archive_duplicates(self.index.clusters(), index=self.index, dry_run=True)
+        self.assertEqual(report["matched"], 1)
+        self.assertEqual(self.archived(), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+create_note(idempotency_key=...) 회귀 테스트 (FakeBear 사용)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import time
+import tempfile
+import threading
+import unittest
+
+import bear
+from store import KVStore
+from fake_bear import FakeBear
+
+
+class IdempotencyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.store = KVStore(os.path.join(self.dir.name, "idempotency.sqlite"), "create_note")
+        self.previous_store = bear.set_idempotency_store(self.store)
+
+    def tearDown(self):
+        bear.set_idempotency_store(self.previous_store)
+        self.dir.cleanup()
+
+    def test_same_key_creates_one_note(self):
+        with FakeBear() as fake:
+            first = bear.create_note(title="Report", text="x", idempotency_key="k", return_id=True)
+            second = bear.create_note(title="Report", text="x", idempotency_key="k", return_id=True)
+            self.assertEqual(first, second)
+            self.assertEqual(len(fake.notes), 1)
+            self.assertEqual(bear.idempotency_record("k")["state"], "done")
+
+    def test_auto_key_uses_content(self):
+        with FakeBear() as fake:
+            bear.create_note(title="Report", text="x", idempotency_key="auto")
+            bear.create_note(title="Report", text="x", idempotency_key="auto")
+            bear.create_note(title="Report", text="y", idempotency_key="auto")
+            self.assertEqual(len(fake.notes), 2)
+
+    def test_concurrent_calls_create_one_note(self):
+        results, errors = [], []
+
+        def create():
+            try:
+                results.append(bear.create_note(title="Once", idempotency_key="k", return_id=True))
+            except RuntimeError as e:
+                errors.append(e)
+
+        with FakeBear(latency=0.05) as fake:
+            threads = [threading.Thread(target=create) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(len(fake.notes), 1)
+            self.assertEqual(len(results) + len(errors), 6)
+            identifier = next(iter(fake.notes))
+            self.assertTrue(all(r["identifier"] == identifier for r in results))
+
+    def test_sent_key_resolves_note_by_title(self):
+        with FakeBear() as fake:
+            identifier = fake.add_note("Sent")
+            self.store.put("k", {"state": "sent", "title": "Sent", "started": time.time() - 0.5})
+            result = bear.create_note(title="Sent", idempotency_key="k", return_id=True)
+            self.assertEqual(result["identifier"], identifier)
+            self.assertEqual(len(fake.notes), 1)
+
+    def test_unresolved_sent_key_raises_instead_of_returning_none(self):
+        with FakeBear() as fake:
+            self.store.put("k", {"state": "sent", "title": "Lost", "started": time.time()})
+            with self.assertRaises(RuntimeError):
+                bear.create_note(title="Lost", idempotency_key="k", return_id=True)
+            self.assertIsNone(bear.create_note(title="Lost", idempotency_key="k"))
+            self.assertEqual(len(fake.notes), 0)
+
+    def test_failed_attempt_is_retried(self):
+        class Unreachable(FakeBear):
+            def _do_create(self, params):
+                raise OSError("Bear에 연결할 수 없음")
+
+        with Unreachable():
+            with self.assertRaises(OSError):
+                bear.create_note(title="Retry", idempotency_key="k")
+        with FakeBear() as fake:
+            result = bear.create_note(title="Retry", idempotency_key="k", return_id=True)
+            self.assertEqual(result["title"], "Retry")
+            self.assertEqual(len(fake.notes), 1)
+
+    def test_recent_claim_by_another_call_raises(self):
+        with FakeBear() as fake:
+            self.store.put("k", {"state": "pending", "title": "Busy", "started": time.time(), "owner": "x"})
+            with self.assertRaises(RuntimeError):
+                bear.create_note(title="Busy", idempotency_key="k")
+            self.assertEqual(len(fake.notes), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
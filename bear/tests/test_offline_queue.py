@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+WriteQueue 재실행/교체 회귀 테스트 (FakeBear 사용)
+
+Usage:
+    python3 -m pytest bear/tests
+"""
+
+import os
+import sys
+SCRIPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+sys.path.insert(0, SCRIPTS)
+
+import tempfile
+import subprocess
+import unittest
+from unittest import mock
+
+import bear
+from store import KVStore
+from fake_bear import FakeBear
+from offline_queue import WriteQueue
+
+
+class FlakyBear(FakeBear):
+    """fail_after번째 create부터 전송 오류(OSError)를 내는 에뮬레이터"""
+
+    def __init__(self, fail_after=None, error=OSError):
+        super().__init__()
+        self.fail_after = fail_after
+        self.error = error
+        self.creates = 0
+
+    def _do_create(self, params):
+        self.creates += 1
+        if self.fail_after is not None and self.creates > self.fail_after:
+            raise self.error("Bear에 연결할 수 없음")
+        return super()._do_create(params)
+
+
+class WriteQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "queue.jsonl")
+        self.queue = WriteQueue(self.path, fsync_batch=1)
+        self.previous_store = bear.set_idempotency_store(
+            KVStore(os.path.join(self.dir.name, "idempotency.sqlite"), "create_note")
+        )
+
+    def tearDown(self):
+        self.queue.close()
+        bear.set_idempotency_store(self.previous_store)
+        self.dir.cleanup()
+
+    def replay(self):
+        return self.queue.replay(rate=0, stop_when_unreachable=False)
+
+    def test_replay_runs_in_order_and_empties_queue(self):
+        for title in ("A", "B", "C"):
+            self.queue.enqueue("create_note", title=title)
+        with FakeBear() as fake:
+            report = self.replay()
+            self.assertEqual(report, {"replayed": 3, "failed": [], "remaining": 0})
+            self.assertEqual([n["title"] for n in fake.notes.values()], ["A", "B", "C"])
+            self.assertEqual(os.path.getsize(self.path), 0)
+            self.assertEqual(self.queue.pending(), 0)
+            self.assertEqual(self.replay()["replayed"], 0)
+            self.assertEqual(len(fake.notes), 3)
+
+    def test_transport_error_keeps_remaining_records(self):
+        for title in ("A", "B", "C"):
+            self.queue.enqueue("create_note", title=title)
+        with FlakyBear(fail_after=1) as fake:
+            report = self.replay()
+            self.assertEqual(report["replayed"], 1)
+            self.assertEqual(report["remaining"], 2)
+            self.assertEqual(self.queue.pending(), 2)
+            fake.fail_after = None
+            self.assertEqual(self.replay()["replayed"], 2)
+            self.assertEqual(sorted(n["title"] for n in fake.notes.values()), ["A", "B", "C"])
+
+    def test_unexpected_error_saves_offset_before_propagating(self):
+        for title in ("A", "B"):
+            self.queue.enqueue("create_note", title=title)
+        with FlakyBear(fail_after=1, error=KeyError) as fake:
+            with self.assertRaises(KeyError):
+                self.replay()
+            self.assertEqual(self.queue.pending(), 1)
+            fake.fail_after = None
+            self.assertEqual(self.replay()["replayed"], 1)
+            self.assertEqual(len(fake.notes), 2)
+
+    def test_bad_record_is_reported_and_skipped(self):
+        self.queue.enqueue("create_note", title="A")
+        self.queue.close()
+        with open(self.path, "ab") as f:
+            f.write(b'{"op": "create_note", "kwargs": {"tit\n')
+        self.queue.enqueue("create_note", title="B")
+        with FakeBear() as fake:
+            report = self.replay()
+            self.assertEqual(report["replayed"], 2)
+            self.assertEqual(len(report["failed"]), 1)
+            self.assertIn("raw", report["failed"][0]["record"])
+            self.assertEqual(len(fake.notes), 2)
+
+    def test_offset_for_replaced_file_is_ignored(self):
+        self.queue.enqueue("create_note", title="A")
+        with FakeBear():
+            self.replay()
+        # 교체 전 파일의 큰 위치가 남아 있어도 새 파일에는 적용되지 않아야 함
+        with open(self.queue.offset_path, "w", encoding="utf-8") as f:
+            f.write(f"4096 {os.stat(self.path).st_ino + 1}")
+        self.queue.enqueue("create_note", title="B")
+        self.assertEqual(self.queue.pending(), 1)
+        with FakeBear() as fake:
+            self.assertEqual(self.replay()["replayed"], 1)
+            self.assertEqual([n["title"] for n in fake.notes.values()], ["B"])
+
+    def test_replaying_same_records_again_does_not_duplicate_notes(self):
+        self.queue.enqueue("create_note", title="A", text="body")
+        self.queue.flush()
+        with open(self.path, "rb") as f:
+            records = f.read()
+        with FakeBear() as fake:
+            self.replay()
+            # 교체 직전에 중단된 것처럼 같은 레코드를 처음부터 다시 실행
+            self.queue.close()
+            with open(self.path, "wb") as f:
+                f.write(records)
+            os.remove(self.queue.offset_path)
+            self.assertEqual(self.replay()["replayed"], 1)
+            self.assertEqual(len(fake.notes), 1)
+
+    def test_enqueue_during_replay_is_not_blocked(self):
+        self.queue.enqueue("create_note", title="A")
+        enqueue_b = [
+            sys.executable, "-c",
+            "import sys; sys.path.insert(0, sys.argv[1]); from offline_queue import WriteQueue; "
+            "WriteQueue(sys.argv[2]).enqueue('create_note', title='B')",
+            SCRIPTS, self.path,
+        ]
+
+        class EnqueueingBear(FakeBear):
+            def _do_create(self, params):
+                # 재실행 중 다른 프로세스가 기록 (재실행이 큐 잠금을 계속 잡고 있으면 시간 초과)
+                if params.get("title") == "A":
+                    subprocess.run(enqueue_b, check=True, timeout=10)
+                return super()._do_create(params)
+
+        with EnqueueingBear() as fake:
+            report = self.queue.replay(rate=0, batch_size=1, stop_when_unreachable=False)
+            self.assertEqual(report["replayed"], 2)
+            self.assertEqual([n["title"] for n in fake.notes.values()], ["A", "B"])
+            self.assertEqual(self.queue.pending(), 0)
+
+    def test_replay_stops_without_advancing_when_bear_is_unreachable(self):
+        for title in ("A", "B", "C"):
+            self.queue.enqueue("create_note", title=title)
+        checks = iter([True, False])
+        with FakeBear() as fake, mock.patch.object(bear, "is_bear_running", lambda: next(checks, False)):
+            report = self.queue.replay(rate=0, batch_size=1)
+            self.assertEqual(report["replayed"], 1)
+            self.assertEqual(report["remaining"], 2)
+            self.assertEqual(self.queue.pending(), 2)
+            self.assertEqual(len(fake.notes), 1)
+
+    def test_enqueue_rejects_unknown_arguments(self):
+        with self.assertRaises(ValueError):
+            self.queue.enqueue("create_note", titel="A")
+        with self.assertRaises(ValueError):
+            self.queue.enqueue("search_notes", term="x")
+        self.assertEqual(self.queue.pending(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
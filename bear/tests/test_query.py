@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+쿼리 실행(Plan.run) 회귀 테스트 (FakeBear 사용)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import tempfile
+import unittest
+
+import bear
+from fake_bear import FakeBear
+from query import Query, select
+from snapshot import snapshot_from_search
+
+
+class QueryRunTest(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeBear().install()
+        for i in range(5):
+            self.fake.add_note(f"Work {i}", "x", tags=["work"])
+        self.fake.add_note("Home", "x", tags=["personal"])
+        self.spans = []
+        self.remove = bear.add_hook(after=self.spans.append)
+
+    def tearDown(self):
+        self.remove()
+        self.fake.uninstall()
+
+    def query_spans(self):
+        return [s for s in self.spans if s.name == "query"]
+
+    def test_select_applies_tags_and_limit(self):
+        self.assertEqual(len(select("#work")), 5)
+        self.assertEqual(len(select("#work", limit=2)), 2)
+        self.assertEqual([s.attrs["matched"] for s in self.query_spans()], [5, 2])
+
+    def test_span_is_not_current_between_results(self):
+        results = Query("#work").plan(source="bear").run()
+        note = next(results)
+        self.assertIsNone(bear.current_span())
+        bear.get_note_contents(note_id=note["identifier"])
+        contents = [s for s in self.spans if s.name == "get_note_contents"]
+        self.assertIsNone(contents[0].parent_id)
+        # 중간에 멈춘 이터레이터도 close()로 스팬이 끝나야 함
+        self.assertEqual(self.query_spans(), [])
+        results.close()
+        self.assertEqual([s.attrs["matched"] for s in self.query_spans()], [1])
+
+    def test_bear_calls_while_fetching_are_children(self):
+        list(Query("#work").plan(source="bear").run())
+        query = self.query_spans()[0]
+        searches = [s for s in self.spans if s.name == "search_notes"]
+        self.assertEqual(searches[0].parent_id, query.span_id)
+
+    def test_closing_snapshot_results_releases_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "notes.snap")
+            snapshot_from_search(path)
+            with Query("#work").plan(source="snapshot", snapshot_path=path).run() as results:
+                next(results)
+            self.assertEqual(len(self.query_spans()), 1)
+            self.assertIsNone(results._source.gi_frame)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+우선순위 레인 스케줄러 회귀 테스트
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import time
+import threading
+import unittest
+
+from scheduler import Scheduler, DeadlineExceeded
+
+
+class SchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = Scheduler(max_workers=1)
+        self.release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            self.release.wait(5)
+
+        # 워커 하나를 막아 두어 뒤에 제출한 작업의 마감이 지나게 함
+        self.blocker = self.scheduler.submit(block)
+        started.wait(5)
+
+    def tearDown(self):
+        self.release.set()
+        self.scheduler.shutdown(wait=True)
+
+    def test_interactive_runs_before_bulk(self):
+        order = []
+        bulk = [self.scheduler.submit(order.append, i, lane="bulk") for i in range(3)]
+        interactive = self.scheduler.submit(order.append, "interactive", lane="interactive")
+        self.release.set()
+        for future in bulk + [interactive]:
+            future.result(timeout=5)
+        self.assertEqual(order[0], "interactive")
+
+    def test_expired_task_fails_with_deadline_exceeded(self):
+        future = self.scheduler.submit(lambda: "ran", deadline=0.01)
+        time.sleep(0.05)
+        self.release.set()
+        with self.assertRaises(DeadlineExceeded):
+            future.result(timeout=5)
+        self.assertEqual(self.scheduler.metrics()["normal"]["expired"], 1)
+
+    def test_callback_of_expired_task_can_submit(self):
+        resubmitted = []
+
+        def retry(future):
+            resubmitted.append(self.scheduler.submit(lambda: "retried"))
+
+        future = self.scheduler.submit(lambda: "ran", deadline=0.01)
+        future.add_done_callback(retry)
+        time.sleep(0.05)
+        self.release.set()
+        with self.assertRaises(DeadlineExceeded):
+            future.result(timeout=5)
+        self.assertEqual(resubmitted[0].result(timeout=5), "retried")
+
+    def test_cancelled_expired_task_does_not_kill_worker(self):
+        future = self.scheduler.submit(lambda: "ran", deadline=0.01)
+        self.assertTrue(future.cancel())
+        time.sleep(0.05)
+        self.release.set()
+        self.assertEqual(self.scheduler.submit(lambda: "alive").result(timeout=5), "alive")
+
+    def test_unknown_lane_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.scheduler.submit(print, lane="urgent")
+
+
+if __name__ == "__main__":
+    unittest.main()
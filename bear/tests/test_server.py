@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+StdioServer 요청 처리 회귀 테스트 (FakeBear 사용)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import io
+import json
+import unittest
+
+from fake_bear import FakeBear
+from server import StdioServer, INVALID_PARAMS
+
+
+class StdioServerTest(unittest.TestCase):
+
+    def serve(self, *requests):
+        reader = io.StringIO("".join(json.dumps(r) + "\n" for r in requests))
+        writer = io.StringIO()
+        with FakeBear() as fake:
+            fake.add_note("A", "body")
+            StdioServer(reader, writer, workers=1).serve()
+        return [json.loads(line) for line in writer.getvalue().splitlines()]
+
+    def test_unknown_lane_is_invalid_params(self):
+        replies = self.serve(
+            {"jsonrpc": "2.0", "id": 1, "method": "search_notes", "params": {}, "lane": "urgent"}
+        )
+        self.assertEqual(replies[0]["id"], 1)
+        self.assertEqual(replies[0]["error"]["code"], INVALID_PARAMS)
+
+    def test_null_id_gets_reply_but_notification_does_not(self):
+        replies = self.serve(
+            {"jsonrpc": "2.0", "method": "search_notes", "params": {}},
+            {"jsonrpc": "2.0", "id": None, "method": "search_notes", "params": {}},
+        )
+        self.assertEqual(len(replies), 1)
+        self.assertIsNone(replies[0]["id"])
+        self.assertEqual([n["title"] for n in replies[0]["result"]], ["A"])
+
+
+if __name__ == "__main__":
+    unittest.main()
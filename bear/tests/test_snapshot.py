@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+노트 메타데이터 스냅샷 회귀 테스트 (FakeBear 사용)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import tempfile
+import unittest
+
+from fake_bear import FakeBear
+from snapshot import Snapshot, snapshot_from_search
+
+
+class SnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "notes.snap")
+        with FakeBear() as fake:
+            fake.add_note("A", "x", tags=["work/sub", "home"])
+            fake.add_note("B", "x", tags=["personal"])
+            fake.add_note("C", "x")
+            snapshot_from_search(self.path)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_tags_are_filled_from_tag_searches(self):
+        with Snapshot(self.path) as snap:
+            tags = {snap.title(row): sorted(snap.tags(row)) for row in range(len(snap))}
+            self.assertEqual(tags, {"A": ["home", "work/sub"], "B": ["personal"], "C": []})
+            self.assertEqual(sorted(snap.title(r) for r in snap.filter(tag="work")), ["A"])
+            self.assertEqual([snap.title(r) for r in snap.filter(untagged=True)], ["C"])
+
+    def test_tag_ids_survive_close(self):
+        with Snapshot(self.path) as snap:
+            row = next(r for r in range(len(snap)) if snap.title(r) == "A")
+            ids = snap.tag_ids_of(row)
+            names = [snap.string(i) for i in ids]
+        # 들고 있는 태그 ID 목록이 close()를 막지 않고, 닫은 뒤에도 쓸 수 있어야 함
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(sorted(names), ["home", "work/sub"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+태그별 노트 수 계산 회귀 테스트 (FakeBear 사용)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import tempfile
+import unittest
+
+from cache import WarmCache
+from fake_bear import FakeBear
+from snapshot import snapshot_from_search
+from tagtree import tag_counts
+
+EXPECTED = {
+    "work": {"notes": 1, "subtree": 2},
+    "work/x": {"notes": 1, "subtree": 1},
+    "home": {"notes": 1, "subtree": 1},
+}
+
+
+class TagCountsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.fake = FakeBear().install()
+        self.fake.add_note("A", tags=["work/x"])
+        self.fake.add_note("B", tags=["work", "home"])
+        self.fake.add_note("C")
+        self.fake.calls.clear()
+
+    def tearDown(self):
+        self.fake.uninstall()
+        self.dir.cleanup()
+
+    def test_counts_by_tag_search_without_full_fetch(self):
+        self.assertEqual(tag_counts(), EXPECTED)
+        # 태그 목록 한 번 + 태그마다 검색 한 번 (전체 노트 목록은 가져오지 않음)
+        self.assertEqual(self.fake.calls.count("tags"), 1)
+        self.assertEqual(self.fake.calls.count("search"), len(EXPECTED))
+
+    def test_warm_cache_counts(self):
+        cache = WarmCache(os.path.join(self.dir.name, "cache.sqlite"), background=False)
+        self.assertEqual(cache.tag_counts(), EXPECTED)
+        self.assertEqual(self.fake.calls.count("search"), len(EXPECTED))
+
+    def test_snapshot_counts_without_bear_calls(self):
+        path = os.path.join(self.dir.name, "notes.snap")
+        snapshot_from_search(path)
+        self.fake.calls.clear()
+        self.assertEqual(tag_counts(snapshot_path=path), EXPECTED)
+        self.assertEqual(self.fake.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+TaskIndex.tasks 회귀 테스트
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import tempfile
+import unittest
+
+from tasks import TaskIndex
+
+
+def meta(identifier, title, modified):
+    return {"identifier": identifier, "title": title, "creationDate": modified, "modificationDate": modified}
+
+
+class TasksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.index = TaskIndex(os.path.join(self.dir.name, "index.sqlite"))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_last_counts_notes_without_tasks(self):
+        self.index.update_note(meta("1", "Daily Standup 1", "2024-01-01"), "### Today\n- [ ] old\n")
+        self.index.update_note(meta("2", "Daily Standup 2", "2024-01-02"), "### Today\n- [ ] recent\n")
+        self.index.update_note(meta("3", "Daily Standup 3", "2024-01-03"), "### Today\nnothing\n")
+        tasks = self.index.tasks(title="Daily Standup*", header="Today", last=2)
+        self.assertEqual([t["text"] for t in tasks], ["recent"])
+        self.assertEqual(len(self.index.tasks(title="Daily Standup*", last=1)), 0)
+
+    def test_results_are_most_recently_modified_first(self):
+        self.index.update_note(meta("1", "A", "2024-01-01"), "- [ ] a\n- [x] done\n")
+        self.index.update_note(meta("2", "B", "2024-02-01"), "- [ ] b\n")
+        self.assertEqual([t["text"] for t in self.index.tasks()], ["b", "a"])
+        self.assertEqual([t["text"] for t in self.index.tasks(done=None, last=1, title="a")], ["a", "done"])
+
+
+if __name__ == "__main__":
+    unittest.main()
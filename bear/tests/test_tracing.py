@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+스팬 트레이싱 회귀 테스트 (FakeBear 사용)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import io
+import json
+import asyncio
+import tempfile
+import unittest
+import contextlib
+
+import bear
+from fake_bear import FakeBear
+
+
+class TracingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeBear().install()
+        self.note_id = self.fake.add_note("A", "body")
+        self.spans = []
+        self.remove = bear.add_hook(after=self.spans.append)
+
+    def tearDown(self):
+        self.remove()
+        self.fake.uninstall()
+
+    def named(self, name):
+        return [s for s in self.spans if s.name == name]
+
+    def test_spans_nest_operation_call_and_stages(self):
+        with bear.span("export") as export:
+            bear.get_note_contents(note_id=self.note_id)
+        op = self.named("get_note_contents")[0]
+        call = self.named("call_bear")[0]
+        self.assertEqual(op.parent_id, export.span_id)
+        self.assertEqual(call.parent_id, op.span_id)
+        for stage in ("encode", "bear", "parse"):
+            self.assertEqual(self.named(stage)[0].parent_id, call.span_id)
+        self.assertEqual({s.trace_id for s in self.spans}, {export.trace_id})
+        self.assertEqual(call.attrs["action"], "open-note")
+        self.assertIsNone(export.parent_id)
+        self.assertIsNone(bear.current_span())
+
+    def test_separate_operations_get_separate_traces(self):
+        bear.get_note_contents(note_id=self.note_id)
+        bear.get_note_contents(note_id=self.note_id)
+        roots = self.named("get_note_contents")
+        self.assertNotEqual(roots[0].trace_id, roots[1].trace_id)
+
+    def test_map_concurrent_keeps_parent_span(self):
+        with bear.span("batch") as batch:
+            bear.map_concurrent(
+                lambda _: bear.get_note_contents(note_id=self.note_id), range(4), max_workers=4
+            )
+        ops = self.named("get_note_contents")
+        self.assertEqual(len(ops), 4)
+        self.assertTrue(all(s.parent_id == batch.span_id for s in ops))
+
+    def test_run_async_keeps_parent_span(self):
+        async def main():
+            with bear.span("job") as job:
+                await asyncio.gather(*(
+                    bear.run_async(bear.get_note_contents, note_id=self.note_id) for _ in range(3)
+                ))
+            return job
+
+        job = asyncio.run(main())
+        ops = self.named("get_note_contents")
+        self.assertEqual(len(ops), 3)
+        self.assertTrue(all(s.parent_id == job.span_id for s in ops))
+
+    def test_error_is_recorded_on_span(self):
+        with self.assertRaises(ValueError):
+            with bear.span("failing"):
+                raise ValueError("boom")
+        self.assertEqual(self.named("failing")[0].error, "ValueError: boom")
+
+    def test_hook_errors_do_not_break_operations_or_other_hooks(self):
+        def broken(s):
+            raise RuntimeError("hook failed")
+
+        seen = []
+        remove_broken = bear.add_hook(before=broken, after=broken)
+        remove_seen = bear.add_hook(after=seen.append)
+        stderr = io.StringIO()
+        try:
+            with contextlib.redirect_stderr(stderr):
+                result = bear.get_note_contents(note_id=self.note_id)
+        finally:
+            remove_broken()
+            remove_seen()
+        self.assertEqual(result["note"], "body")
+        self.assertIn("get_note_contents", [s.name for s in seen])
+        self.assertIn("hook failed", stderr.getvalue())
+
+    def test_removed_hook_is_not_called(self):
+        seen = []
+        remove = bear.add_hook(after=seen.append)
+        remove()
+        bear.get_note_contents(note_id=self.note_id)
+        self.assertEqual(seen, [])
+
+    def test_jsonl_exporter_writes_one_line_per_span(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.jsonl")
+            stop = bear.enable_tracing(path)
+            try:
+                with bear.span("export"):
+                    bear.get_note_contents(note_id=self.note_id)
+            finally:
+                stop()
+            bear.get_note_contents(note_id=self.note_id)
+            with open(path, encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual([r["name"] for r in records][-1], "export")
+        traced = [s for s in self.spans if s.trace_id == records[-1]["trace_id"]]
+        self.assertEqual(len(records), len(traced))
+        by_id = {r["span_id"]: r for r in records}
+        for record in records:
+            self.assertEqual(
+                set(record), {"name", "trace_id", "span_id", "parent_id", "start", "duration", "attrs", "error"}
+            )
+            if record["parent_id"] is not None:
+                self.assertIn(record["parent_id"], by_id)
+        # 훅 전용 값(원본 인자, 결과)은 내보내지 않음
+        self.assertNotIn("body", json.dumps(records))
+
+
+if __name__ == "__main__":
+    unittest.main()